@@ -0,0 +1,11 @@
+-- Indexes backing the single-query conversation history endpoint
+-- (/api/conversations/history/user) and windowed message loading.
+-- Run this migration once; all statements are idempotent.
+
+-- Keyset pagination over a user's conversations ("updatedAt" DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_conversations_user_updated
+ON conversations("userId", "updatedAt" DESC, id DESC);
+
+-- Per-conversation message count / latest message lookups
+CREATE INDEX IF NOT EXISTS idx_messages_conversation_created
+ON messages("conversationId", "createdAt" DESC);
@@ -0,0 +1,14 @@
+-- Rolling summary for windowed chat history (send_message)
+-- Older turns that fall out of the recent-message window are folded into
+-- "historySummary"; "summarizedUntil" is the createdAt of the newest message
+-- already covered by the summary.
+-- Run this migration once; all statements are idempotent.
+
+ALTER TABLE conversations
+ADD COLUMN IF NOT EXISTS "historySummary" TEXT DEFAULT NULL;
+
+ALTER TABLE conversations
+ADD COLUMN IF NOT EXISTS "summarizedUntil" TIMESTAMP DEFAULT NULL;
+
+COMMENT ON COLUMN conversations."historySummary" IS 'Rolling summary of turns older than the chat history window';
+COMMENT ON COLUMN conversations."summarizedUntil" IS 'createdAt of the newest message folded into historySummary';
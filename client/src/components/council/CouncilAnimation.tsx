@@ -2,19 +2,21 @@ import { motion } from "framer-motion";
 import { ExpertAvatar } from "./ExpertAvatar";
 import { ActivityFeed } from "./ActivityFeed";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
-import { Users } from "lucide-react";
+import { Sparkles, Users } from "lucide-react";
 import type { ExpertStatus, ActivityEvent } from "@/hooks/useCouncilStream";
 
 interface CouncilAnimationProps {
   expertStatuses: ExpertStatus[];
   activityFeed: ActivityEvent[];
   isStreaming: boolean;
+  partialConsensus?: string;
 }
 
 export function CouncilAnimation({
   expertStatuses,
   activityFeed,
   isStreaming,
+  partialConsensus = "",
 }: CouncilAnimationProps) {
   const completedCount = expertStatuses.filter((s) => s.status === "completed").length;
   const totalCount = expertStatuses.length;
@@ -98,6 +100,36 @@ export function CouncilAnimation({
           <ActivityFeed activities={activityFeed} />
         </div>
       </div>
+
+      {/* Consensus (streamed while the council synthesizes) */}
+      {partialConsensus && (
+        <motion.div
+          initial={{ opacity: 0, y: 20 }}
+          animate={{ opacity: 1, y: 0 }}
+          transition={{ duration: 0.4, ease: [0.25, 0.1, 0.25, 1] }}
+        >
+          <Card className="rounded-2xl glass-premium border-primary/20 shadow-xl" data-testid="council-consensus-stream">
+            <CardHeader>
+              <div className="flex items-center gap-3">
+                <div className="p-2 rounded-xl bg-primary/10 ring-2 ring-primary/20">
+                  <Sparkles className="h-5 w-5 text-primary" />
+                </div>
+                <div>
+                  <CardTitle className="font-semibold">Síntese do Conselho</CardTitle>
+                  <CardDescription>
+                    Consenso sendo redigido a partir das análises dos especialistas
+                  </CardDescription>
+                </div>
+              </div>
+            </CardHeader>
+            <CardContent>
+              <p className="text-sm leading-relaxed whitespace-pre-wrap break-words text-foreground/90">
+                {partialConsensus}
+              </p>
+            </CardContent>
+          </Card>
+        </motion.div>
+      )}
     </div>
   );
 }
@@ -46,6 +46,8 @@ export function ExpertAvatar({ status, index }: ExpertAvatarProps) {
   const config = statusConfig[status.status];
   const Icon = config.icon;
   const isActive = status.status === "analyzing" || status.status === "researching";
+  // Tail of the streamed analysis text (the card only has room for the latest lines)
+  const liveText = isActive && status.partialText ? status.partialText.slice(-240).trimStart() : "";
 
   // Get initials from expert name
   const initials = status.expertName
@@ -166,6 +168,18 @@ export function ExpertAvatar({ status, index }: ExpertAvatarProps) {
             <p className={`text-xs mt-1 ${config.color}`}>{config.label}</p>
           </div>
 
+          {/* Live analysis text (while streaming) */}
+          {liveText && (
+            <motion.div
+              initial={{ opacity: 0 }}
+              animate={{ opacity: 1 }}
+              className="text-xs text-muted-foreground whitespace-pre-wrap break-words line-clamp-4"
+              data-testid={`expert-live-text-${status.expertId}`}
+            >
+              {liveText}
+            </motion.div>
+          )}
+
           {/* Stats (when completed) */}
           {status.status === "completed" && (
             <motion.div
@@ -9,6 +9,7 @@ export interface ExpertStatus {
   insightCount?: number;
   recommendationCount?: number;
   error?: string;
+  partialText?: string; // Analysis text streamed so far (expert_delta)
 }
 
 export interface ActivityEvent {
@@ -24,6 +25,7 @@ export interface CouncilStreamState {
   expertStatuses: Map<string, ExpertStatus>;
   activityFeed: ActivityEvent[];
   finalAnalysis: any | null;
+  partialConsensus: string; // Consensus text streamed so far (consensus_delta)
   error: string | null;
 }
 
@@ -39,6 +41,7 @@ export function useCouncilStream({ problem, expertIds, enabled }: UseCouncilStre
     expertStatuses: new Map(),
     activityFeed: [],
     finalAnalysis: null,
+    partialConsensus: "",
     error: null,
   });
 
@@ -101,6 +104,7 @@ export function useCouncilStream({ problem, expertIds, enabled }: UseCouncilStre
       expertStatuses: initialStatuses,
       activityFeed: [],
       finalAnalysis: null,
+      partialConsensus: "",
       error: null,
     });
 
@@ -179,7 +183,9 @@ export function useCouncilStream({ problem, expertIds, enabled }: UseCouncilStre
   }, [enabled, problem, expertIds, addActivity]);
 
   const handleSSEEvent = useCallback((eventType: string, data: any) => {
-    console.log("SSE Event:", eventType, data);
+    if (eventType !== "expert_delta" && eventType !== "consensus_delta") {
+      console.log("SSE Event:", eventType, data);
+    }
 
     switch (eventType) {
       case "analysis_started":
@@ -215,6 +221,24 @@ export function useCouncilStream({ problem, expertIds, enabled }: UseCouncilStre
         addActivity(data.message, "info", data.expertName);
         break;
 
+      case "expert_delta":
+        setState((prev) => {
+          const newStatuses = new Map(prev.expertStatuses);
+          const current = newStatuses.get(data.expertId) || {
+            expertId: data.expertId,
+            expertName: data.expertName,
+            status: "analyzing" as const,
+            progress: 25,
+          };
+          newStatuses.set(data.expertId, {
+            ...current,
+            progress: Math.max(current.progress, 50),
+            partialText: (current.partialText || "") + data.text,
+          });
+          return { ...prev, expertStatuses: newStatuses };
+        });
+        break;
+
       case "expert_completed":
         updateExpertStatus(data.expertId, data.expertName, {
           status: "completed",
@@ -234,6 +258,7 @@ export function useCouncilStream({ problem, expertIds, enabled }: UseCouncilStre
           status: "failed",
           progress: 0,
           error: data.error,
+          partialText: undefined,
         });
         addActivity(`Failed: ${data.error}`, "error", data.expertName);
         break;
@@ -242,6 +267,13 @@ export function useCouncilStream({ problem, expertIds, enabled }: UseCouncilStre
         addActivity(data.message, "info");
         break;
 
+      case "consensus_delta":
+        setState((prev) => ({
+          ...prev,
+          partialConsensus: data.reset ? data.text : prev.partialConsensus + data.text,
+        }));
+        break;
+
       case "analysis_complete":
         setState((prev) => ({
           ...prev,
@@ -756,6 +756,7 @@ export default function TestCouncil() {
               expertStatuses={streamState.expertStatusArray}
               activityFeed={streamState.activityFeed}
               isStreaming={streamState.isStreaming}
+              partialConsensus={streamState.partialConsensus}
             />
           </div>
         </motion.div>
@@ -4,7 +4,7 @@ Analytics Engine - Calculate metrics and insights from user activity
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import asyncpg
-import os
+from db_pool import db_pool
 
 
 class AnalyticsEngine:
@@ -12,13 +12,6 @@ class AnalyticsEngine:
     
     def __init__(self, storage: Any):
         self.storage = storage
-        self.database_url = os.environ.get("DATABASE_URL")
-    
-    async def _get_db_conn(self):
-        """Get PostgreSQL connection for analytics queries"""
-        if not self.database_url:
-            raise ValueError("DATABASE_URL environment variable not set")
-        return await asyncpg.connect(self.database_url)
     
     async def get_overview_stats(self, user_id: str = "default") -> Dict[str, Any]:
         """
@@ -31,9 +24,7 @@ class AnalyticsEngine:
             lastActive: str (ISO date)
         }
         """
-        conn = await self._get_db_conn()
-        
-        try:
+        async with db_pool.acquire("analytics") as conn:
             # Total chat conversations from user_activity (FILTERED BY USER)
             total_convos = await conn.fetchval(
                 """
@@ -85,8 +76,6 @@ class AnalyticsEngine:
                 "currentStreak": current_streak,
                 "lastActive": last_active.isoformat() if last_active else None
             }
-        finally:
-            await conn.close()
     
     async def _calculate_streak(self, conn: asyncpg.Connection, user_id: str) -> int:
         """Calculate consecutive days of activity from user_activity for specific user"""
@@ -128,9 +117,7 @@ class AnalyticsEngine:
             ...
         ]
         """
-        conn = await self._get_db_conn()
-        
-        try:
+        async with db_pool.acquire("analytics") as conn:
             # Query user_activity directly with user filter
             rows = await conn.fetch(f"""
                 SELECT 
@@ -146,8 +133,6 @@ class AnalyticsEngine:
             """, user_id)
             
             return [dict(row) for row in rows]
-        finally:
-            await conn.close()
     
     async def get_top_experts(self, user_id: str = "default", limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -166,9 +151,7 @@ class AnalyticsEngine:
         """
         from storage import storage  # Import storage to get expert details
         
-        conn = await self._get_db_conn()
-        
-        try:
+        async with db_pool.acquire("analytics") as conn:
             # Get aggregated data from user_activity (no JOIN needed)
             rows = await conn.fetch(f"""
                 SELECT 
@@ -208,8 +191,6 @@ class AnalyticsEngine:
                 result.append(item)
             
             return result
-        finally:
-            await conn.close()
     
     async def get_category_distribution(self, user_id: str = "default") -> Dict[str, int]:
         """
@@ -222,9 +203,7 @@ class AnalyticsEngine:
         """
         from storage import storage  # Import storage to get expert categories
         
-        conn = await self._get_db_conn()
-        
-        try:
+        async with db_pool.acquire("analytics") as conn:
             # Get expert usage counts from user_activity (include expert names)
             rows = await conn.fetch("""
                 SELECT 
@@ -253,8 +232,6 @@ class AnalyticsEngine:
                     category_counts[category] = category_counts.get(category, 0) + count
             
             return category_counts
-        finally:
-            await conn.close()
     
     async def get_highlights(self, user_id: str = "default") -> Dict[str, Any]:
         """
@@ -265,9 +242,7 @@ class AnalyticsEngine:
             referencedCampaigns: [...]
         }
         """
-        conn = await self._get_db_conn()
-        
-        try:
+        async with db_pool.acquire("analytics") as conn:
             # Get user favorites
             favorites = await conn.fetch("""
                 SELECT 
@@ -300,8 +275,6 @@ class AnalyticsEngine:
                 "topCouncilInsights": [dict(c) for c in councils],
                 "referencedCampaigns": []  # TODO: Extract from persona if enriched
             }
-        finally:
-            await conn.close()
     
     async def generate_recommendations(self, user_id: str = "default") -> List[Dict[str, str]]:
         """
@@ -4,7 +4,7 @@ Provides retry logic, circuit breaker, timeout handling, and fallback models.
 """
 import os
 import asyncio
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List, Union
 from datetime import datetime, timedelta
 from anthropic import AsyncAnthropic, APIError, RateLimitError, APITimeoutError
 from tenacity import (
@@ -15,7 +15,7 @@ from tenacity import (
     before_sleep_log,
 )
 from logger import logger
-from env_validator import get_config_int, get_config_float
+from env_validator import get_config_int, get_config_float, get_config_bool
 
 class CircuitBreakerOpenError(Exception):
     """Raised when circuit breaker is open"""
@@ -317,6 +317,65 @@ class ResilientAnthropicClient:
             raise
 
 
+def build_cached_system(
+    static_prompt: str,
+    dynamic_parts: Optional[List[Optional[str]]] = None
+) -> Union[str, List[Dict[str, Any]]]:
+    """
+    Build a system prompt as content blocks for Anthropic prompt caching.
+
+    The static part (clone prompt + tool instructions) comes first and carries
+    a cache breakpoint, so it is shared across users and turns. Dynamic parts
+    (e.g. persona context) follow; the last one gets its own breakpoint so
+    repeated turns by the same user also hit the cache.
+
+    Prompts below the model's minimum cacheable length (1024 tokens for
+    Sonnet) are sent uncached by the API - no error is raised.
+
+    Returns a plain string when ANTHROPIC_PROMPT_CACHE_ENABLED=false.
+    """
+    parts = [part for part in (dynamic_parts or []) if part]
+    
+    if not get_config_bool("ANTHROPIC_PROMPT_CACHE_ENABLED", True):
+        return static_prompt + "".join(parts)
+    
+    blocks: List[Dict[str, Any]] = [{
+        "type": "text",
+        "text": static_prompt,
+        "cache_control": {"type": "ephemeral"},
+    }]
+    for part in parts:
+        blocks.append({"type": "text", "text": part})
+    if len(blocks) > 1:
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+    
+    return blocks
+
+
+def log_cache_usage(response: Any, call_site: str, **context) -> Dict[str, int]:
+    """
+    Log prompt cache hit/miss token counts for an Anthropic response.
+
+    Returns:
+        Dict with input_tokens, cache_read_tokens, cache_write_tokens, output_tokens
+    """
+    usage = getattr(response, "usage", None)
+    stats = {
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+    }
+    logger.info(
+        "Anthropic prompt cache usage",
+        call_site=call_site,
+        cache_hit=stats["cache_read_tokens"] > 0,
+        **stats,
+        **context,
+    )
+    return stats
+
+
 # Global singleton instance
 _anthropic_client: Optional[ResilientAnthropicClient] = None
 
@@ -332,5 +391,7 @@ __all__ = [
     "ResilientAnthropicClient",
     "get_anthropic_client",
     "CircuitBreakerOpenError",
+    "build_cached_system",
+    "log_cache_usage",
 ]
 
@@ -0,0 +1,71 @@
+"""
+Benchmark: clone system prompt build cost, uncached vs memoized.
+
+For every registered clone, times get_system_prompt() the way it ran before
+memoization (rendering the prompt on each call) and with the per-(class,
+version) cache, then prints per-call latency and the cost of one "request"
+that touches every clone (e.g. listing experts with prompts for the council).
+
+Usage (from python_backend/):
+    python benchmarks/bench_prompt_cache.py [--iterations 200]
+
+No database or API keys required.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clones import CloneRegistry, ExpertCloneBase
+
+
+def _time_calls(call, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    clones = CloneRegistry().get_all_clones()
+    ExpertCloneBase.clear_prompt_cache()
+
+    print("=" * 70)
+    print(f"System prompt build benchmark ({len(clones)} clones, {args.iterations} iterations)")
+    print("=" * 70)
+    print(f"{'clone':<22} {'chars':>7} {'uncached us':>12} {'cached us':>10} {'speedup':>9}")
+    print("-" * 70)
+
+    uncached_total = cached_total = 0.0
+    for name, clone in sorted(clones.items()):
+        render = getattr(type(clone).get_system_prompt, "__wrapped_render__", None)
+        if render is None:
+            continue
+        uncached = statistics.median(_time_calls(lambda: render(clone), args.iterations))
+        clone.get_system_prompt()  # Warm the cache
+        cached = statistics.median(_time_calls(clone.get_system_prompt, args.iterations))
+        uncached_total += uncached
+        cached_total += cached
+        print(
+            f"{name:<22} {len(clone.get_system_prompt()):>7} "
+            f"{uncached:>12.1f} {cached:>10.2f} {uncached / max(cached, 1e-9):>8.0f}x"
+        )
+
+    print("-" * 70)
+    print(f"{'per request (all)':<22} {'':>7} {uncached_total:>12.1f} {cached_total:>10.2f} "
+          f"{uncached_total / max(cached_total, 1e-9):>8.0f}x")
+    print(f"cache: {ExpertCloneBase.prompt_cache_info()}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
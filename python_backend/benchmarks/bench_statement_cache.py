@@ -0,0 +1,124 @@
+"""
+Benchmark: asyncpg prepared-statement cache ON vs OFF for the hot chat path.
+
+Runs the storage queries executed on every chat turn (get_conversation,
+get_messages, get_user_persona) against two pools that differ only in
+statement_cache_size, and prints per-query latency percentiles.
+
+Usage (from python_backend/):
+    python benchmarks/bench_statement_cache.py [--iterations 200] [--conversation-id ID] [--user-id ID]
+
+Requires DATABASE_URL pointing to a database with at least one conversation.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+from dotenv import load_dotenv
+
+load_dotenv(dotenv_path=Path(__file__).parent.parent.parent / ".env")
+
+from storage import PostgresStorage
+
+
+def _percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(int(len(ordered) * pct), len(ordered) - 1)
+    return ordered[index]
+
+
+async def _pick_targets(pool: asyncpg.Pool, conversation_id, user_id):
+    """Use the most recently updated conversation when ids are not given"""
+    if conversation_id and user_id:
+        return conversation_id, user_id
+    row = await pool.fetchrow(
+        'SELECT id, "userId" FROM conversations ORDER BY "updatedAt" DESC LIMIT 1'
+    )
+    if not row:
+        raise SystemExit("No conversations found - pass --conversation-id and --user-id")
+    return conversation_id or row["id"], user_id or row["userId"]
+
+
+async def _bench_pool(cache_size: int, iterations: int, conversation_id: str, user_id: str) -> dict:
+    pool = await asyncpg.create_pool(
+        os.environ["DATABASE_URL"],
+        min_size=1,
+        max_size=1,
+        statement_cache_size=cache_size,
+    )
+    storage = PostgresStorage()
+    storage.pool = pool  # asyncpg.Pool exposes the same acquire() API
+    storage._initialized = True
+
+    queries = {
+        "get_conversation": lambda: storage.get_conversation(conversation_id),
+        "get_messages": lambda: storage.get_messages(conversation_id),
+        "get_user_persona": lambda: storage.get_user_persona(user_id),
+    }
+
+    results = {}
+    try:
+        for name, call in queries.items():
+            # Warm-up: establishes connection and (when enabled) prepares statements
+            for _ in range(5):
+                await call()
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await call()
+                samples.append((time.perf_counter() - start) * 1000)
+            results[name] = samples
+    finally:
+        await pool.close()
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--cache-size", type=int, default=100)
+    parser.add_argument("--conversation-id")
+    parser.add_argument("--user-id")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        raise SystemExit("DATABASE_URL environment variable not set")
+
+    probe = await asyncpg.create_pool(os.environ["DATABASE_URL"], min_size=1, max_size=1, statement_cache_size=0)
+    try:
+        conversation_id, user_id = await _pick_targets(probe, args.conversation_id, args.user_id)
+    finally:
+        await probe.close()
+
+    print("=" * 70)
+    print(f"Statement cache benchmark ({args.iterations} iterations per query)")
+    print(f"conversation={conversation_id} user={user_id}")
+    print("=" * 70)
+
+    off = await _bench_pool(0, args.iterations, conversation_id, user_id)
+    on = await _bench_pool(args.cache_size, args.iterations, conversation_id, user_id)
+
+    print(f"{'query':<20} {'mode':<6} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    print("-" * 70)
+    for name in off:
+        for label, samples in (("off", off[name]), ("on", on[name])):
+            print(
+                f"{name:<20} {label:<6} "
+                f"{_percentile(samples, 0.50):>9.3f} "
+                f"{_percentile(samples, 0.95):>9.3f} "
+                f"{statistics.mean(samples):>9.3f}"
+            )
+        speedup = statistics.median(off[name]) / max(statistics.median(on[name]), 1e-9)
+        print(f"{'':<20} {'p50 speedup':<6} {speedup:>8.2f}x")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Benchmark: trigger matching for the 18 seed clones.
+
+Compares finding all triggers in a user message
+- the way get_trigger_reaction() used to (lowercase each trigger, one `in`
+  scan of the message per trigger),
+- per clone with pre-lowercased triggers (get_matched_triggers), and
+- for a council turn (every clone, same message) with the registry's shared
+  Aho–Corasick matcher (CloneRegistry.match_triggers), one pass per message.
+
+Usage (from python_backend/):
+    python benchmarks/bench_trigger_matcher.py [--iterations 200] [--message-words 120]
+
+No database or API keys required.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from clones import CloneRegistry
+
+FILLER = (
+    "nossa empresa quer crescer no digital mas o orçamento de marketing é pequeno "
+    "e os clientes comparam preço com a concorrência toda semana"
+).split()
+
+
+def _substring_scan(clone, message: str):
+    """Previous approach: one scan of the message per trigger"""
+    message_lower = message.lower()
+    return (
+        [trigger for trigger in clone.negative_triggers if trigger.lower() in message_lower],
+        [trigger for trigger in clone.positive_triggers if trigger.lower() in message_lower],
+    )
+
+
+def _messages(clones, words: int, count: int = 20):
+    """Realistic messages: filler text with a few triggers from random clones"""
+    rng = random.Random(42)
+    triggers = [t for clone in clones for t in clone.positive_triggers + clone.negative_triggers]
+    messages = []
+    for _ in range(count):
+        tokens = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(3):
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(triggers))
+        messages.append(" ".join(tokens))
+    return messages
+
+
+def _time_per_message(call, messages, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for message in messages:
+            call(message)
+        samples.append((time.perf_counter() - start) * 1_000_000 / len(messages))
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--message-words", type=int, default=120)
+    args = parser.parse_args()
+
+    registry = CloneRegistry()
+    clones = registry.get_all_clones()
+    messages = _messages(clones.values(), args.message_words)
+
+    # Same results every way before timing anything
+    for message in messages:
+        shared = registry.match_triggers(message)
+        for name, clone in clones.items():
+            negative, positive = _substring_scan(clone, message)
+            expected = {"negative": negative, "positive": positive}
+            assert clone.get_matched_triggers(message) == expected == shared[name]
+
+    print("=" * 70)
+    print(f"Trigger matching benchmark ({len(clones)} clones, ~{args.message_words}-word messages, "
+          f"{args.iterations} iterations)")
+    print("=" * 70)
+    print(f"{'clone':<22} {'triggers':>8} {'scan us':>10} {'compiled us':>12} {'speedup':>9}")
+    print("-" * 70)
+
+    scan_total = compiled_total = 0.0
+    for name, clone in sorted(clones.items()):
+        scan = _time_per_message(lambda m: _substring_scan(clone, m), messages, args.iterations)
+        compiled = _time_per_message(clone.get_matched_triggers, messages, args.iterations)
+        scan_total += scan
+        compiled_total += compiled
+        count = len(clone.positive_triggers) + len(clone.negative_triggers)
+        print(f"{name:<22} {count:>8} {scan:>10.1f} {compiled:>12.1f} {scan / max(compiled, 1e-9):>8.1f}x")
+
+    shared_total = _time_per_message(registry.match_triggers, messages, args.iterations)
+    print("-" * 70)
+    print(f"{'council turn':<22} {'':>8} {scan_total:>10.1f} {compiled_total:>12.1f} "
+          f"{scan_total / max(compiled_total, 1e-9):>8.1f}x")
+    print(f"{'council turn (shared)':<22} {'':>8} {scan_total:>10.1f} {shared_total:>12.1f} "
+          f"{scan_total / max(shared_total, 1e-9):>8.1f}x")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
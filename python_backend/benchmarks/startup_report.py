@@ -0,0 +1,115 @@
+"""
+Startup-time report: where cold start of the API server goes.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and prints:
+- the slowest modules imported directly by main (cumulative time)
+- self time aggregated per top-level package (anthropic, fastapi, clones, ...)
+- clone registry cost: lazy index vs importing/instantiating every clone
+
+Usage (from python_backend/):
+    python benchmarks/startup_report.py [--module main] [--top 15]
+
+main.py validates its environment on import, so DATABASE_URL, ANTHROPIC_API_KEY
+and SESSION_SECRET must be set (no connection is made).
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def _run_importtime(module: str):
+    """Import `module` in a fresh interpreter; returns [(depth, name, self_us, cumulative_us)]"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stderr.strip().splitlines()[-5:])
+        raise SystemExit(f"import {module} failed:\n{tail}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _direct_imports(rows, module: str):
+    """Modules imported while importing `module` one level below it"""
+    # importtime prints children before their parent, so walk backwards
+    for index in range(len(rows) - 1, -1, -1):
+        depth, name, _, _ = rows[index]
+        if name == module:
+            children = []
+            for child_depth, child_name, _, cumulative in reversed(rows[:index]):
+                if child_depth <= depth:
+                    break
+                if child_depth == depth + 1:
+                    children.append((child_name, cumulative))
+            return children
+    return []
+
+
+def _clone_registry_timings():
+    start = time.perf_counter()
+    from clones import CloneRegistry
+    registry = CloneRegistry()
+    index_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    clones = registry.get_all_clones()
+    load_ms = (time.perf_counter() - start) * 1000
+    return len(clones), index_ms, load_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    rows = _run_importtime(args.module)
+    total_us = next((cumulative for _, name, _, cumulative in rows if name == args.module), 0)
+
+    print("=" * 70)
+    print(f"Startup report: import {args.module} = {total_us / 1000:.1f} ms")
+    print("=" * 70)
+
+    print(f"{'direct import':<40} {'cumulative ms':>14} {'share':>8}")
+    print("-" * 70)
+    direct = sorted(_direct_imports(rows, args.module), key=lambda item: -item[1])
+    for name, cumulative in direct[:args.top]:
+        print(f"{name:<40} {cumulative / 1000:>14.1f} {cumulative / max(total_us, 1):>7.1%}")
+
+    packages = defaultdict(int)
+    for _, name, self_us, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    print("-" * 70)
+    print(f"{'package (self time)':<40} {'ms':>14} {'share':>8}")
+    print("-" * 70)
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<40} {self_us / 1000:>14.1f} {self_us / max(total_us, 1):>7.1%}")
+
+    count, index_ms, load_ms = _clone_registry_timings()
+    print("-" * 70)
+    print(f"CloneRegistry lazy index: {index_ms:.1f} ms | load all {count} clones on demand: {load_ms:.1f} ms")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,18 @@ Provides caching for expensive operations (Council analyses, persona enrichment)
 """
 import os
 import json
+import time
+import asyncio
+import fnmatch
 import hashlib
-from typing import Optional, Any
+import uuid
+from collections import OrderedDict
+from typing import Optional, Any, Awaitable, Callable, Dict, Tuple, TypeVar
 from datetime import timedelta
 from logger import logger
-from env_validator import get_config_bool, get_config
+from env_validator import get_config_bool, get_config, get_config_int, get_config_float
+
+T = TypeVar("T")
 
 # Try to import Redis, fallback to in-memory cache if not available
 try:
@@ -20,38 +27,173 @@ except ImportError:
 
 
 class InMemoryCache:
-    """Simple in-memory cache fallback (not distributed)"""
+    """
+    In-process LRU + TTL cache fallback (not distributed).
     
-    def __init__(self):
-        self._cache = {}
-        self._expiry = {}
+    Bounded by entry count (CACHE_MAX_ENTRIES) and by total value size in bytes
+    (CACHE_MAX_BYTES); the least recently used entries are evicted first.
+    Expired entries are dropped on read and by a background sweep every
+    CACHE_SWEEP_INTERVAL seconds, so keys that are never read again do not
+    accumulate in long-running workers.
+    """
+    
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[float] = None
+    ):
+        self.max_entries = max_entries or get_config_int("CACHE_MAX_ENTRIES", 10_000)
+        self.max_bytes = max_bytes or get_config_int("CACHE_MAX_BYTES", 64 * 1024 * 1024)
+        self.sweep_interval = sweep_interval or get_config_float("CACHE_SWEEP_INTERVAL", 60.0)
+        # key -> (value, expires_at, size in bytes), least recently used first
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
     
     async def get(self, key: str) -> Optional[str]:
         """Get value from cache"""
-        if key in self._cache:
-            import time
-            if self._expiry.get(key, 0) > time.time():
-                return self._cache[key]
-            else:
-                # Expired
-                del self._cache[key]
-                del self._expiry[key]
-        return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[1] <= time.monotonic():
+            # Expired
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
     
     async def set(self, key: str, value: str, ttl: int):
-        """Set value in cache with TTL"""
-        import time
-        self._cache[key] = value
-        self._expiry[key] = time.time() + ttl
+        """Set value in cache with TTL (evicts least recently used entries if full)"""
+        size = len(value.encode("utf-8"))
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            logger.debug("Value larger than cache byte limit, not cached", key=key, size=size)
+            return
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
     
     async def delete(self, key: str):
         """Delete value from cache"""
-        self._cache.pop(key, None)
-        self._expiry.pop(key, None)
+        if key in self._entries:
+            self._remove(key)
+    
+    async def delete_pattern(self, pattern: str) -> int:
+        """Delete keys matching a Redis-style glob pattern (e.g. "council:*")"""
+        keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+    
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were removed"""
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+    
+    def start_sweeper(self) -> None:
+        """Start the background expiry sweep (needs a running event loop)"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+    
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            removed = self.sweep()
+            if removed:
+                logger.debug("Cache sweep", expired=removed, entries=len(self._entries))
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
     
     async def close(self):
-        """Close (no-op for in-memory)"""
-        pass
+        """Stop the background sweep"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+
+class _Flight:
+    """One in-flight call and how many callers are awaiting it"""
+    
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    In-process request coalescing: concurrent calls with the same key share
+    one execution of the coroutine, and every caller receives its result (or
+    its exception).
+    
+    The call runs in its own task, so one caller going away (client disconnect)
+    does not cancel it for the others; it is cancelled only when every caller
+    awaiting it has been cancelled.
+    """
+    
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() unless a call for `key` is already in flight; await its result"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task: self._forget(key, flight))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+            logger.debug("Single-flight: joined in-flight call", key=key)
+        
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+    
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+    
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._flights), "calls": self.calls, "coalesced": self.coalesced}
 
 
 class CacheManager:
@@ -62,7 +204,10 @@ class CacheManager:
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
         self.memory_cache = InMemoryCache()
+        self.single_flight = SingleFlight()
         self.redis_enabled = False
+        self.hits = 0
+        self.misses = 0
     
     async def initialize(self):
         """Initialize cache connection"""
@@ -90,6 +235,9 @@ class CacheManager:
         else:
             logger.info("Using in-memory cache (Redis not configured)")
             self.redis_enabled = False
+        
+        if not self.redis_enabled:
+            self.memory_cache.start_sweeper()
     
     async def close(self):
         """Close cache connection"""
@@ -109,14 +257,17 @@ class CacheManager:
             if self.redis_enabled and self.redis_client:
                 value = await self.redis_client.get(key)
                 if value:
+                    self.hits += 1
                     logger.debug("Cache hit (Redis)", key=key)
                     return json.loads(value)
             else:
                 value = await self.memory_cache.get(key)
                 if value:
+                    self.hits += 1
                     logger.debug("Cache hit (memory)", key=key)
                     return json.loads(value)
             
+            self.misses += 1
             logger.debug("Cache miss", key=key)
             return None
         
@@ -161,14 +312,15 @@ class CacheManager:
     
     async def invalidate_pattern(self, pattern: str):
         """
-        Invalidate all keys matching pattern.
-        Only works with Redis (scan), in-memory will skip.
+        Invalidate all keys matching a glob pattern (e.g. "council:*").
+        Uses SCAN on Redis, a key scan of the in-memory cache otherwise.
         """
-        if not self.redis_enabled or not self.redis_client:
-            logger.debug("Pattern invalidation skipped (in-memory cache)")
-            return
-        
         try:
+            if not self.redis_enabled or not self.redis_client:
+                deleted = await self.memory_cache.delete_pattern(pattern)
+                logger.info("Cache pattern invalidated (memory)", pattern=pattern, deleted=deleted)
+                return
+            
             cursor = 0
             deleted = 0
             while True:
@@ -183,11 +335,99 @@ class CacheManager:
         
         except Exception as e:
             logger.warning("Cache pattern invalidation error", pattern=pattern, error=str(e))
+    
+    async def coalesce(self, key: str, compute: Callable[[], Awaitable[Any]], ttl_seconds: int) -> Any:
+        """
+        Compute and cache a value after a cache miss, sharing the computation
+        with concurrent callers for the same key.
+        
+        In-process callers are coalesced by SingleFlight. With Redis enabled,
+        the leader also takes a short Redis lock (SET NX, CACHE_LOCK_TTL
+        seconds) so other workers wait for the cached result (up to
+        CACHE_LOCK_WAIT seconds) instead of repeating the call.
+        """
+        return await self.single_flight.do(key, lambda: self._compute_and_store(key, compute, ttl_seconds))
+    
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]], ttl_seconds: int) -> Any:
+        """Cached value for `key`, or coalesce() it"""
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        return await self.coalesce(key, compute, ttl_seconds)
+    
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[Any]], ttl_seconds: int) -> Any:
+        lock_key = f"lock:{key}"
+        token = None
+        if self.redis_enabled and self.redis_client:
+            token = await self._acquire_redis_lock(lock_key)
+            if token is None:
+                # Another worker is computing it - wait for its result
+                cached = await self._wait_for_value(key)
+                if cached is not None:
+                    return cached
+                logger.warning("Timed out waiting for another worker, computing locally", key=key)
+        
+        try:
+            value = await compute()
+            await self.set(key, value, ttl_seconds)
+            return value
+        finally:
+            if token is not None:
+                await self._release_redis_lock(lock_key, token)
+    
+    async def _acquire_redis_lock(self, lock_key: str) -> Optional[str]:
+        """SET NX with expiry; returns the lock token, or None if already held (or on error)"""
+        token = uuid.uuid4().hex
+        try:
+            lock_ttl = get_config_int("CACHE_LOCK_TTL", 60)
+            if await self.redis_client.set(lock_key, token, nx=True, ex=lock_ttl):
+                return token
+        except Exception as e:
+            logger.warning("Cache lock error", key=lock_key, error=str(e))
+        return None
+    
+    async def _release_redis_lock(self, lock_key: str, token: str) -> None:
+        """Delete the lock only if we still own it"""
+        try:
+            await self.redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.warning("Cache lock release error", key=lock_key, error=str(e))
+    
+    async def _wait_for_value(self, key: str) -> Optional[Any]:
+        deadline = time.monotonic() + get_config_float("CACHE_LOCK_WAIT", 30.0)
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+        return None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters (plus size/eviction stats of the in-memory cache)"""
+        return {
+            "backend": "redis" if self.redis_enabled else "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory": self.memory_cache.stats(),
+            "single_flight": self.single_flight.stats(),
+        }
+
+
+# Compare-and-delete so a worker never releases a lock another worker re-acquired
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 
 # Global cache instance
 cache_manager = CacheManager()
 
+# Coalescing for uncached calls (shares the manager's counters)
+single_flight = cache_manager.single_flight
+
 
 # Helper functions for common cache operations
 def make_cache_key(prefix: str, *parts: str) -> str:
@@ -223,6 +463,8 @@ TTL_SHORT = 5 * 60  # 5 minutes
 
 __all__ = [
     "cache_manager",
+    "single_flight",
+    "SingleFlight",
     "make_cache_key",
     "hash_data",
     "TTL_COUNCIL_ANALYSIS",
@@ -0,0 +1,213 @@
+"""
+Windowed chat history for 1:1 expert conversations.
+
+Instead of sending the whole conversation to Claude on every turn, only the
+most recent messages that fit a token budget are loaded. Older turns are
+folded into a rolling summary stored on the conversation row, so per-turn DB
+I/O and prompt size stay constant as conversations grow.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Set
+
+from env_validator import get_config_int, get_config_bool
+from llm_router import llm_router, LLMTask
+from logger import logger
+from models import Message
+
+# Rough token estimate (Claude averages ~4 chars per token for pt-BR/en text)
+CHARS_PER_TOKEN = 4
+
+SUMMARY_PREFIX = "[Resumo da nossa conversa até aqui]\n"
+SUMMARY_ACK = "Entendido. Vou levar esse contexto em conta nas próximas respostas."
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting (no tokenizer round-trip)"""
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class HistoryWindow:
+    """Prompt-ready history plus the messages that fell out of the window"""
+    history: List[dict] = field(default_factory=list)
+    overflow: List[Message] = field(default_factory=list)
+    summary: Optional[str] = None
+    estimated_tokens: int = 0
+
+
+def build_history_window(
+    messages: List[Message],
+    summary: Optional[str],
+    token_budget: int,
+    max_messages: int
+) -> HistoryWindow:
+    """
+    Keep the newest messages that fit both `max_messages` and `token_budget`
+    (the summary counts against the budget).
+
+    Args:
+        messages: Unsummarized messages, oldest first
+        summary: Rolling summary of older turns (if any)
+        token_budget: Max estimated tokens for summary + kept messages
+        max_messages: Max number of messages to keep
+
+    Returns:
+        HistoryWindow whose history alternates roles starting with "user"
+    """
+    used = estimate_tokens(SUMMARY_PREFIX + summary) if summary else 0
+    kept: List[Message] = []
+
+    for msg in reversed(messages):
+        if len(kept) >= max_messages:
+            break
+        cost = estimate_tokens(msg.content)
+        if used + cost > token_budget:
+            break
+        kept.append(msg)
+        used += cost
+    kept.reverse()
+
+    # Claude expects the conversation to start with a user turn
+    while kept and kept[0].role != "user":
+        used -= estimate_tokens(kept.pop(0).content)
+
+    history = []
+    if summary:
+        history.append({"role": "user", "content": SUMMARY_PREFIX + summary})
+        history.append({"role": "assistant", "content": SUMMARY_ACK})
+    history.extend({"role": msg.role, "content": msg.content} for msg in kept)
+
+    return HistoryWindow(
+        history=history,
+        overflow=messages[:len(messages) - len(kept)],
+        summary=summary,
+        estimated_tokens=used
+    )
+
+
+class ChatHistoryLoader:
+    """
+    Loads the history window for send_message and keeps the rolling summary
+    up to date.
+
+    Configuration (env):
+        CHAT_HISTORY_MAX_MESSAGES: Recent messages sent verbatim (default 20)
+        CHAT_HISTORY_TOKEN_BUDGET: Estimated tokens for summary + window (default 12000)
+        CHAT_HISTORY_SUMMARY_ENABLED: Fold dropped turns into a summary (default true)
+        CHAT_HISTORY_SUMMARY_MAX_TOKENS: Max length of the summary (default 600)
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.max_messages = get_config_int("CHAT_HISTORY_MAX_MESSAGES", 20)
+        self.token_budget = get_config_int("CHAT_HISTORY_TOKEN_BUDGET", 12000)
+        self.summary_enabled = get_config_bool("CHAT_HISTORY_SUMMARY_ENABLED", True)
+        self.summary_max_tokens = get_config_int("CHAT_HISTORY_SUMMARY_MAX_TOKENS", 600)
+        # Conversations with a summary refresh in flight (avoids duplicate LLM calls)
+        self._summarizing: Set[str] = set()
+
+    async def load(self, conversation_id: str) -> HistoryWindow:
+        """
+        Fetch the rolling summary and a bounded slice of unsummarized messages.
+
+        Twice the window size is fetched so turns pushed out of the window can
+        still be summarized; unsummarized messages older than that (e.g. long
+        conversations from before this feature) are dropped.
+        """
+        summary, summarized_until = None, None
+        if self.summary_enabled and self.storage.summary_supported:
+            summary, summarized_until = await self.storage.get_conversation_summary(conversation_id)
+        messages = await self.storage.get_recent_messages(
+            conversation_id,
+            limit=self.max_messages * 2,
+            after_created_at=summarized_until
+        )
+        window = build_history_window(messages, summary, self.token_budget, self.max_messages)
+
+        logger.debug(
+            "Chat history window loaded",
+            conversation_id=conversation_id,
+            messages=len(window.history),
+            overflow=len(window.overflow),
+            estimated_tokens=window.estimated_tokens,
+        )
+        return window
+
+    def needs_summary(self, conversation_id: str, window: HistoryWindow) -> bool:
+        """
+        Whether a summary refresh should be scheduled for this window (never
+        while the storage lacks the summary columns - the LLM call would be wasted)
+        """
+        return (
+            self.summary_enabled
+            and self.storage.summary_supported
+            and bool(window.overflow)
+            and conversation_id not in self._summarizing
+        )
+
+    async def refresh_summary(self, conversation_id: str, window: HistoryWindow):
+        """
+        Fold the window's overflow into the rolling summary (Claude Haiku).
+        Meant to run after the response is sent; failures are logged and the
+        overflow is retried on the next turn.
+        """
+        if not self.needs_summary(conversation_id, window):
+            return
+
+        self._summarizing.add(conversation_id)
+        try:
+            transcript = "\n\n".join(
+                f"{'USUÁRIO' if msg.role == 'user' else 'ESPECIALISTA'}: {msg.content}"
+                for msg in window.overflow
+            )
+            prompt = f"""Você mantém o resumo de uma conversa entre um usuário e um especialista de marketing.
+
+RESUMO ATUAL:
+{window.summary or "(nenhum)"}
+
+NOVAS MENSAGENS A INCORPORAR:
+{transcript}
+
+INSTRUÇÕES:
+1. Produza um único resumo atualizado que combine o resumo atual com as novas mensagens
+2. Preserve fatos do negócio do usuário, decisões, números, recomendações dadas e perguntas em aberto
+3. Escreva em português brasileiro, em tópicos curtos
+4. Máximo de {self.summary_max_tokens * CHARS_PER_TOKEN} caracteres
+
+Retorne APENAS o resumo, sem texto adicional."""
+
+            new_summary = await llm_router.generate_text(
+                task=LLMTask.SUMMARIZE_HISTORY,
+                prompt=prompt,
+                max_tokens=self.summary_max_tokens,
+                temperature=0.2
+            )
+            new_summary = new_summary.strip()
+            if not new_summary:
+                return
+
+            summarized_until: datetime = window.overflow[-1].createdAt
+            await self.storage.update_conversation_summary(conversation_id, new_summary, summarized_until)
+            logger.info(
+                "Chat history summary updated",
+                conversation_id=conversation_id,
+                folded_messages=len(window.overflow),
+                summary_chars=len(new_summary),
+            )
+        except Exception as e:
+            logger.warning(
+                "Chat history summary refresh failed",
+                conversation_id=conversation_id,
+                error=str(e),
+            )
+        finally:
+            self._summarizing.discard(conversation_id)
+
+
+__all__ = [
+    "ChatHistoryLoader",
+    "HistoryWindow",
+    "build_history_window",
+    "estimate_tokens",
+]
@@ -6,7 +6,8 @@ Framework EXTRACT - 20-point cognitive cloning methodology.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from functools import wraps
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
 
@@ -20,8 +21,45 @@ class ExpertCloneBase(ABC):
     - Story banks (real cases with metrics)
     - Triggers (behavioral activation patterns)
     - Iconic callbacks (signature phrases)
+    
+    get_system_prompt() is memoized per (class, version): subclasses build the
+    prompt once and every later call returns the same immutable string. Bump
+    `version` (or call clear_prompt_cache()) when a clone's content changes.
     """
 
+    # Rendered prompts shared by all instances: (defining class, class, version) -> prompt
+    _prompt_cache: ClassVar[Dict[Tuple[type, type, str], str]] = {}
+    _prompt_cache_hits: ClassVar[int] = 0
+    _prompt_cache_misses: ClassVar[int] = 0
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        render = cls.__dict__.get("get_system_prompt")
+        if render is not None and not getattr(render, "__isabstractmethod__", False):
+            cls.get_system_prompt = _memoize_prompt(cls, render)  # type: ignore[method-assign]
+
+    @classmethod
+    def clear_prompt_cache(cls) -> None:
+        """
+        Drop memoized prompts: all of them when called on ExpertCloneBase
+        (CloneRegistry.reload_clones), only this class's when called on a clone
+        class (CloneRegistry.refresh_custom_clones).
+        """
+        cache = ExpertCloneBase._prompt_cache
+        if cls is ExpertCloneBase:
+            cache.clear()
+            return
+        for key in [key for key in cache if key[1] is cls]:
+            cache.pop(key, None)
+
+    @classmethod
+    def prompt_cache_info(cls) -> Dict[str, int]:
+        return {
+            "entries": len(ExpertCloneBase._prompt_cache),
+            "hits": ExpertCloneBase._prompt_cache_hits,
+            "misses": ExpertCloneBase._prompt_cache_misses,
+        }
+
     def __init__(self) -> None:
         # Core Identity
         self.name: str = ""
@@ -49,6 +87,13 @@ class ExpertCloneBase(ABC):
         self.created_at: datetime = datetime.now()
         self.version: str = "1.0"
         
+        # Lowercased triggers/story keywords (see compile_matchers)
+        self._matchers_compiled = False
+        self._negative_triggers_lower: List[Tuple[str, str]] = []
+        self._positive_triggers_lower: List[Tuple[str, str]] = []
+        self._trigger_reaction_order: List[Tuple[str, str]] = []
+        self._story_keywords: List[Tuple[str, Dict[str, Any]]] = []
+        
         # Auto-populate story banks from method (if implemented)
         if hasattr(self, 'get_story_banks') and callable(getattr(self, 'get_story_banks')):
             stories = self.get_story_banks()
@@ -86,6 +131,34 @@ class ExpertCloneBase(ABC):
         """
         pass
 
+    def compile_matchers(self) -> None:
+        """
+        Pre-lowercase triggers, trigger reactions (in precedence order) and
+        story keywords. CloneRegistry calls this at registration; call it again
+        after changing triggers, trigger_reactions or story_banks at runtime.
+        """
+        self._negative_triggers_lower = [(trigger, trigger.lower()) for trigger in self.negative_triggers]
+        self._positive_triggers_lower = [(trigger, trigger.lower()) for trigger in self.positive_triggers]
+        # Negative triggers first (stronger reactions), then positive, in list order
+        self._trigger_reaction_order = [
+            (lowered, self.trigger_reactions[trigger])
+            for trigger, lowered in self._negative_triggers_lower + self._positive_triggers_lower
+            if trigger in self.trigger_reactions
+        ]
+        self._story_keywords = [
+            (story_data["keywords"].lower(), story_data)
+            for story_data in self.story_banks.values()
+            if "keywords" in story_data
+        ]
+        self._matchers_compiled = True
+
+    @property
+    def trigger_keywords_lower(self) -> List[str]:
+        """All triggers, lowercased (what CloneRegistry compiles into its shared matcher)"""
+        if not self._matchers_compiled:
+            self.compile_matchers()
+        return [lowered for _, lowered in self._negative_triggers_lower + self._positive_triggers_lower]
+
     def get_story_by_keyword(self, keyword: str) -> Optional[Dict[str, Any]]:
         """
         Find story bank entry by keyword match.
@@ -96,41 +169,67 @@ class ExpertCloneBase(ABC):
         Returns:
             Story dict with company, year, context, before, after, growth, lesson
         """
+        if not self._matchers_compiled:
+            self.compile_matchers()
         keyword_lower = keyword.lower()
         
-        for story_id, story_data in self.story_banks.items():
-            if "keywords" in story_data:
-                keywords = story_data["keywords"].lower()
-                if keyword_lower in keywords:
-                    return story_data
+        for keywords, story_data in self._story_keywords:
+            if keyword_lower in keywords:
+                return story_data
         
         return None
 
-    def get_trigger_reaction(self, user_input: str) -> Optional[str]:
+    def get_trigger_reaction(self, user_input: str, found: Optional[Set[str]] = None) -> Optional[str]:
         """
         Check if user input contains trigger words and return specific reaction.
         
+        Only triggers that have a reaction are checked; negative triggers take
+        precedence over positive ones, then list order.
+        
         Args:
             user_input: User's message
+            found: Lowercased triggers already found in user_input by
+                CloneRegistry.match_triggers (skips scanning the message)
             
         Returns:
             Specific reaction string if trigger found, None otherwise
         """
-        user_input_lower = user_input.lower()
-        
-        # Check negative triggers first (stronger reactions)
-        for trigger in self.negative_triggers:
-            if trigger.lower() in user_input_lower:
-                if trigger in self.trigger_reactions:
-                    return self.trigger_reactions[trigger]
+        if not self._matchers_compiled:
+            self.compile_matchers()
+        if found is None:
+            user_input_lower = user_input.lower()
+            for lowered, reaction in self._trigger_reaction_order:
+                if lowered in user_input_lower:
+                    return reaction
+            return None
+        for lowered, reaction in self._trigger_reaction_order:
+            if lowered in found:
+                return reaction
+        return None
+
+    def get_matched_triggers(self, user_input: str, found: Optional[Set[str]] = None) -> Dict[str, List[str]]:
+        """
+        All triggers present in the user input.
         
-        # Check positive triggers
-        for trigger in self.positive_triggers:
-            if trigger.lower() in user_input_lower:
-                if trigger in self.trigger_reactions:
-                    return self.trigger_reactions[trigger]
+        Args:
+            user_input: User's message
+            found: See get_trigger_reaction
         
-        return None
+        Returns:
+            {"negative": [...], "positive": [...]} in each list's original order
+        """
+        if not self._matchers_compiled:
+            self.compile_matchers()
+        if found is None:
+            user_input_lower = user_input.lower()
+            return {
+                "negative": [t for t, lowered in self._negative_triggers_lower if lowered in user_input_lower],
+                "positive": [t for t, lowered in self._positive_triggers_lower if lowered in user_input_lower],
+            }
+        return {
+            "negative": [t for t, lowered in self._negative_triggers_lower if lowered in found],
+            "positive": [t for t, lowered in self._positive_triggers_lower if lowered in found],
+        }
 
     def get_random_callback(self) -> str:
         """
@@ -198,3 +297,21 @@ class ExpertCloneBase(ABC):
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}: {self.name} ({len(self.story_banks)} stories)>"
+
+
+def _memoize_prompt(owner: type, render: Callable[[Any], str]) -> Callable[[Any], str]:
+    """Wrap a subclass get_system_prompt so it renders once per (class, version)"""
+    @wraps(render)
+    def get_system_prompt(self: ExpertCloneBase) -> str:
+        key = (owner, type(self), str(getattr(self, "version", "")))
+        cache = ExpertCloneBase._prompt_cache
+        prompt = cache.get(key)
+        if prompt is None:
+            ExpertCloneBase._prompt_cache_misses += 1
+            prompt = cache[key] = render(self)
+        else:
+            ExpertCloneBase._prompt_cache_hits += 1
+        return prompt
+
+    get_system_prompt.__wrapped_render__ = render  # type: ignore[attr-defined]
+    return get_system_prompt
@@ -5,12 +5,21 @@ Automatically finds and registers all expert clones.
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Type
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+import asyncio
+import hashlib
 import importlib
+import importlib.util
 import inspect
 import pkgutil
+import re
+import sys
+import threading
 from pathlib import Path
 
+from keyword_matcher import KeywordMatcher
+
 from .base import ExpertCloneBase
 
 
@@ -37,16 +46,51 @@ SEED_EXPERT_AVATARS = {
 }
 
 
+@dataclass(frozen=True)
+class CloneSpec:
+    """Where a clone lives - indexed cheaply at discovery, imported on first use"""
+    name: str
+    module: str                 # e.g. "clones.seth_godin"
+    class_name: Optional[str]   # e.g. "SethGodinClone"
+    custom: bool = False
+
+
+# Cheap source scan: clone classes and the literal name set in __init__
+_CLASS_PATTERN = re.compile(r"^class\s+(\w+)\s*\(\s*ExpertCloneBase\s*\)", re.MULTILINE)
+_NAME_PATTERN = re.compile(r"^[ \t]+self\.name[ \t]*(?::[ \t]*str[ \t]*)?=[ \t]*[\"']([^\"'\n]+)[\"']", re.MULTILINE)
+
+
 class CloneRegistry:
     """
     Singleton registry for all expert cognitive clones.
     
-    Automatically discovers and instantiates clones from python_backend/clones/ directory.
+    Discovery is lazy: clone modules in python_backend/clones/ (and clones/custom/)
+    are indexed by scanning their source for the clone class and name, and a
+    clone is only imported, instantiated and validated on first use
+    (get_clone/resolve/get_all_clones). Modules whose name cannot be read from
+    the source are imported at discovery time.
+    
+    Custom clones written at runtime (auto-clone) are picked up incrementally
+    with refresh_custom_clones(), which only imports new or changed files.
     """
     
     _instance: Optional[CloneRegistry] = None
     _clones: Dict[str, ExpertCloneBase] = {}
     _clone_classes: Dict[str, Type[ExpertCloneBase]] = {}
+    # Discovered (not necessarily loaded) clones: name -> spec
+    _specs: Dict[str, CloneSpec] = {}
+    _discovered: bool = False
+    _load_lock = threading.RLock()
+    # Lookup index: lowercase name / slug / seed expert id -> clone name
+    _index: Dict[str, str] = {}
+    # DB expert id -> expert name (survives reload_clones)
+    _aliases: Dict[str, str] = {}
+    # clones/custom/*.py -> (mtime_ns, sha1) of the version currently registered
+    _custom_files: Dict[str, Tuple[int, str]] = {}
+    # Bumped whenever a clone instance is added, replaced or removed
+    _generation: int = 0
+    # Shared trigger matcher over all loaded clones, keyed by the generation it was built for
+    _trigger_matcher: Optional[Tuple[int, KeywordMatcher]] = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -54,80 +98,209 @@ class CloneRegistry:
         return cls._instance
     
     def __init__(self):
-        if not self._clones:
+        if not CloneRegistry._discovered:
             self._discover_clones()
     
     def _discover_clones(self) -> None:
         """
-        Auto-discover all clone classes in python_backend/clones/ directory.
+        Index all clone modules in python_backend/clones/ directory.
         Looks for classes that inherit from ExpertCloneBase.
         Searches both main clones/ directory and clones/custom/ subdirectory.
         """
         # Get path to clones directory
         clones_dir = Path(__file__).parent
         
-        # Discover clones in main directory
-        print("[CloneRegistry] Discovering seed clones...")
-        self._discover_clones_in_directory(clones_dir, 'clones')
+        with self._load_lock:
+            # Discover clones in main directory
+            self._discover_clones_in_directory(clones_dir, 'clones')
+            
+            # Discover clones in custom subdirectory
+            custom_dir = clones_dir / 'custom'
+            if custom_dir.exists():
+                self._discover_clones_in_directory(custom_dir, 'clones.custom')
+            
+            CloneRegistry._discovered = True
         
-        # Discover clones in custom subdirectory
-        custom_dir = clones_dir / 'custom'
-        if custom_dir.exists():
-            print("[CloneRegistry] Discovering custom auto-generated clones...")
-            self._discover_clones_in_directory(custom_dir, 'clones.custom')
+        custom_count = sum(1 for spec in self._specs.values() if spec.custom)
+        print(f"[CloneRegistry] Indexed {len(self._specs) - custom_count} seed + {custom_count} custom clones (lazy)")
     
     def _discover_clones_in_directory(self, directory: Path, package_name: str) -> None:
         """
-        Discover and load clones from a specific directory.
+        Index clones from a specific directory without importing them.
         
         Args:
             directory: Path to directory containing clone modules
             package_name: Python package name (e.g., 'clones' or 'clones.custom')
         """
-        # Import all Python modules in directory
+        custom = "custom" in package_name
         for module_info in pkgutil.iter_modules([str(directory)]):
             if module_info.name in ['base', 'registry', '__init__', 'README']:
                 continue
             
+            module_full_name = f'{package_name}.{module_info.name}'
+            path = directory / f"{module_info.name}.py"
             try:
-                # Import module (using relative import from clones package)
-                module_full_name = f'{package_name}.{module_info.name}'
-                module = importlib.import_module(module_full_name)
-                
-                # Find all classes that inherit from ExpertCloneBase
-                for name, obj in inspect.getmembers(module, inspect.isclass):
-                    if (issubclass(obj, ExpertCloneBase) and 
-                        obj is not ExpertCloneBase and
-                        obj.__module__ == module.__name__):
-                        
-                        # Instantiate clone
-                        try:
-                            clone_instance = obj()
-                            clone_name = clone_instance.name
-                            
-                            # Apply avatar for seed experts
-                            if clone_name in SEED_EXPERT_AVATARS:
-                                clone_instance.avatar = SEED_EXPERT_AVATARS[clone_name]
-                            
-                            # Validate clone
-                            is_valid, errors = clone_instance.validate()
-                            if not is_valid:
-                                print(f"[CloneRegistry] Warning: {clone_name} has validation errors:")
-                                for error in errors:
-                                    print(f"  - {error}")
-                            
-                            # Register clone
-                            self._clones[clone_name] = clone_instance
-                            self._clone_classes[clone_name] = obj
-                            
-                            clone_type = "CUSTOM" if "custom" in package_name else "SEED"
-                            print(f"[CloneRegistry] Registered {clone_type} clone: {clone_name} ({len(clone_instance.story_banks)} stories)")
-                        
-                        except Exception as e:
-                            print(f"[CloneRegistry] Error instantiating {name}: {e}")
+                data = path.read_bytes()
+                source = data.decode("utf-8")
+            except (OSError, UnicodeDecodeError):
+                data, source = b"", ""
+            if custom and data:
+                self._custom_files[str(path)] = (path.stat().st_mtime_ns, hashlib.sha1(data).hexdigest())
             
+            class_names = _CLASS_PATTERN.findall(source)
+            name_match = _NAME_PATTERN.search(source) if len(class_names) == 1 else None
+            if name_match:
+                self._add_spec(CloneSpec(name_match.group(1), module_full_name, class_names[0], custom))
+            else:
+                # Unusual layout (several clones, computed name...) - import now
+                self._import_module_clones(module_full_name, custom)
+    
+    def _add_spec(self, spec: CloneSpec) -> None:
+        self._specs[spec.name] = spec
+        self._index_clone(spec.name)
+    
+    def _import_module_clones(self, module_full_name: str, custom: bool) -> List[str]:
+        """
+        Import a clone module and register every ExpertCloneBase subclass in it.
+        
+        Returns:
+            Names of the clones registered
+        """
+        registered = []
+        try:
+            # Import module (using relative import from clones package)
+            module = importlib.import_module(module_full_name)
+        except Exception as e:
+            print(f"[CloneRegistry] Error importing {module_full_name}: {e}")
+            return registered
+        
+        # Find all classes that inherit from ExpertCloneBase
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if (issubclass(obj, ExpertCloneBase) and 
+                obj is not ExpertCloneBase and
+                obj.__module__ == module.__name__):
+                clone_name = self._register_class(obj, custom)
+                if clone_name:
+                    self._add_spec(CloneSpec(clone_name, module_full_name, name, custom))
+                    registered.append(clone_name)
+        return registered
+    
+    def _register_class(self, obj: Type[ExpertCloneBase], custom: bool) -> Optional[str]:
+        """Instantiate, validate and register a clone class; returns its name"""
+        clone_instance = self._instantiate(obj, custom)
+        if clone_instance is None:
+            return None
+        
+        clone_name = clone_instance.name
+        
+        # Register clone
+        self._clones[clone_name] = clone_instance
+        self._clone_classes[clone_name] = obj
+        self._index_clone(clone_name)
+        CloneRegistry._generation += 1
+        return clone_name
+    
+    def _instantiate(self, obj: Type[ExpertCloneBase], custom: bool) -> Optional[ExpertCloneBase]:
+        """Instantiate and validate a clone class (without registering it)"""
+        try:
+            clone_instance = obj()
+        except Exception as e:
+            print(f"[CloneRegistry] Error instantiating {obj.__name__}: {e}")
+            return None
+        
+        clone_name = clone_instance.name
+        
+        # Apply avatar for seed experts
+        if clone_name in SEED_EXPERT_AVATARS:
+            clone_instance.avatar = SEED_EXPERT_AVATARS[clone_name]
+        
+        # Lowercase triggers/story keywords once, after the clone set them
+        clone_instance.compile_matchers()
+        
+        # Validate clone
+        is_valid, errors = clone_instance.validate()
+        if not is_valid:
+            print(f"[CloneRegistry] Warning: {clone_name} has validation errors:")
+            for error in errors:
+                print(f"  - {error}")
+        
+        clone_type = "CUSTOM" if custom else "SEED"
+        print(f"[CloneRegistry] Loaded {clone_type} clone: {clone_name} ({len(clone_instance.story_banks)} stories)")
+        return clone_instance
+    
+    def _load(self, name: str) -> Optional[ExpertCloneBase]:
+        """Return the clone instance, importing and instantiating it on first use"""
+        clone = self._clones.get(name)
+        if clone is not None:
+            return clone
+        spec = self._specs.get(name)
+        if spec is None:
+            return None
+        
+        with self._load_lock:
+            clone = self._clones.get(name)
+            if clone is not None:
+                return clone
+            try:
+                module = importlib.import_module(spec.module)
+                obj = getattr(module, spec.class_name)
             except Exception as e:
-                print(f"[CloneRegistry] Error importing {module_info.name}: {e}")
+                print(f"[CloneRegistry] Error importing {spec.module}: {e}")
+                return None
+            loaded_name = self._register_class(obj, spec.custom)
+            if loaded_name and loaded_name != name:
+                # Source scan picked the wrong name - re-key the spec
+                self._specs.pop(name, None)
+                self._add_spec(CloneSpec(loaded_name, spec.module, spec.class_name, spec.custom))
+            return self._clones.get(loaded_name) if loaded_name else None
+    
+    @staticmethod
+    def slugify(name: str) -> str:
+        """URL slug for an expert name (e.g., "Claude Hopkins" -> "claude-hopkins")"""
+        return name.strip().lower().replace(' ', '-')
+    
+    @classmethod
+    def expert_id_for(cls, name: str) -> str:
+        """Stable expert id for a clone (e.g., "Claude Hopkins" -> "seed-claude-hopkins")"""
+        return f"seed-{cls.slugify(name)}"
+    
+    def _index_clone(self, name: str, index: Optional[Dict[str, str]] = None) -> None:
+        """Index a clone under its lowercase name, slug and seed expert id"""
+        index = self._index if index is None else index
+        for key in (name.lower(), self.slugify(name), self.expert_id_for(name)):
+            index[key] = name
+    
+    def register_alias(self, expert_id: str, name: str) -> None:
+        """
+        Map a DB expert id to its expert name, so custom experts resolve to
+        their clone (if any) by id as well.
+        """
+        self._aliases[expert_id] = name
+    
+    def name_for(self, key: str) -> Optional[str]:
+        """
+        Resolve an expert id, slug or name (case-insensitive) to the expert name.
+        
+        Returns:
+            Clone name, DB expert name (via register_alias) or None
+        """
+        if key in self._specs:
+            return key
+        if key in self._aliases:
+            return self._aliases[key]
+        return self._index.get(key.strip().lower())
+    
+    def resolve(self, key: str) -> Optional[ExpertCloneBase]:
+        """
+        Get clone instance by expert id ("seed-seth-godin" or DB id), slug or name.
+        
+        Returns:
+            Clone instance or None if the key does not map to a registered clone
+        """
+        name = self.name_for(key)
+        if name is None:
+            return None
+        return self._load(name) or self._load(self._index.get(name.lower(), ""))
     
     def get_clone(self, name: str) -> Optional[ExpertCloneBase]:
         """
@@ -139,25 +312,27 @@ class CloneRegistry:
         Returns:
             Clone instance or None if not found
         """
-        return self._clones.get(name)
+        return self._load(name) or self.resolve(name)
     
     def get_all_clones(self) -> Dict[str, ExpertCloneBase]:
         """
-        Get all registered clones.
+        Get all registered clones (loads any clone not imported yet).
         
         Returns:
             Dict mapping name -> clone instance
         """
+        for name in list(self._specs):
+            self._load(name)
         return self._clones.copy()
     
     def list_clone_names(self) -> List[str]:
         """
-        Get list of all registered clone names.
+        Get list of all registered clone names (does not import clones).
         
         Returns:
             List of expert names
         """
-        return list(self._clones.keys())
+        return list(self._specs.keys())
     
     def get_clone_metadata(self, name: str) -> Optional[Dict]:
         """
@@ -178,9 +353,204 @@ class CloneRegistry:
         """
         Force reload of all clones (useful for development).
         """
-        self._clones.clear()
-        self._clone_classes.clear()
-        self._discover_clones()
+        with self._load_lock:
+            self._clones.clear()
+            self._clone_classes.clear()
+            self._specs.clear()
+            self._index.clear()
+            self._custom_files.clear()
+            CloneRegistry._generation += 1
+            self.invalidate_prompts()
+            self._discover_clones()
+    
+    def refresh_custom_clones(self) -> Dict[str, List[str]]:
+        """
+        Incrementally sync clones/custom/ with the registry.
+        
+        Only files that are new or whose content changed (mtime, then SHA-1)
+        are executed, each into a fresh module object; seed clones and
+        unchanged custom modules are left alone. The updated maps are built
+        aside and swapped in under the registry lock, so concurrent readers see
+        either the previous or the new set of clones. A file that fails to
+        import keeps its previous version registered.
+        
+        Blocking (file I/O + import) - use refresh_custom_clones_async() from
+        the event loop.
+        
+        Returns:
+            {"added": [...], "updated": [...], "removed": [...]} clone names
+        """
+        changes: Dict[str, List[str]] = {"added": [], "updated": [], "removed": []}
+        custom_dir = Path(__file__).parent / 'custom'
+        paths = {
+            str(path): path
+            for path in (sorted(custom_dir.glob("*.py")) if custom_dir.exists() else [])
+            if path.stem != '__init__'
+        }
+        
+        states: Dict[str, Tuple[int, str]] = {}
+        loaded: Dict[str, Tuple[object, List[Tuple[Type[ExpertCloneBase], ExpertCloneBase]]]] = {}
+        for key, path in paths.items():
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+                previous = self._custom_files.get(key)
+                if previous and previous[0] == mtime_ns:
+                    continue
+                data = path.read_bytes()
+            except OSError as e:
+                print(f"[CloneRegistry] Error reading {path.name}: {e}")
+                continue
+            digest = hashlib.sha1(data).hexdigest()
+            states[key] = (mtime_ns, digest)
+            if previous and previous[1] == digest:
+                continue  # Touched but unchanged
+            result = self._exec_custom_module(path, data)
+            if result is None:
+                states.pop(key)
+                continue
+            loaded[key] = result
+        
+        removed_files = [key for key in self._custom_files if key not in paths]
+        if not loaded and not removed_files:
+            self._custom_files.update(states)
+            return changes
+        
+        with self._load_lock:
+            clones = dict(self._clones)
+            classes = dict(self._clone_classes)
+            specs = dict(self._specs)
+            
+            # Drop every clone that came from a changed or deleted file
+            reloaded_modules = {module.__name__ for module, _ in loaded.values()}
+            deleted_modules = {f"clones.custom.{Path(key).stem}" for key in removed_files}
+            for name, spec in list(specs.items()):
+                if spec.module not in reloaded_modules | deleted_modules:
+                    continue
+                del specs[name]
+                clones.pop(name, None)
+                old_class = classes.pop(name, None)
+                if old_class is not None:
+                    old_class.clear_prompt_cache()
+                changes["removed"].append(name)
+            
+            for key, (module, instances) in loaded.items():
+                for obj, instance in instances:
+                    name = instance.name
+                    changes["updated" if name in self._specs else "added"].append(name)
+                    clones[name] = instance
+                    classes[name] = obj
+                    specs[name] = CloneSpec(name, module.__name__, obj.__name__, True)
+            # Clones re-registered from the new code are updates, not removals
+            changes["removed"] = [name for name in changes["removed"] if name not in specs]
+            
+            index: Dict[str, str] = {}
+            for name in specs:
+                self._index_clone(name, index)
+            
+            # Atomic swap
+            CloneRegistry._clones = clones
+            CloneRegistry._clone_classes = classes
+            CloneRegistry._specs = specs
+            CloneRegistry._index = index
+            CloneRegistry._generation += 1
+            for module, _ in loaded.values():
+                sys.modules[module.__name__] = module
+            for key in removed_files:
+                self._custom_files.pop(key, None)
+                sys.modules.pop(f"clones.custom.{Path(key).stem}", None)
+            self._custom_files.update(states)
+        
+        print(
+            f"[CloneRegistry] Custom clones refreshed: "
+            f"+{len(changes['added'])} ~{len(changes['updated'])} -{len(changes['removed'])}"
+        )
+        return changes
+    
+    async def refresh_custom_clones_async(self) -> Dict[str, List[str]]:
+        """refresh_custom_clones() in a worker thread (keeps the event loop free)"""
+        return await asyncio.to_thread(self.refresh_custom_clones)
+    
+    def _exec_custom_module(
+        self, path: Path, source: bytes
+    ) -> Optional[Tuple[object, List[Tuple[Type[ExpertCloneBase], ExpertCloneBase]]]]:
+        """
+        Execute a custom clone file into a new module object (not yet in
+        sys.modules) and instantiate its clone classes.
+        
+        Compiles the bytes that were hashed instead of going through the import
+        system, so a stale __pycache__ entry can never shadow a rewrite.
+        """
+        module_name = f"clones.custom.{path.stem}"
+        module_spec = importlib.util.spec_from_file_location(module_name, path)
+        if module_spec is None:
+            return None
+        module = importlib.util.module_from_spec(module_spec)
+        try:
+            exec(compile(source, str(path), "exec"), module.__dict__)
+        except Exception as e:
+            print(f"[CloneRegistry] Error importing {module_name}: {e}")
+            return None
+        
+        instances = []
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if (issubclass(obj, ExpertCloneBase) and
+                obj is not ExpertCloneBase and
+                obj.__module__ == module_name):
+                instance = self._instantiate(obj, custom=True)
+                if instance is not None:
+                    instances.append((obj, instance))
+        if not instances:
+            print(f"[CloneRegistry] No clone class found in {path.name}")
+            return None
+        return module, instances
+    
+    def match_triggers(
+        self,
+        user_input: str,
+        names: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Triggers present in the user input for several clones at once (e.g.
+        every council member), in a single pass over the message.
+        
+        Uses one Aho–Corasick matcher compiled from the triggers of all loaded
+        clones (rebuilt when a clone is loaded, replaced or removed), instead of one
+        substring scan per trigger per clone.
+        
+        Args:
+            user_input: User's message
+            names: Clone names to report (default: all clones)
+            
+        Returns:
+            Dict mapping clone name -> {"negative": [...], "positive": [...]}
+        """
+        if names is None:
+            clones = self.get_all_clones()
+        else:
+            clones = {}
+            for name in names:
+                clone = self.get_clone(name)
+                if clone is not None:
+                    clones[clone.name] = clone
+        
+        found = self._shared_trigger_matcher().find(user_input.lower())
+        return {name: clone.get_matched_triggers(user_input, found=found) for name, clone in clones.items()}
+    
+    def _shared_trigger_matcher(self) -> KeywordMatcher:
+        # Read the generation before the clones: a concurrent swap then only
+        # causes a rebuild on the next call, never a stale matcher under a new key
+        generation = CloneRegistry._generation
+        cached = CloneRegistry._trigger_matcher
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        loaded = list(self._clones.values())
+        matcher = KeywordMatcher(keyword for clone in loaded for keyword in clone.trigger_keywords_lower)
+        CloneRegistry._trigger_matcher = (generation, matcher)
+        return matcher
+    
+    def invalidate_prompts(self) -> None:
+        """Drop memoized system prompts so the next get_system_prompt() re-renders"""
+        ExpertCloneBase.clear_prompt_cache()
     
     def register_clone_manually(self, clone: ExpertCloneBase) -> None:
         """
@@ -197,13 +567,15 @@ class CloneRegistry:
         
         self._clones[clone.name] = clone
         self._clone_classes[clone.name] = clone.__class__
+        self._add_spec(CloneSpec(clone.name, clone.__class__.__module__, clone.__class__.__name__))
+        CloneRegistry._generation += 1
         print(f"[CloneRegistry] Manually registered: {clone.name}")
     
     def __len__(self) -> int:
-        return len(self._clones)
+        return len(self._specs)
     
     def __repr__(self) -> str:
-        return f"<CloneRegistry: {len(self._clones)} clones registered>"
+        return f"<CloneRegistry: {len(self._specs)} clones registered, {len(self._clones)} loaded>"
 
 
 # Global singleton instance
@@ -3,7 +3,7 @@ CrewAI Integration for Marketing Legends Cognitive Clones
 Uses CloneRegistry for rich cognitive clones with Framework EXTRACT
 """
 import os
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union, AsyncIterator
 from anthropic import AsyncAnthropic
 
 # Import clones - works whether imported as module or package
@@ -13,12 +13,16 @@ try:
     from .tools.perplexity_tool import PerplexityResearchTool
     from .tools.user_memory_tool import UserMemoryTool
     from .tools.story_bank_tool import StoryBankTool
+    from .anthropic_client import build_cached_system, log_cache_usage, get_anthropic_client
+    from .stream_cancellation import tracked_llm_call
 except ImportError:
     # Fall back to absolute import (when imported as module)
     from clones import clone_registry, ExpertCloneBase
     from tools.perplexity_tool import PerplexityResearchTool
     from tools.user_memory_tool import UserMemoryTool
     from tools.story_bank_tool import StoryBankTool
+    from anthropic_client import build_cached_system, log_cache_usage, get_anthropic_client
+    from stream_cancellation import tracked_llm_call
 
 class MarketingLegendAgent:
     """
@@ -32,10 +36,12 @@ class MarketingLegendAgent:
         name: str, 
         system_prompt: str, 
         clone: Optional[ExpertCloneBase] = None,
-        tools: Optional[Dict[str, Any]] = None
+        tools: Optional[Dict[str, Any]] = None,
+        persona_context: Optional[str] = None
     ):
         self.name = name
-        self.system_prompt = system_prompt
+        self.system_prompt = system_prompt  # Static clone/legacy prompt (cacheable)
+        self.persona_context = persona_context  # Per-user context, sent after the static prompt
         self.clone = clone  # Rich clone instance with story banks, triggers, callbacks
         self.tools = tools or {}  # Custom tools (PerplexityTool, UserMemoryTool, StoryBankTool)
         # Use AsyncAnthropic to avoid blocking FastAPI's event loop
@@ -60,22 +66,7 @@ class MarketingLegendAgent:
         """
         # Build enriched system prompt with tool instructions
         enhanced_system = self._build_enhanced_system_prompt(user_id)
-        
-        # Build full message history for Claude
-        messages = []
-        
-        # Add conversation history (excluding the current user message)
-        for msg in conversation_history:
-            messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
-        
-        # Add new user message
-        messages.append({
-            "role": "user",
-            "content": user_message
-        })
+        messages = self._build_messages(conversation_history, user_message)
         
         # Call Claude with the legend's enhanced system prompt (async to avoid blocking event loop)
         response = await self.anthropic_client.messages.create(
@@ -84,6 +75,7 @@ class MarketingLegendAgent:
             system=enhanced_system,
             messages=messages
         )
+        log_cache_usage(response, "chat", expert=self.name)
         
         # Extract text from response - handle different content block types
         for block in response.content:
@@ -93,15 +85,64 @@ class MarketingLegendAgent:
         # Fallback to string representation if no text attribute found
         return str(response.content[0]) if response.content else ""
     
-    def _build_enhanced_system_prompt(self, user_id: str) -> str:
+    async def chat_stream(
+        self,
+        conversation_history: List[dict],
+        user_message: str,
+        user_id: str = "demo_user"
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of chat() - yields text deltas as Claude produces them.
+        Uses ResilientAnthropicClient (circuit breaker aware).
+        
+        Args:
+            conversation_history: List of {role: str, content: str} messages
+            user_message: New user message to process
+            user_id: User identifier for personalization tools
+        
+        Yields:
+            str: Text chunks of the assistant response
+        """
+        enhanced_system = self._build_enhanced_system_prompt(user_id)
+        messages = self._build_messages(conversation_history, user_message)
+        
+        async with tracked_llm_call("chat_stream", max_tokens=2048) as call:
+            async for event in get_anthropic_client().create_message_stream(
+                messages=messages,
+                model="claude-sonnet-4-20250514",
+                system=enhanced_system,
+                max_tokens=2048
+            ):
+                if event.type == "text":
+                    call.add_output(event.text)
+                    yield event.text
+                elif event.type == "message_stop":
+                    log_cache_usage(event.message, "chat_stream", expert=self.name)
+    
+    def _build_messages(self, conversation_history: List[dict], user_message: str) -> List[dict]:
+        """Build Claude message list: history (excluding current message) + new user message"""
+        messages = [
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in conversation_history
+        ]
+        messages.append({
+            "role": "user",
+            "content": user_message
+        })
+        return messages
+    
+    def _build_enhanced_system_prompt(self, user_id: str) -> Union[str, List[Dict[str, Any]]]:
         """
         Build system prompt enriched with tool instructions
         
+        The static part (clone prompt + tool instructions) is sent as a cached
+        block; persona context follows as a separate block.
+        
         Args:
             user_id: User identifier
         
         Returns:
-            Enhanced system prompt with tool capabilities
+            System prompt content blocks (or plain string if caching is disabled)
         """
         enhanced = self.system_prompt
         
@@ -115,7 +156,7 @@ class MarketingLegendAgent:
                     enhanced += f"### {tool_name}\n"
                     enhanced += tool.get_prompt_instruction() + "\n\n"
         
-        return enhanced
+        return build_cached_system(enhanced, [self.persona_context])
 
 class LegendAgentFactory:
     """Factory to create agents for different marketing legends"""
@@ -125,7 +166,8 @@ class LegendAgentFactory:
         expert_name: str, 
         system_prompt: Optional[str] = None,
         tools: Optional[Dict[str, Any]] = None,
-        persona_context: Optional[str] = None  # NEW: Persona context to inject
+        persona_context: Optional[str] = None,  # NEW: Persona context to inject
+        expert_id: Optional[str] = None
     ) -> MarketingLegendAgent:
         """
         Create a cognitive clone agent for a marketing legend with custom tools.
@@ -133,7 +175,7 @@ class LegendAgentFactory:
         Priority:
         1. Load clone from CloneRegistry (if exists)
         2. Use clone's rich prompt
-        3. ADD persona_context to clone's prompt (if provided)
+        3. ADD persona_context as a separate block after the clone's prompt
         4. Fallback to system_prompt if no clone exists
         
         Args:
@@ -141,44 +183,42 @@ class LegendAgentFactory:
             system_prompt: Fallback system prompt if no clone found
             tools: Optional dict of custom tools
             persona_context: Optional persona context to APPEND to any prompt
+            expert_id: Optional expert id (seed-* or DB id) - resolved first via the registry index
         """
-        # Try to get rich clone from registry
-        clone = clone_registry.get_clone(expert_name)
+        # Try to get rich clone from registry (O(1) index lookup by id, then name)
+        clone = (clone_registry.resolve(expert_id) if expert_id else None) or clone_registry.get_clone(expert_name)
         
         if clone:
             # Use clone's rich prompt (with stories, frameworks, etc.)
             base_prompt = clone.get_system_prompt()
             
-            # ADD persona context if provided
+            # Persona context is kept separate so the clone prompt stays cacheable
             if persona_context:
-                final_prompt = base_prompt + persona_context
                 print(f"[LegendAgentFactory] Loaded rich clone for {expert_name} + PERSONA CONTEXT ({len(persona_context)} chars)")
             else:
-                final_prompt = base_prompt
                 print(f"[LegendAgentFactory] Loaded rich clone for {expert_name} ({len(clone.story_banks)} story banks)")
             
             return MarketingLegendAgent(
                 name=expert_name,
-                system_prompt=final_prompt,  # Clone prompt + persona context!
+                system_prompt=base_prompt,  # Clone prompt (static, cached)
                 clone=clone,
-                tools=tools
+                tools=tools,
+                persona_context=persona_context  # Appended after the static prompt
             )
         else:
             # Fallback to legacy prompt (if provided)
             if not system_prompt:
                 raise ValueError(f"No clone found for {expert_name} and no fallback prompt provided")
             
-            # ADD persona context to legacy prompt too
             if persona_context:
-                final_prompt = system_prompt + persona_context
                 print(f"[LegendAgentFactory] Using legacy prompt for {expert_name} + PERSONA CONTEXT")
             else:
-                final_prompt = system_prompt
                 print(f"[LegendAgentFactory] Using legacy prompt for {expert_name} (no clone in registry)")
             
             return MarketingLegendAgent(
                 name=expert_name,
-                system_prompt=final_prompt,  # Legacy prompt + persona context!
+                system_prompt=system_prompt,  # Legacy prompt (static, cached)
                 clone=None,
-                tools=tools
+                tools=tools,
+                persona_context=persona_context
             )
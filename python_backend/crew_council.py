@@ -2,12 +2,20 @@
 CrewAI Council Orchestration - Multi-Expert Collaborative Analysis
 """
 import uuid
+import time
 import asyncio
-from typing import List, Optional, Dict, Any
+from contextlib import AsyncExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Union, AsyncIterator
 from anthropic import AsyncAnthropic
 import os
+from anthropic_client import build_cached_system, log_cache_usage
+from env_validator import get_config, get_config_bool, get_config_int
+from logger import logger
 from models import Expert, BusinessProfile, CouncilAnalysis, AgentContribution
 from perplexity_research import perplexity_research
+from persona_context import persona_context_cache
+from stream_cancellation import tracked_llm_call
 from tools.perplexity_tool import PerplexityResearchTool
 from tools.user_memory_tool import UserMemoryTool
 from tools.story_bank_tool import StoryBankTool
@@ -15,16 +23,119 @@ from tools.youtube_research import YouTubeResearchTool
 from tools.trend_analysis import TrendAnalysisTool
 from tools.news_monitor import NewsMonitorTool
 
+# Seconds allowed per expert, rebuttal or synthesis call (blocking and streaming)
+LLM_CALL_TIMEOUT = 60.0
+
+SYNTHESIS_SYSTEM_PROMPT = "Você é um moderador experiente de reuniões de consultoria. Fale em português brasileiro natural e coloquial."
+
+
+@dataclass
+class CouncilEvent:
+    """
+    Typed progress event yielded by CouncilOrchestrator.run().
+    
+    Types and payloads:
+    - analysis_started: {expertCount, experts: [{id, name, avatar}], mode}
+    - research_started / research_completed {citations} / research_failed: {message}
+    - expert_started: {expertId, expertName, order, message}
+    - expert_delta: {expertId, expertName, order, text} (stream=True only)
+    - expert_completed: {expertId, expertName, order, insightCount,
+      recommendationCount, durationMs, contribution: AgentContribution}
+    - expert_failed: {expertId, expertName, order, error}
+    - rebuttal_started / rebuttal_completed: {expertCount}
+    - consensus_started: {message}
+    - consensus_delta: {text, reset?} (stream=True only)
+    - analysis_complete: {analysis: CouncilAnalysis, timings: {stage: ms}}
+    - error: {message}
+    """
+    type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class CouncilRunOptions:
+    """Switches for a council run"""
+    mode: str = "roundtable"        # "roundtable" | "parallel"
+    rebuttal: bool = False          # Rebuttal round (parallel mode only)
+    stream: bool = False            # Emit expert_delta / consensus_delta events
+    research: bool = True           # Perplexity research when a profile is available
+    load_user_memory: bool = True   # Load UserMemoryTool context when none is passed
+    
+    @classmethod
+    def from_env(
+        cls,
+        mode: Optional[str] = None,
+        rebuttal: Optional[bool] = None,
+        **overrides
+    ) -> "CouncilRunOptions":
+        """Options with mode/rebuttal defaulting to COUNCIL_MODE / COUNCIL_REBUTTAL"""
+        return cls(
+            mode=mode or get_config("COUNCIL_MODE", "roundtable"),
+            rebuttal=get_config_bool("COUNCIL_REBUTTAL", False) if rebuttal is None else rebuttal,
+            **overrides
+        )
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], stage: str):
+    """Record the wall-clock duration of a stage (ms) into timings"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _stream_with_deadline(
+    stream_manager,
+    call,
+    timeout: Optional[float] = None,
+    usage_label: Optional[str] = None,
+    **log_fields: Any
+) -> AsyncIterator[str]:
+    """
+    Relay text deltas from a messages.stream() manager, raising
+    asyncio.TimeoutError once `timeout` seconds have passed since it was opened
+    (the same limit the blocking calls get from asyncio.wait_for).
+    
+    The deadline wraps each await instead of the whole stream: SSE relays
+    (cancel_on_disconnect) advance this generator from a new task per step, and
+    an asyncio.timeout() scope must not span a yield.
+    """
+    deadline = asyncio.get_running_loop().time() + (timeout or LLM_CALL_TIMEOUT)
+    async with AsyncExitStack() as stack:
+        async with asyncio.timeout_at(deadline):
+            stream = await stack.enter_async_context(stream_manager)
+        texts = stream.text_stream.__aiter__()
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    text = await texts.__anext__()
+            except StopAsyncIteration:
+                break
+            call.add_output(text)
+            yield text
+        if usage_label:
+            async with asyncio.timeout_at(deadline):
+                final_message = await stream.get_final_message()
+            log_cache_usage(final_message, usage_label, **log_fields)
+
+
 class CouncilOrchestrator:
     """
     Orchestrates collaborative analysis by a council of marketing legend experts.
     
     Flow:
     1. Conduct Perplexity research (if BusinessProfile available)
-    2. Each expert analyzes the problem concurrently (with semaphore for rate limiting)
+    2. Each expert analyzes the problem:
+       - "roundtable": sequentially, each expert sees colleagues who already spoke
+       - "parallel": concurrently (bounded by the semaphore), optionally followed
+         by a short rebuttal round where every expert sees the others' analyses
     3. Synthesize consensus from all expert contributions
     """
     
+    MODES = ("roundtable", "parallel")
+    
     def __init__(self):
         self._anthropic_client: Optional[AsyncAnthropic] = None
         self._semaphore: Optional[asyncio.Semaphore] = None
@@ -58,7 +169,8 @@ class CouncilOrchestrator:
                 )
             
             self._anthropic_client = AsyncAnthropic(api_key=api_key)
-            self._semaphore = asyncio.Semaphore(3)  # Max 3 concurrent Claude calls
+            # Max concurrent Claude calls for expert analyses
+            self._semaphore = asyncio.Semaphore(max(1, get_config_int("COUNCIL_MAX_CONCURRENCY", 3)))
     
     @property
     def anthropic_client(self) -> AsyncAnthropic:
@@ -80,10 +192,13 @@ class CouncilOrchestrator:
         experts: List[Expert],
         profile: Optional[BusinessProfile] = None,
         user_id: str = "demo_user",
-        persona: Optional[Any] = None  # NEW: UserPersona for deep context
+        persona: Optional[Any] = None,  # NEW: UserPersona for deep context
+        mode: Optional[str] = None,
+        rebuttal: Optional[bool] = None
     ) -> CouncilAnalysis:
         """
-        Run collaborative council analysis with all experts.
+        Run collaborative council analysis with all experts (non-streaming).
+        Thin wrapper over run() that waits for the final analysis.
         
         Args:
             problem: User's business problem/question
@@ -91,73 +206,172 @@ class CouncilOrchestrator:
             profile: Optional BusinessProfile for context
             user_id: User identifier
             persona: Optional UserPersona for ENRICHED context (8 modules)
+            mode: "roundtable" (sequential) or "parallel" - defaults to COUNCIL_MODE env
+            rebuttal: Run the rebuttal round in parallel mode - defaults to COUNCIL_REBUTTAL env
         
         Returns:
             CouncilAnalysis with all expert contributions and consensus
         """
-        analysis_id = str(uuid.uuid4())
+        options = CouncilRunOptions.from_env(mode=mode, rebuttal=rebuttal)
+        async for event in self.run(
+            problem=problem,
+            experts=experts,
+            profile=profile,
+            user_id=user_id,
+            persona=persona,
+            options=options
+        ):
+            if event.type == "error":
+                raise Exception(event.data["message"])
+            if event.type == "analysis_complete":
+                return event.data["analysis"]
+        raise Exception("Council run ended without an analysis")
+    
+    async def run(
+        self,
+        problem: str,
+        experts: List[Expert],
+        profile: Optional[BusinessProfile] = None,
+        user_id: str = "demo_user",
+        persona: Optional[Any] = None,
+        user_context: Optional[Dict[str, Any]] = None,
+        options: Optional[CouncilRunOptions] = None
+    ) -> AsyncIterator[CouncilEvent]:
+        """
+        Council engine shared by the JSON, SSE and council chat endpoints.
+        
+        Yields CouncilEvent in this order (see CouncilEvent for payloads):
+        analysis_started, research_*, expert_* (per expert), rebuttal_*,
+        consensus_started, consensus_delta*, analysis_complete | error.
+        
+        Cancellation: closing or cancelling the generator (e.g. client
+        disconnect) cancels the in-flight Claude/Perplexity calls, including
+        parallel expert tasks.
+        
+        Args:
+            user_context: Extra context for the experts; when None and
+                options.load_user_memory, UserMemoryTool context is loaded
+            options: Mode, rebuttal, streaming and research switches
+        """
+        options = options or CouncilRunOptions.from_env()
+        if options.mode not in self.MODES:
+            raise ValueError(f"Invalid council mode: {options.mode} (expected one of {', '.join(self.MODES)})")
+        
+        timings: Dict[str, float] = {}
+        run_started = time.perf_counter()
+        
+        yield CouncilEvent("analysis_started", {
+            "expertCount": len(experts),
+            "experts": [{"id": e.id, "name": e.name, "avatar": e.avatar} for e in experts],
+            "mode": options.mode
+        })
         
         # Step 0: Load user context via UserMemoryTool (psychographics, past insights, sessions)
-        user_context = await self.user_memory_tool.get_user_context(user_id, limit=5)
+        if user_context is None and options.load_user_memory:
+            with _timed(timings, "user_context"):
+                user_context = await self.user_memory_tool.get_user_context(user_id, limit=5)
         
         # Step 1: Conduct market research using Perplexity (if profile available)
         research_findings = None
-        citations = []
+        citations: List[str] = []
         
-        if profile:
-            research_result = await perplexity_research.research(
-                problem=problem,
-                profile=profile
-            )
-            research_findings = research_result["findings"]
-            citations = research_result["sources"]
+        if profile and options.research:
+            yield CouncilEvent("research_started", {"message": "Conducting market research..."})
+            research_error = None
+            with _timed(timings, "research"):
+                try:
+                    research_result = await perplexity_research.research(
+                        problem=problem,
+                        profile=profile
+                    )
+                    research_findings = research_result.get("findings", "")
+                    citations = research_result.get("sources", [])
+                except Exception as e:
+                    research_error = e
+            if research_error is None:
+                yield CouncilEvent("research_completed", {
+                    "message": "Market research complete",
+                    "citations": len(citations)
+                })
+            else:
+                yield CouncilEvent("research_failed", {"message": f"Research failed: {str(research_error)}"})
         
-        # Step 2: Get individual expert analyses SEQUENTIALLY for roundtable discussion
-        # Each expert sees contributions from colleagues who already spoke
-        contributions = []
-        current_round_contributions = []
+        # Step 2: Get individual expert analyses
+        expert_context = {
+            "problem": problem,
+            "research_findings": research_findings,
+            "profile": profile,
+            "user_id": user_id,
+            "user_context": user_context,
+            "persona": persona,
+        }
+        if options.mode == "parallel":
+            expert_events = self._parallel_round(experts, options.stream, expert_context)
+        else:
+            expert_events = self._roundtable_round(experts, options.stream, expert_context)
         
-        for idx, expert in enumerate(experts, 1):
-            print(f"🎙️ Getting analysis from Expert {idx}/{len(experts)}: {expert.name}")
-            if current_round_contributions:
-                print(f"   → This expert will see {len(current_round_contributions)} colleague(s) who already spoke")
-            
-            try:
-                contribution = await self._get_expert_analysis(
-                    expert=expert,
-                    problem=problem,
-                    research_findings=research_findings,
-                    profile=profile,
-                    user_id=user_id,
-                    user_context=user_context,
-                    colleague_contributions=current_round_contributions if current_round_contributions else None,
-                    persona=persona  # NEW: Pass persona to each expert
-                )
-                contributions.append(contribution)
-                
-                # Add to current round for next expert to see
-                current_round_contributions.append({
-                    "expert_name": expert.name,
-                    "contribution": contribution.analysis
-                })
-                
-            except Exception as e:
-                print(f"⚠️ Expert {expert.name} analysis failed: {str(e)}")
-                continue
+        completed: Dict[int, AgentContribution] = {}
+        with _timed(timings, "experts"):
+            async for event in expert_events:
+                if event.type == "expert_completed":
+                    completed[event.data["order"]] = event.data["contribution"]
+                    timings[f"expert:{event.data['expertName']}"] = event.data["durationMs"]
+                yield event
+        contributions = [completed[order] for order in sorted(completed)]
         
         if not contributions:
-            raise Exception("All expert analyses failed - unable to generate council analysis")
+            yield CouncilEvent("error", {"message": "All expert analyses failed - unable to generate council analysis"})
+            return
+        
+        if options.mode == "parallel" and options.rebuttal and len(contributions) > 1:
+            yield CouncilEvent("rebuttal_started", {"expertCount": len(contributions)})
+            with _timed(timings, "rebuttal"):
+                contributions = await self._run_rebuttal_round(experts, problem, contributions, user_id)
+            yield CouncilEvent("rebuttal_completed", {"expertCount": len(contributions)})
         
         # Step 3: Synthesize consensus from all contributions
-        consensus = await self._synthesize_consensus(
-            problem=problem,
-            contributions=contributions,
-            research_findings=research_findings
+        yield CouncilEvent("consensus_started", {"message": "Synthesizing council consensus..."})
+        with _timed(timings, "consensus"):
+            if options.stream:
+                chunks: List[str] = []
+                try:
+                    async for text in self.stream_consensus(
+                        problem=problem,
+                        contributions=contributions,
+                        research_findings=research_findings
+                    ):
+                        chunks.append(text)
+                        yield CouncilEvent("consensus_delta", {"text": text})
+                    consensus = "".join(chunks)
+                except Exception as e:
+                    # Fall back to the non-streaming synthesis (has its own fallback text)
+                    print(f"[Council] Consensus stream failed, falling back: {str(e)}")
+                    consensus = await self._synthesize_consensus(
+                        problem=problem,
+                        contributions=contributions,
+                        research_findings=research_findings
+                    )
+                    # reset=True tells the client to discard partial text already received
+                    yield CouncilEvent("consensus_delta", {"text": consensus, "reset": True})
+            else:
+                consensus = await self._synthesize_consensus(
+                    problem=problem,
+                    contributions=contributions,
+                    research_findings=research_findings
+                )
+        
+        timings["total"] = round((time.perf_counter() - run_started) * 1000, 1)
+        logger.info(
+            "Council run completed",
+            mode=options.mode,
+            experts=len(experts),
+            contributions=len(contributions),
+            timings=timings,
         )
         
         # Build final analysis
         analysis = CouncilAnalysis(
-            id=analysis_id,
+            id=str(uuid.uuid4()),
             userId=user_id,
             problem=problem,
             profileId=profile.id if profile else None,
@@ -167,9 +381,207 @@ class CouncilOrchestrator:
             citations=citations
         )
         
-        return analysis
+        yield CouncilEvent("analysis_complete", {"analysis": analysis, "timings": timings})
     
-    async def _get_expert_analysis(
+    async def _expert_events(
+        self,
+        expert: Expert,
+        order: int,
+        stream: bool,
+        expert_context: Dict[str, Any],
+        colleague_contributions: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[CouncilEvent]:
+        """Run one expert and yield its started/delta/completed|failed events"""
+        base = {"expertId": expert.id, "expertName": expert.name, "order": order}
+        yield CouncilEvent("expert_started", {**base, "message": f"{expert.name} is analyzing..."})
+        
+        started = time.perf_counter()
+        try:
+            if stream:
+                chunks: List[str] = []
+                async for text in self.stream_expert_analysis(
+                    expert=expert,
+                    colleague_contributions=colleague_contributions,
+                    **expert_context
+                ):
+                    chunks.append(text)
+                    yield CouncilEvent("expert_delta", {**base, "text": text})
+                contribution = self._parse_contribution(expert, "".join(chunks))
+            else:
+                contribution = await self._get_expert_analysis(
+                    expert=expert,
+                    colleague_contributions=colleague_contributions,
+                    **expert_context
+                )
+        except Exception as e:
+            print(f"⚠️ Expert {expert.name} analysis failed: {str(e)}")
+            yield CouncilEvent("expert_failed", {**base, "error": str(e)})
+            return
+        
+        yield CouncilEvent("expert_completed", {
+            **base,
+            "insightCount": len(contribution.keyInsights),
+            "recommendationCount": len(contribution.recommendations),
+            "durationMs": round((time.perf_counter() - started) * 1000, 1),
+            "contribution": contribution
+        })
+    
+    async def _roundtable_round(
+        self,
+        experts: List[Expert],
+        stream: bool,
+        expert_context: Dict[str, Any]
+    ) -> AsyncIterator[CouncilEvent]:
+        """
+        Experts speak SEQUENTIALLY; each sees contributions from colleagues
+        who already spoke in this round.
+        """
+        current_round_contributions: List[Dict[str, str]] = []
+        
+        for order, expert in enumerate(experts):
+            print(f"🎙️ Getting analysis from Expert {order + 1}/{len(experts)}: {expert.name}")
+            if current_round_contributions:
+                print(f"   → This expert will see {len(current_round_contributions)} colleague(s) who already spoke")
+            
+            async for event in self._expert_events(
+                expert,
+                order,
+                stream,
+                expert_context,
+                colleague_contributions=list(current_round_contributions) or None
+            ):
+                if event.type == "expert_completed":
+                    # Add to current round for next expert to see
+                    current_round_contributions.append({
+                        "expert_name": expert.name,
+                        "contribution": event.data["contribution"].analysis
+                    })
+                yield event
+    
+    async def _parallel_round(
+        self,
+        experts: List[Expert],
+        stream: bool,
+        expert_context: Dict[str, Any]
+    ) -> AsyncIterator[CouncilEvent]:
+        """
+        Independent first-round analyses run CONCURRENTLY (bounded by the
+        semaphore, COUNCIL_MAX_CONCURRENCY). Events from all experts are
+        interleaved as they arrive; outstanding tasks are cancelled if the
+        consumer stops iterating.
+        """
+        print(f"🎙️ Getting {len(experts)} independent analyses in parallel")
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def worker(order: int, expert: Expert):
+            try:
+                async for event in self._expert_events(expert, order, stream, expert_context):
+                    queue.put_nowait(event)
+            finally:
+                queue.put_nowait(None)  # Worker finished (or was cancelled)
+        
+        tasks = [asyncio.create_task(worker(order, expert)) for order, expert in enumerate(experts)]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                event = await queue.get()
+                if event is None:
+                    remaining -= 1
+                    continue
+                yield event
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _run_rebuttal_round(
+        self,
+        experts: List[Expert],
+        problem: str,
+        contributions: List[AgentContribution],
+        user_id: str
+    ) -> List[AgentContribution]:
+        """
+        Second, cheaper round: every expert reads the others' first-round analyses
+        and adds a short rebuttal, appended to their analysis. Runs concurrently;
+        an expert whose rebuttal fails keeps the first-round analysis unchanged.
+        """
+        experts_by_id = {expert.id: expert for expert in experts}
+        
+        async def rebut(contribution: AgentContribution) -> AgentContribution:
+            others = [c for c in contributions if c.expertId != contribution.expertId]
+            try:
+                rebuttal_text = await self._get_expert_rebuttal(
+                    expert=experts_by_id[contribution.expertId],
+                    problem=problem,
+                    others=others,
+                    user_id=user_id
+                )
+            except Exception as e:
+                print(f"⚠️ Expert {contribution.expertName} rebuttal failed: {str(e)}")
+                return contribution
+            if not rebuttal_text:
+                return contribution
+            return contribution.model_copy(update={
+                "analysis": f"{contribution.analysis}\n\n## Réplica aos Colegas\n{rebuttal_text}"
+            })
+        
+        print(f"🔁 Rebuttal round for {len(contributions)} experts")
+        return list(await asyncio.gather(*[rebut(c) for c in contributions]))
+    
+    async def _get_expert_rebuttal(
+        self,
+        expert: Expert,
+        problem: str,
+        others: List[AgentContribution],
+        user_id: str = "demo_user"
+    ) -> str:
+        """
+        Short reaction of one expert to the colleagues' first-round analyses.
+        Reuses the expert's cached system prompt; colleagues' texts are truncated
+        and the response is capped (COUNCIL_REBUTTAL_MAX_TOKENS) to keep it cheap.
+        """
+        max_tokens = get_config_int("COUNCIL_REBUTTAL_MAX_TOKENS", 350)
+        colleagues_text = ""
+        for other in others:
+            excerpt = other.analysis[:600] + ("..." if len(other.analysis) > 600 else "")
+            colleagues_text += f"--- {other.expertName} ---\n{excerpt}\n\n"
+        
+        user_message = f"""**IMPORTANTE: Responda SEMPRE em português brasileiro (PT-BR).**
+
+**Problema em discussão:**
+{problem}
+
+**ANÁLISES DOS SEUS COLEGAS DE CONSELHO:**
+{colleagues_text}
+**Sua Tarefa - RÉPLICA CURTA:**
+Você já deu sua análise inicial. Agora reaja às análises dos colegas em 1-2 parágrafos curtos:
+- Cite o PONTO ESPECÍFICO de um colega com que você concorda ou discorda, e por quê
+- Acrescente o que, da sua perspectiva como {expert.name}, ficou faltando
+- Não repita sua análise inicial"""
+        
+        async with self.semaphore, tracked_llm_call("council_rebuttal", max_tokens):
+            response = await asyncio.wait_for(
+                self.anthropic_client.messages.create(
+                    model="claude-sonnet-4-20250514",
+                    max_tokens=max_tokens,
+                    system=self._build_enhanced_system_prompt(expert, user_id),
+                    messages=[{
+                        "role": "user",
+                        "content": user_message
+                    }]
+                ),
+                timeout=LLM_CALL_TIMEOUT
+            )
+        log_cache_usage(response, "council_rebuttal", expert=expert.name)
+        
+        for block in response.content:
+            if block.type == "text":
+                return block.text.strip()  # type: ignore
+        return ""
+    
+    def _build_expert_prompt(
         self,
         expert: Expert,
         problem: str,
@@ -178,99 +590,89 @@ class CouncilOrchestrator:
         user_id: str = "demo_user",
         user_context: Optional[Dict[str, Any]] = None,
         colleague_contributions: Optional[List[Dict[str, str]]] = None,
-        persona: Optional[Any] = None  # NEW: UserPersona for enriched context
-    ) -> AgentContribution:
+        persona: Optional[Any] = None
+    ) -> tuple:
         """
-        Get analysis from a single expert using their cognitive clone with tool support.
-        Uses semaphore to limit concurrent API calls and prevent rate limiting.
+        Build (system, user_message) for one expert's analysis.
+        Shared by _get_expert_analysis and stream_expert_analysis.
+        """
+        # Build enhanced system prompt with tool instructions
+        enhanced_system = self._build_enhanced_system_prompt(expert, user_id)
         
-        Args:
-            colleague_contributions: List of {"expert_name": str, "contribution": str} 
-                                    from colleagues who already spoke in this round (for roundtable)
-            persona: Optional UserPersona with ALL 8 enriched modules for ultra-personalization
+        # Build context-rich prompt
+        context_parts = []
         
-        Returns:
-            AgentContribution with expert's unique perspective
-        """
-        async with self.semaphore:
-            # Build enhanced system prompt with tool instructions
-            enhanced_system = self._build_enhanced_system_prompt(expert, user_id)
-            
-            # Build context-rich prompt
-            context_parts = []
-            
-            # Add colleague contributions for roundtable discussion (Council Room only)
-            if colleague_contributions and len(colleague_contributions) > 0:
-                colleagues_text = "**SEUS COLEGAS JÁ FALARAM (ouça e dialogue com eles):**\n\n"
-                for idx, colleague in enumerate(colleague_contributions, 1):
-                    colleagues_text += f"--- {colleague['expert_name']} ---\n"
-                    colleagues_text += f"{colleague['contribution']}\n\n"
-                
-                context_parts.append(colleagues_text)
-            
-            # Add user context (psychographics, past insights) if available
-            if user_context and user_context.get("profile"):
-                user_profile = user_context["profile"]
-                context_parts.append(
-                    f"**User Profile & Context:**\n"
-                    f"- Business Stage: {user_profile.get('business_stage', 'Unknown')}\n"
-                    f"- Niche: {user_profile.get('niche', 'Unknown')}\n"
-                    f"- Marketing Maturity: {user_profile.get('marketing_maturity', 'Unknown')}\n"
-                    f"- Communication Style: {user_profile.get('preferred_communication_style', 'Unknown')}\n"
-                )
-                
-                # Add past insights if available
-                if user_context.get("past_insights"):
-                    insights_summary = [
-                        f"  • {insight['expert_name']}: {insight['insight'][:100]}..."
-                        for insight in user_context["past_insights"][:3]
-                    ]
-                    context_parts.append(
-                        f"**Past Insights (Continuity):**\n" + "\n".join(insights_summary) + "\n"
-                    )
-            
-            # Add analysis context for follow-up questions (Council Room)
-            if user_context and user_context.get("analysis_context"):
-                context_parts.append(user_context["analysis_context"])
+        # Add colleague contributions for roundtable discussion (Council Room only)
+        if colleague_contributions and len(colleague_contributions) > 0:
+            colleagues_text = "**SEUS COLEGAS JÁ FALARAM (ouça e dialogue com eles):**\n\n"
+            for idx, colleague in enumerate(colleague_contributions, 1):
+                colleagues_text += f"--- {colleague['expert_name']} ---\n"
+                colleagues_text += f"{colleague['contribution']}\n\n"
             
-            # Add ENRICHED persona context if available (PRIORITY over business profile)
-            if persona:
-                # Import the function from main.py
-                from main import _build_enriched_persona_context
-                persona_context_text = _build_enriched_persona_context(persona)
-                context_parts.append(persona_context_text)
-                print(f"   → Expert {expert.name} receiving ENRICHED persona context ({len(persona_context_text)} chars)")
-            elif profile:
-                # Fallback to basic business profile if no persona
-                context_parts.append(
-                    f"**Business Context:**\n"
-                    f"- Company: {profile.companyName} ({profile.companySize} employees)\n"
-                    f"- Industry: {profile.industry}\n"
-                    f"- Target Audience: {profile.targetAudience}\n"
-                    f"- Products: {profile.mainProducts}\n"
-                    f"- Channels: {', '.join(profile.channels)}\n"
-                    f"- Budget: {profile.budgetRange}\n"
-                    f"- Primary Goal: {profile.primaryGoal}\n"
-                    f"- Main Challenge: {profile.mainChallenge}\n"
-                    f"- Timeline: {profile.timeline}\n"
-                )
+            context_parts.append(colleagues_text)
+        
+        # Add user context (psychographics, past insights) if available
+        if user_context and user_context.get("profile"):
+            user_profile = user_context["profile"]
+            context_parts.append(
+                f"**User Profile & Context:**\n"
+                f"- Business Stage: {user_profile.get('business_stage', 'Unknown')}\n"
+                f"- Niche: {user_profile.get('niche', 'Unknown')}\n"
+                f"- Marketing Maturity: {user_profile.get('marketing_maturity', 'Unknown')}\n"
+                f"- Communication Style: {user_profile.get('preferred_communication_style', 'Unknown')}\n"
+            )
             
-            # Add market research if available
-            if research_findings:
+            # Add past insights if available
+            if user_context.get("past_insights"):
+                insights_summary = [
+                    f"  • {insight['expert_name']}: {insight['insight'][:100]}..."
+                    for insight in user_context["past_insights"][:3]
+                ]
                 context_parts.append(
-                    f"**Market Research & Intelligence:**\n{research_findings}\n"
+                    f"**Past Insights (Continuity):**\n" + "\n".join(insights_summary) + "\n"
                 )
+        
+        # Add analysis context for follow-up questions (Council Room)
+        if user_context and user_context.get("analysis_context"):
+            context_parts.append(user_context["analysis_context"])
+        
+        # Add ENRICHED persona context if available (PRIORITY over business profile)
+        if persona:
+            # Rendered once per persona version, shared by all experts
+            persona_context_text = persona_context_cache.render(persona)
+            context_parts.append(persona_context_text)
+            print(f"   → Expert {expert.name} receiving ENRICHED persona context ({len(persona_context_text)} chars)")
+        elif profile:
+            # Fallback to basic business profile if no persona
+            context_parts.append(
+                f"**Business Context:**\n"
+                f"- Company: {profile.companyName} ({profile.companySize} employees)\n"
+                f"- Industry: {profile.industry}\n"
+                f"- Target Audience: {profile.targetAudience}\n"
+                f"- Products: {profile.mainProducts}\n"
+                f"- Channels: {', '.join(profile.channels)}\n"
+                f"- Budget: {profile.budgetRange}\n"
+                f"- Primary Goal: {profile.primaryGoal}\n"
+                f"- Main Challenge: {profile.mainChallenge}\n"
+                f"- Timeline: {profile.timeline}\n"
+            )
+        
+        # Add market research if available
+        if research_findings:
+            context_parts.append(
+                f"**Market Research & Intelligence:**\n{research_findings}\n"
+            )
+        
+        # Build final user message
+        context = "\n\n".join(context_parts) if context_parts else ""
+        
+        # Build dialogue instructions if colleagues have spoken
+        dialogue_instructions = ""
+        if colleague_contributions and len(colleague_contributions) > 0:
+            colleague_names = [c['expert_name'] for c in colleague_contributions]
+            colleagues_str = ", ".join(colleague_names[:-1]) + f" e {colleague_names[-1]}" if len(colleague_names) > 1 else colleague_names[0]
             
-            # Build final user message
-            context = "\n\n".join(context_parts) if context_parts else ""
-            
-            # Build dialogue instructions if colleagues have spoken
-            dialogue_instructions = ""
-            if colleague_contributions and len(colleague_contributions) > 0:
-                colleague_names = [c['expert_name'] for c in colleague_contributions]
-                colleagues_str = ", ".join(colleague_names[:-1]) + f" e {colleague_names[-1]}" if len(colleague_names) > 1 else colleague_names[0]
-                
-                dialogue_instructions = f"""
+            dialogue_instructions = f"""
 **ROUNDTABLE DISCUSSION - DIALOGUE COM SEUS COLEGAS:**
 {colleagues_str} já {'falaram' if len(colleague_names) > 1 else 'falou'}. Você está em uma mesa redonda de consultoria.
 
@@ -299,10 +701,10 @@ Se você remover o nome do colega da sua frase, ela ainda deve fazer sentido e m
 "Olha, concordo com o Simon sobre começar pelo WHY do cliente ao invés de listar features. E baseado na minha experiência com posicionamento, eu adicionaria que esse WHY precisa ser diferenciado - não pode ser genérico tipo 'ajudamos empresas a crescer'..."
 """
 
-            # DIFFERENT PROMPTS: Initial analysis vs Follow-up conversation
-            if colleague_contributions and len(colleague_contributions) > 0:
-                # FOLLOW-UP CONVERSATION (Council Room) - Conversational style
-                user_message = f"""**IMPORTANTE: Responda SEMPRE em português brasileiro (PT-BR) natural e coloquial.**
+        # DIFFERENT PROMPTS: Initial analysis vs Follow-up conversation
+        if colleague_contributions and len(colleague_contributions) > 0:
+            # FOLLOW-UP CONVERSATION (Council Room) - Conversational style
+            user_message = f"""**IMPORTANTE: Responda SEMPRE em português brasileiro (PT-BR) natural e coloquial.**
 
 {context}
 
@@ -342,9 +744,9 @@ RESPONDA de forma:
 - Citações em inglês ou outros idiomas
 
 Seja você mesmo, mas numa conversa natural."""
-            else:
-                # INITIAL ANALYSIS (Test Council) - Structured format with insights/recommendations
-                user_message = f"""**IMPORTANTE: Responda SEMPRE em português brasileiro (PT-BR).**
+        else:
+            # INITIAL ANALYSIS (Test Council) - Structured format with insights/recommendations
+            user_message = f"""**IMPORTANTE: Responda SEMPRE em português brasileiro (PT-BR).**
 
 {context}
 
@@ -383,21 +785,60 @@ Você está no Conselho Estratégico analisando este desafio pela primeira vez.
 - Profissional mas acessível
 - Direto e prático
 - Baseado na sua experiência como {expert.name}"""
+        
+        return enhanced_system, user_message
+    
+    async def _get_expert_analysis(
+        self,
+        expert: Expert,
+        problem: str,
+        research_findings: Optional[str],
+        profile: Optional[BusinessProfile],
+        user_id: str = "demo_user",
+        user_context: Optional[Dict[str, Any]] = None,
+        colleague_contributions: Optional[List[Dict[str, str]]] = None,
+        persona: Optional[Any] = None  # NEW: UserPersona for enriched context
+    ) -> AgentContribution:
+        """
+        Get analysis from a single expert using their cognitive clone with tool support.
+        Uses semaphore to limit concurrent API calls and prevent rate limiting.
+        
+        Args:
+            colleague_contributions: List of {"expert_name": str, "contribution": str} 
+                                    from colleagues who already spoke in this round (for roundtable)
+            persona: Optional UserPersona with ALL 8 enriched modules for ultra-personalization
+        
+        Returns:
+            AgentContribution with expert's unique perspective
+        """
+        async with self.semaphore:
+            enhanced_system, user_message = self._build_expert_prompt(
+                expert=expert,
+                problem=problem,
+                research_findings=research_findings,
+                profile=profile,
+                user_id=user_id,
+                user_context=user_context,
+                colleague_contributions=colleague_contributions,
+                persona=persona
+            )
             
             # Call Claude with expert's enhanced system prompt (with timeout)
             try:
-                response = await asyncio.wait_for(
-                    self.anthropic_client.messages.create(
-                        model="claude-sonnet-4-20250514",
-                        max_tokens=800,  # Reduced from 3000 to force concise responses
-                        system=enhanced_system,
-                        messages=[{
-                            "role": "user",
-                            "content": user_message
-                        }]
-                    ),
-                    timeout=60.0  # 60 second timeout per expert
-                )
+                async with tracked_llm_call("council_expert", max_tokens=800):
+                    response = await asyncio.wait_for(
+                        self.anthropic_client.messages.create(
+                            model="claude-sonnet-4-20250514",
+                            max_tokens=800,  # Reduced from 3000 to force concise responses
+                            system=enhanced_system,
+                            messages=[{
+                                "role": "user",
+                                "content": user_message
+                            }]
+                        ),
+                        timeout=LLM_CALL_TIMEOUT
+                    )
+                log_cache_usage(response, "council_expert", expert=expert.name)
                 
                 # Extract text response (handle TextBlock type)
                 response_text = ""
@@ -406,23 +847,74 @@ Você está no Conselho Estratégico analisando este desafio pela primeira vez.
                         response_text = block.text  # type: ignore
                         break
                 
-                # Parse structured response with robust parser
-                insights = self._extract_bullet_points(response_text, "Key Insights")
-                recommendations = self._extract_bullet_points(response_text, "Actionable Recommendations")
-                
-                return AgentContribution(
-                    expertId=expert.id,
-                    expertName=expert.name,
-                    analysis=response_text,
-                    keyInsights=insights,
-                    recommendations=recommendations
-                )
+                return self._parse_contribution(expert, response_text)
             
             except asyncio.TimeoutError:
-                raise Exception(f"{expert.name} analysis timed out after 60 seconds")
+                raise Exception(f"{expert.name} analysis timed out after {LLM_CALL_TIMEOUT:.0f} seconds")
             except Exception as e:
                 raise Exception(f"{expert.name} analysis failed: {str(e)}")
     
+    async def stream_expert_analysis(
+        self,
+        expert: Expert,
+        problem: str,
+        research_findings: Optional[str],
+        profile: Optional[BusinessProfile],
+        user_id: str = "demo_user",
+        user_context: Optional[Dict[str, Any]] = None,
+        colleague_contributions: Optional[List[Dict[str, str]]] = None,
+        persona: Optional[Any] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of _get_expert_analysis - yields text deltas as Claude
+        produces them. Build the final AgentContribution from the joined text
+        with _parse_contribution.
+        """
+        async with self.semaphore:
+            enhanced_system, user_message = self._build_expert_prompt(
+                expert=expert,
+                problem=problem,
+                research_findings=research_findings,
+                profile=profile,
+                user_id=user_id,
+                user_context=user_context,
+                colleague_contributions=colleague_contributions,
+                persona=persona
+            )
+            
+            try:
+                async with tracked_llm_call("council_expert_stream", max_tokens=800) as call:
+                    async for text in _stream_with_deadline(
+                        self.anthropic_client.messages.stream(
+                            model="claude-sonnet-4-20250514",
+                            max_tokens=800,
+                            system=enhanced_system,
+                            messages=[{
+                                "role": "user",
+                                "content": user_message
+                            }]
+                        ),
+                        call,
+                        usage_label="council_expert_stream",
+                        expert=expert.name
+                    ):
+                        yield text
+            except asyncio.TimeoutError:
+                raise Exception(f"{expert.name} analysis timed out after {LLM_CALL_TIMEOUT:.0f} seconds")
+    
+    def _parse_contribution(self, expert: Expert, response_text: str) -> AgentContribution:
+        """Parse structured response (insights/recommendations) with robust parser"""
+        insights = self._extract_bullet_points(response_text, "Key Insights")
+        recommendations = self._extract_bullet_points(response_text, "Actionable Recommendations")
+        
+        return AgentContribution(
+            expertId=expert.id,
+            expertName=expert.name,
+            analysis=response_text,
+            keyInsights=insights,
+            recommendations=recommendations
+        )
+    
     async def _synthesize_consensus(
         self,
         problem: str,
@@ -435,6 +927,82 @@ Você está no Conselho Estratégico analisando este desafio pela primeira vez.
         Uses a meta-analyst prompt to find common ground and synthesize
         insights from all experts.
         """
+        synthesis_prompt = self._build_synthesis_prompt(problem, contributions)
+        
+        
+        # Call Claude for synthesis (using a neutral system prompt) with timeout
+        try:
+            async with tracked_llm_call("council_consensus", max_tokens=500):
+                response = await asyncio.wait_for(
+                    self.anthropic_client.messages.create(
+                        model="claude-sonnet-4-20250514",
+                        max_tokens=500,  # Reduced from 2500 for concise synthesis
+                        system=SYNTHESIS_SYSTEM_PROMPT,
+                        messages=[{
+                            "role": "user",
+                            "content": synthesis_prompt
+                        }]
+                    ),
+                    timeout=LLM_CALL_TIMEOUT
+                )
+            
+            # Extract consensus text (handle TextBlock type)
+            consensus_text = ""
+            for block in response.content:
+                if block.type == "text":
+                    consensus_text = block.text  # type: ignore
+                    break
+            
+            return consensus_text
+            
+        except asyncio.TimeoutError:
+            # Fallback synthesis if API times out
+            return f"""**Síntese do Conselho (Gerada Automaticamente)**
+
+Aguardo as contribuições dos especialistas para realizar a síntese estratégica.
+
+**Contribuições Recebidas:**
+{len(contributions)} especialistas compartilharam suas análises sobre: {problem}
+
+Para continuar, por favor reformule sua pergunta ou aguarde um momento."""
+        except Exception as e:
+            # Fallback synthesis on any error
+            print(f"[Synthesis Error] {str(e)}")
+            return f"""**Síntese Parcial**
+
+Não foi possível completar a síntese completa no momento. Aqui está um resumo das contribuições:
+
+{len(contributions)} especialistas analisaram: {problem}
+
+Por favor, tente reformular sua pergunta."""
+    
+    async def stream_consensus(
+        self,
+        problem: str,
+        contributions: List[AgentContribution],
+        research_findings: Optional[str]
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of _synthesize_consensus - yields text deltas.
+        Errors propagate to the caller (no fallback text).
+        """
+        async with tracked_llm_call("council_consensus_stream", max_tokens=500) as call:
+            async for text in _stream_with_deadline(
+                self.anthropic_client.messages.stream(
+                    model="claude-sonnet-4-20250514",
+                    max_tokens=500,
+                    system=SYNTHESIS_SYSTEM_PROMPT,
+                    messages=[{
+                        "role": "user",
+                        "content": self._build_synthesis_prompt(problem, contributions)
+                    }]
+                ),
+                call
+            ):
+                yield text
+    
+    def _build_synthesis_prompt(self, problem: str, contributions: List[AgentContribution]) -> str:
+        """Build the moderator prompt that synthesizes all expert contributions"""
         # Build synthesis prompt with all contributions
         contributions_text = ""
         for contrib in contributions:
@@ -489,61 +1057,21 @@ EXEMPLOS de como começar:
 
 Sintetize o DIÁLOGO que rolou, mostrando como os experts conversaram entre si."""
         
-        # Call Claude for synthesis (using a neutral system prompt) with timeout
-        try:
-            response = await asyncio.wait_for(
-                self.anthropic_client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=500,  # Reduced from 2500 for concise synthesis
-                    system="Você é um moderador experiente de reuniões de consultoria. Fale em português brasileiro natural e coloquial.",
-                    messages=[{
-                        "role": "user",
-                        "content": synthesis_prompt
-                    }]
-                ),
-                timeout=60.0  # 60 second timeout for synthesis
-            )
-            
-            # Extract consensus text (handle TextBlock type)
-            consensus_text = ""
-            for block in response.content:
-                if block.type == "text":
-                    consensus_text = block.text  # type: ignore
-                    break
-            
-            return consensus_text
-            
-        except asyncio.TimeoutError:
-            # Fallback synthesis if API times out
-            return f"""**Síntese do Conselho (Gerada Automaticamente)**
-
-Aguardo as contribuições dos especialistas para realizar a síntese estratégica.
-
-**Contribuições Recebidas:**
-{len(contributions)} especialistas compartilharam suas análises sobre: {problem}
-
-Para continuar, por favor reformule sua pergunta ou aguarde um momento."""
-        except Exception as e:
-            # Fallback synthesis on any error
-            print(f"[Synthesis Error] {str(e)}")
-            return f"""**Síntese Parcial**
-
-Não foi possível completar a síntese completa no momento. Aqui está um resumo das contribuições:
-
-{len(contributions)} especialistas analisaram: {problem}
-
-Por favor, tente reformular sua pergunta."""
+        return synthesis_prompt
     
-    def _build_enhanced_system_prompt(self, expert: Expert, user_id: str) -> str:
+    def _build_enhanced_system_prompt(self, expert: Expert, user_id: str) -> Union[str, List[Dict[str, Any]]]:
         """
         Build expert system prompt enriched with tool instructions
         
+        The whole system prompt is static per expert (persona and problem
+        context go in the user message), so it is sent as one cached block.
+        
         Args:
             expert: Expert model with systemPrompt
             user_id: User identifier for personalization
         
         Returns:
-            Enhanced system prompt with tool capabilities
+            System prompt content blocks (or plain string if caching is disabled)
         """
         enhanced = expert.systemPrompt
         
@@ -559,7 +1087,7 @@ Por favor, tente reformular sua pergunta."""
             
             enhanced += "\nUse these capabilities to enrich your analysis with contextual data, user preferences, and relevant case studies.\n"
         
-        return enhanced
+        return build_cached_system(enhanced)
     
     def _extract_bullet_points(self, text: str, section_name: str) -> List[str]:
         """
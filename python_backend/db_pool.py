@@ -3,11 +3,190 @@ Database Connection Pool Manager
 Centralized asyncpg connection pool with health checks and monitoring.
 """
 import asyncpg
+import asyncio
 import os
-from typing import Optional
+import time
+from typing import Optional, Dict, Any
 from contextlib import asynccontextmanager
 from logger import logger
-from env_validator import get_config_int, get_config
+from env_validator import get_config_int, get_config, get_config_float, get_config_bool
+
+
+# Default acquisition budgets (max concurrent connections) per subsystem.
+# A budget of 0 means "no cap beyond the pool itself".
+# Override with DB_POOL_BUDGET_<SUBSYSTEM>, e.g. DB_POOL_BUDGET_ANALYTICS=6
+DEFAULT_SUBSYSTEM_BUDGETS: Dict[str, int] = {
+    "default": 0,
+    "storage": 0,
+    "analytics": 4,
+    "memory": 3,
+    "admin": 2,
+    "enrichment": 2,
+}
+
+
+# Errors raised when a cached prepared statement no longer matches the schema
+# (e.g. a column was added/altered by a migration while the app was running).
+STATEMENT_CACHE_ERRORS = (
+    asyncpg.exceptions.InvalidCachedStatementError,
+    asyncpg.exceptions.OutdatedSchemaCacheError,
+)
+
+
+class SubsystemStats:
+    """Acquisition counters for one subsystem sharing the pool"""
+    
+    def __init__(self, name: str, budget: int):
+        self.name = name
+        self.budget = budget
+        self.acquisitions = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waiting = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = (
+            asyncio.Semaphore(budget) if budget > 0 else None
+        )
+    
+    def record_wait(self, wait_ms: float):
+        self.acquisitions += 1
+        self.total_wait_ms += wait_ms
+        if wait_ms > self.max_wait_ms:
+            self.max_wait_ms = wait_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        avg_wait = self.total_wait_ms / self.acquisitions if self.acquisitions else 0.0
+        return {
+            "budget": self.budget or None,
+            "acquisitions": self.acquisitions,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "waiting": self.waiting,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "avg_wait_ms": round(avg_wait, 2),
+            "max_wait_ms": round(self.max_wait_ms, 2),
+        }
+
+
+class StatementCacheConnection:
+    """
+    Connection wrapper used when the prepared-statement cache is enabled.
+    
+    If a query fails because a cached statement was invalidated by a schema
+    change, the connection's statement/type caches are reset and the query is
+    retried once. Inside an explicit transaction the failed statement has
+    already aborted the transaction, so the caches are reset and the error is
+    re-raised for the caller to retry the whole transaction.
+    """
+    
+    def __init__(self, conn: asyncpg.Connection, db: 'DatabasePool'):
+        self._conn = conn
+        self._db = db
+    
+    async def _run(self, method: str, *args, **kwargs):
+        func = getattr(self._conn, method)
+        try:
+            return await func(*args, **kwargs)
+        except STATEMENT_CACHE_ERRORS as e:
+            self._db._statement_cache_resets += 1
+            in_transaction = self._conn.is_in_transaction()
+            logger.warning(
+                "Prepared statement invalidated by schema change, resetting cache",
+                error=str(e),
+                retry=not in_transaction,
+            )
+            await self._conn.reload_schema_state()
+            if in_transaction:
+                raise
+            return await func(*args, **kwargs)
+    
+    async def execute(self, query: str, *args, **kwargs):
+        return await self._run("execute", query, *args, **kwargs)
+    
+    async def executemany(self, command: str, args, **kwargs):
+        return await self._run("executemany", command, args, **kwargs)
+    
+    async def fetch(self, query: str, *args, **kwargs):
+        return await self._run("fetch", query, *args, **kwargs)
+    
+    async def fetchrow(self, query: str, *args, **kwargs):
+        return await self._run("fetchrow", query, *args, **kwargs)
+    
+    async def fetchval(self, query: str, *args, **kwargs):
+        return await self._run("fetchval", query, *args, **kwargs)
+    
+    def __getattr__(self, name):
+        # transaction(), copy_records_to_table(), is_in_transaction(), ...
+        return getattr(self._conn, name)
+
+
+class ScopedPool:
+    """
+    Pool view bound to a single subsystem.
+    Exposes the asyncpg-style `acquire()` API so existing call sites
+    (`async with self.pool.acquire() as conn`) keep working unchanged.
+    """
+    
+    def __init__(self, db: 'DatabasePool', subsystem: str):
+        self._db = db
+        self.subsystem = subsystem
+    
+    def acquire(self):
+        return self._db.acquire(self.subsystem)
+    
+    async def execute(self, query: str, *args):
+        return await self._db.execute(query, *args, subsystem=self.subsystem)
+    
+    async def fetch(self, query: str, *args):
+        return await self._db.fetch(query, *args, subsystem=self.subsystem)
+    
+    async def fetchrow(self, query: str, *args):
+        return await self._db.fetchrow(query, *args, subsystem=self.subsystem)
+    
+    async def fetchval(self, query: str, *args):
+        return await self._db.fetchval(query, *args, subsystem=self.subsystem)
+
+
+class ThreadsafeConnection:
+    """
+    Connection-like proxy for code running on a *different* event loop
+    (e.g. the persona enrichment worker thread).
+    
+    asyncpg pools are bound to the loop that created them, so each query is
+    scheduled on the main loop and awaited from the caller's loop. Every call
+    borrows a pooled connection for the duration of that single query.
+    """
+    
+    def __init__(self, db: 'DatabasePool', subsystem: str):
+        self._db = db
+        self.subsystem = subsystem
+    
+    async def _run(self, method: str, query: str, *args):
+        if self._db._loop is None:
+            raise RuntimeError("Database pool not initialized. Call initialize() first.")
+        coro = getattr(self._db, method)(query, *args, subsystem=self.subsystem)
+        future = asyncio.run_coroutine_threadsafe(coro, self._db._loop)
+        return await asyncio.wrap_future(future)
+    
+    async def execute(self, query: str, *args):
+        return await self._run("execute", query, *args)
+    
+    async def fetch(self, query: str, *args):
+        return await self._run("fetch", query, *args)
+    
+    async def fetchrow(self, query: str, *args):
+        return await self._run("fetchrow", query, *args)
+    
+    async def fetchval(self, query: str, *args):
+        return await self._run("fetchval", query, *args)
+    
+    async def close(self):
+        """No-op: connections are returned to the pool after each query"""
+        pass
 
 class DatabasePool:
     """
@@ -17,10 +196,16 @@ class DatabasePool:
     
     _instance: Optional['DatabasePool'] = None
     _pool: Optional[asyncpg.Pool] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _subsystems: Dict[str, SubsystemStats] = {}
+    _acquire_timeout: float = 30.0
+    _statement_cache_size: int = 0
+    _statement_cache_resets: int = 0
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._subsystems = {}
         return cls._instance
     
     @property
@@ -48,12 +233,21 @@ class DatabasePool:
         
         # Additional pool settings
         command_timeout = get_config_int("DB_COMMAND_TIMEOUT", 60)
+        self._acquire_timeout = get_config_float("DB_POOL_ACQUIRE_TIMEOUT", 30.0)
+        
+        # Prepared statement cache is opt-in: it saves a parse/plan round on
+        # every repeated query, at the cost of handling schema-change errors.
+        if get_config_bool("DB_STATEMENT_CACHE_ENABLED", False):
+            self._statement_cache_size = get_config_int("DB_STATEMENT_CACHE_SIZE", 100)
+        else:
+            self._statement_cache_size = 0
         
         logger.info(
             "Initializing database connection pool",
             min_size=min_size,
             max_size=max_size,
             max_queries=max_queries,
+            statement_cache_size=self._statement_cache_size,
         )
         
         try:
@@ -64,10 +258,12 @@ class DatabasePool:
                 max_queries=max_queries,
                 max_inactive_connection_lifetime=300,  # 5 minutes
                 command_timeout=command_timeout,
-                # Disable statement cache to avoid issues with schema changes
-                statement_cache_size=0,
+                # 0 (default) disables the cache; see DB_STATEMENT_CACHE_ENABLED
+                statement_cache_size=self._statement_cache_size,
             )
             
+            self._loop = asyncio.get_running_loop()
+            
             # Test connection
             async with self._pool.acquire() as conn:
                 await conn.fetchval("SELECT 1")
@@ -95,71 +291,137 @@ class DatabasePool:
         try:
             await self._pool.close()
             self._pool = None
+            self._loop = None
             logger.info("Database pool closed successfully")
         except Exception as e:
             logger.error("Error closing database pool", error=str(e))
             raise
     
+    def _get_subsystem(self, subsystem: str) -> SubsystemStats:
+        """Get (or lazily register) the stats/budget holder for a subsystem"""
+        stats = self._subsystems.get(subsystem)
+        if stats is None:
+            default_budget = DEFAULT_SUBSYSTEM_BUDGETS.get(subsystem, 0)
+            budget = get_config_int(f"DB_POOL_BUDGET_{subsystem.upper()}", default_budget)
+            stats = SubsystemStats(subsystem, max(budget, 0))
+            self._subsystems[subsystem] = stats
+        return stats
+    
+    def scoped(self, subsystem: str) -> ScopedPool:
+        """
+        Get a pool view whose acquisitions are accounted to `subsystem`.
+        
+        Usage:
+            self.pool = db_pool.scoped("storage")
+            async with self.pool.acquire() as conn:
+                ...
+        """
+        return ScopedPool(self, subsystem)
+    
+    def threadsafe_connection(self, subsystem: str) -> ThreadsafeConnection:
+        """
+        Get a connection proxy usable from another thread's event loop.
+        Queries are executed on the shared pool in the main loop.
+        """
+        return ThreadsafeConnection(self, subsystem)
+    
     @asynccontextmanager
-    async def acquire(self):
+    async def acquire(self, subsystem: str = "default"):
         """
         Acquire a connection from the pool using context manager.
         Ensures connection is always released back to the pool.
         
+        Acquisitions are accounted to `subsystem`: each subsystem may hold at
+        most its budget of connections at once, and wait time is recorded.
+        
         Usage:
-            async with db_pool.acquire() as conn:
+            async with db_pool.acquire("analytics") as conn:
                 result = await conn.fetchval("SELECT 1")
         """
         if self._pool is None:
             raise RuntimeError("Database pool not initialized. Call initialize() first.")
         
+        stats = self._get_subsystem(subsystem)
+        semaphore = stats._semaphore
         conn = None
+        budget_held = False
+        start = time.perf_counter()
+        stats.waiting += 1
         try:
-            conn = await self._pool.acquire()
-            yield conn
-        except asyncpg.exceptions.TooManyConnectionsError:
-            logger.error("Database pool exhausted - too many connections")
-            raise
-        except asyncpg.exceptions.PoolAcquireTimeoutError:
-            logger.error("Timeout acquiring connection from pool")
-            raise
-        except Exception as e:
-            logger.error("Error with database connection", error=str(e))
-            raise
+            try:
+                if semaphore is not None:
+                    await asyncio.wait_for(semaphore.acquire(), timeout=self._acquire_timeout)
+                    budget_held = True
+                remaining = max(self._acquire_timeout - (time.perf_counter() - start), 0.001)
+                conn = await self._pool.acquire(timeout=remaining)
+            except asyncio.TimeoutError:
+                # Before the OSError clause: on Python 3.11+ TimeoutError is an OSError
+                stats.timeouts += 1
+                logger.error(
+                    "Timeout acquiring connection from pool",
+                    subsystem=subsystem,
+                    budget=stats.budget,
+                )
+                raise
+            except asyncpg.exceptions.TooManyConnectionsError:
+                stats.errors += 1
+                logger.error("Database pool exhausted - too many connections", subsystem=subsystem)
+                raise
+            except (asyncpg.exceptions.PostgresError, asyncpg.exceptions.InterfaceError, OSError) as e:
+                stats.errors += 1
+                logger.error("Error with database connection", subsystem=subsystem, error=str(e))
+                raise
+            finally:
+                stats.waiting -= 1
+            
+            stats.record_wait((time.perf_counter() - start) * 1000)
+            stats.in_use += 1
+            if stats.in_use > stats.peak_in_use:
+                stats.peak_in_use = stats.in_use
+            
+            # Exceptions from the caller's block (e.g. a UniqueViolation) propagate
+            # without being counted as pool errors
+            if self._statement_cache_size > 0:
+                yield StatementCacheConnection(conn, self)
+            else:
+                yield conn
         finally:
             if conn is not None:
+                stats.in_use -= 1
                 try:
                     await self._pool.release(conn)
                 except Exception as e:
                     logger.error("Error releasing connection back to pool", error=str(e))
+            if budget_held:
+                semaphore.release()
     
-    async def execute(self, query: str, *args):
+    async def execute(self, query: str, *args, subsystem: str = "default"):
         """
         Execute a query using a pooled connection.
         Convenience method for simple queries.
         """
-        async with self.acquire() as conn:
+        async with self.acquire(subsystem) as conn:
             return await conn.execute(query, *args)
     
-    async def fetch(self, query: str, *args):
+    async def fetch(self, query: str, *args, subsystem: str = "default"):
         """
         Fetch multiple rows using a pooled connection.
         """
-        async with self.acquire() as conn:
+        async with self.acquire(subsystem) as conn:
             return await conn.fetch(query, *args)
     
-    async def fetchrow(self, query: str, *args):
+    async def fetchrow(self, query: str, *args, subsystem: str = "default"):
         """
         Fetch a single row using a pooled connection.
         """
-        async with self.acquire() as conn:
+        async with self.acquire(subsystem) as conn:
             return await conn.fetchrow(query, *args)
     
-    async def fetchval(self, query: str, *args):
+    async def fetchval(self, query: str, *args, subsystem: str = "default"):
         """
         Fetch a single value using a pooled connection.
         """
-        async with self.acquire() as conn:
+        async with self.acquire(subsystem) as conn:
             return await conn.fetchval(query, *args)
     
     async def get_pool_stats(self) -> dict:
@@ -173,7 +435,18 @@ class DatabasePool:
             - max_size: Maximum pool size
             - free: Number of free connections
             - in_use: Number of connections in use
+            - subsystems: Per-subsystem budget, acquisitions and wait times
+            - statement_cache: Prepared statement cache size and reset count
         """
+        subsystems = {
+            name: stats.to_dict() for name, stats in self._subsystems.items()
+        }
+        statement_cache = {
+            "enabled": self._statement_cache_size > 0,
+            "size": self._statement_cache_size,
+            "resets": self._statement_cache_resets,
+        }
+        
         if self._pool is None:
             return {
                 "initialized": False,
@@ -182,6 +455,8 @@ class DatabasePool:
                 "max_size": 0,
                 "free": 0,
                 "in_use": 0,
+                "subsystems": subsystems,
+                "statement_cache": statement_cache,
             }
         
         return {
@@ -191,6 +466,8 @@ class DatabasePool:
             "max_size": self._pool.get_max_size(),
             "free": self._pool.get_idle_size(),
             "in_use": self._pool.get_size() - self._pool.get_idle_size(),
+            "subsystems": subsystems,
+            "statement_cache": statement_cache,
         }
     
     async def health_check(self) -> bool:
@@ -254,6 +531,9 @@ async def fetch_value(query: str, *args):
 
 __all__ = [
     "DatabasePool",
+    "ScopedPool",
+    "StatementCacheConnection",
+    "ThreadsafeConnection",
     "db_pool",
     "get_connection",
     "execute_query",
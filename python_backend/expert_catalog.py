@@ -0,0 +1,182 @@
+"""
+In-process expert catalog (seed clones + custom experts from PostgreSQL).
+
+Listing experts used to rebuild every seed Expert - including multi-KB system
+prompts - and re-query PostgreSQL on each call. The catalog builds a snapshot
+once, serves list/lookup views without system prompts, and is rebuilt lazily
+after invalidate() (custom expert created, avatar changed, clones reloaded).
+Every rebuild bumps `version`, so in-process caches can key on it. `version`
+is a per-process counter; caches shared between workers (Redis) key on the
+snapshot's `fingerprint`, a hash of the catalog contents, instead.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional
+
+from cache import hash_data
+from clones import CloneRegistry, ExpertCloneBase
+from logger import logger
+from models import CategoryType, Expert, ExpertType
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Public Expert view plus where to get its system prompt on demand"""
+    expert: Expert                          # systemPrompt="" (list/lookup view)
+    clone: Optional[ExpertCloneBase] = None  # Seed clone (prompt rendered on demand)
+    system_prompt: str = ""                  # Custom expert prompt (from PostgreSQL)
+
+    def with_system_prompt(self) -> Expert:
+        """Copy of the expert including the full system prompt (backend use)"""
+        prompt = self.clone.get_system_prompt() if self.clone else self.system_prompt
+        return self.expert.model_copy(update={"systemPrompt": prompt})
+
+
+@dataclass
+class CatalogSnapshot:
+    version: int
+    entries: List[CatalogEntry] = field(default_factory=list)
+    by_id: Dict[str, CatalogEntry] = field(default_factory=dict)
+    by_name: Dict[str, CatalogEntry] = field(default_factory=dict)  # lowercase name
+    fingerprint: str = ""  # Hash of the (id, avatar) pairs - same catalog, same value in every worker
+
+
+class ExpertCatalog:
+    """
+    Versioned expert catalog with O(1) lookup by id and by name.
+
+    Returned Expert objects are shared between requests - treat them as
+    read-only (use with_system_prompt()/model_copy() to derive variants).
+    """
+
+    def __init__(self, storage, category_map: Mapping[str, CategoryType]):
+        self.storage = storage
+        self.category_map = category_map
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int:
+        """Incremented on every invalidation"""
+        return self._version
+
+    def invalidate(self, reason: str = ""):
+        """Drop the snapshot; the next read rebuilds it"""
+        self._version += 1
+        self._snapshot = None
+        logger.info("Expert catalog invalidated", version=self._version, reason=reason)
+
+    async def _get_snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+
+        async with self._lock:
+            # Another request may have rebuilt it while we waited
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == self._version:
+                return snapshot
+
+            version = self._version
+            snapshot = await self._build(version)
+            # Only publish if no invalidation happened during the build
+            if version == self._version:
+                self._snapshot = snapshot
+            return snapshot
+
+    async def _build(self, version: int) -> CatalogSnapshot:
+        snapshot = CatalogSnapshot(version=version)
+
+        def add(entry: CatalogEntry):
+            snapshot.entries.append(entry)
+            snapshot.by_id[entry.expert.id] = entry
+            snapshot.by_name.setdefault(entry.expert.name.lower(), entry)
+
+        registry = CloneRegistry()
+        
+        # Seed experts from CloneRegistry (HIGH_FIDELITY)
+        for clone_name, clone_instance in registry.get_all_clones().items():
+            add(CatalogEntry(
+                expert=Expert(
+                    id=registry.expert_id_for(clone_name),
+                    name=clone_instance.name,
+                    title=clone_instance.title,
+                    expertise=clone_instance.expertise,
+                    bio=clone_instance.bio,
+                    avatar=getattr(clone_instance, 'avatar', None),
+                    systemPrompt="",
+                    expertType=ExpertType.HIGH_FIDELITY,
+                    category=self.category_map.get(clone_instance.name, CategoryType.MARKETING),
+                    createdAt=getattr(clone_instance, 'created_at', None) or datetime.now()
+                ),
+                clone=clone_instance
+            ))
+
+        # Custom experts from PostgreSQL (CUSTOM) - SEED takes precedence on name clashes
+        custom_experts = await self.storage.get_experts()
+        duplicates = 0
+        for expert in custom_experts:
+            # Let the registry resolve DB ids to a custom clone of the same name
+            registry.register_alias(expert.id, expert.name)
+            if expert.name.lower() in snapshot.by_name:
+                duplicates += 1
+                continue
+            add(CatalogEntry(
+                expert=expert.model_copy(update={"systemPrompt": ""}),
+                system_prompt=expert.systemPrompt or ""
+            ))
+
+        snapshot.fingerprint = hash_data(sorted(
+            (entry.expert.id, entry.expert.avatar or "") for entry in snapshot.entries
+        ))
+
+        logger.info(
+            "Expert catalog built",
+            version=version,
+            fingerprint=snapshot.fingerprint,
+            experts=len(snapshot.entries),
+            custom=len(custom_experts) - duplicates,
+            duplicates_skipped=duplicates,
+        )
+        return snapshot
+
+    async def snapshot(self) -> CatalogSnapshot:
+        """Current snapshot (entries + the version they were built for)"""
+        return await self._get_snapshot()
+
+    async def get_all(self, include_system_prompt: bool = False) -> List[Expert]:
+        """All experts (seed first), optionally with full system prompts"""
+        snapshot = await self._get_snapshot()
+        if include_system_prompt:
+            return [entry.with_system_prompt() for entry in snapshot.entries]
+        return [entry.expert for entry in snapshot.entries]
+
+    async def get_entry(self, expert_id: str) -> Optional[CatalogEntry]:
+        snapshot = await self._get_snapshot()
+        entry = snapshot.by_id.get(expert_id)
+        if entry is None:
+            # Non-canonical ids (e.g. different casing) via the registry index
+            name = CloneRegistry().name_for(expert_id)
+            if name:
+                entry = snapshot.by_name.get(name.lower())
+        return entry
+
+    async def get_by_id(self, expert_id: str, include_system_prompt: bool = False) -> Optional[Expert]:
+        entry = await self.get_entry(expert_id)
+        if entry is None:
+            return None
+        return entry.with_system_prompt() if include_system_prompt else entry.expert
+
+    async def get_by_name(self, name: str, include_system_prompt: bool = False) -> Optional[Expert]:
+        entry = (await self._get_snapshot()).by_name.get(name.lower())
+        if entry is None:
+            return None
+        return entry.with_system_prompt() if include_system_prompt else entry.expert
+
+
+__all__ = [
+    "CatalogEntry",
+    "ExpertCatalog",
+]
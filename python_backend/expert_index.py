@@ -0,0 +1,170 @@
+"""
+Local BM25 index over expert profiles for zero-LLM pre-ranking.
+
+/api/recommend-experts used to send every expert profile to Claude, and the
+profile-based ExpertRecommendationEngine only knows the experts in its
+hard-coded keyword map. This index is built in-process (CPU only, no model
+download) from each expert's expertise, title, bio and - for clones - story
+banks and trigger keywords, and ranks the catalog for a query in a few
+milliseconds. It is rebuilt when the expert catalog version changes.
+"""
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from expert_catalog import CatalogEntry, ExpertCatalog
+from logger import logger
+from models import Expert
+from recommendation_cache import tokenize
+
+# BM25 parameters (standard defaults)
+K1 = 1.2
+B = 0.75
+
+# Term repetitions per field (BM25F-style weighting by repetition)
+FIELD_WEIGHTS = {
+    "expertise": 3,
+    "title": 2,
+    "triggers": 2,
+    "bio": 1,
+    "stories": 1,
+}
+
+STORY_FIELDS = ("title", "context", "challenge", "lesson", "keywords")
+
+
+def analyze(text: str) -> List[str]:
+    """tokenize() plus light plural folding ("vendas" ~ "venda", "brands" ~ "brand")"""
+    return [token[:-1] if len(token) > 4 and token.endswith("s") else token for token in tokenize(text)]
+
+
+def _entry_fields(entry: CatalogEntry) -> Dict[str, str]:
+    expert = entry.expert
+    fields = {
+        "expertise": " ".join(expert.expertise),
+        "title": expert.title,
+        "bio": expert.bio,
+    }
+    clone = entry.clone
+    if clone is not None:
+        fields["stories"] = " ".join(
+            str(story.get(key, ""))
+            for story in clone.story_banks.values()
+            for key in STORY_FIELDS
+        )
+        fields["triggers"] = " ".join(clone.positive_triggers + clone.negative_triggers)
+    return fields
+
+
+@dataclass
+class SearchHit:
+    expert: Expert
+    score: float
+    matched_expertise: List[str] = field(default_factory=list)  # Expertise items sharing query terms
+
+
+class ExpertIndex:
+    """BM25 index over one catalog snapshot (see ExpertIndexCache for rebuilds)"""
+
+    def __init__(self, entries: List[CatalogEntry], version: int = 0):
+        self.version = version
+        self.experts: List[Expert] = [entry.expert for entry in entries]
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._lengths: List[int] = []
+
+        for doc_id, entry in enumerate(entries):
+            terms: Counter = Counter()
+            for name, text in _entry_fields(entry).items():
+                for token in analyze(text):
+                    terms[token] += FIELD_WEIGHTS[name]
+            for term, frequency in terms.items():
+                self._postings[term].append((doc_id, frequency))
+            self._lengths.append(sum(terms.values()))
+
+        documents = len(self.experts)
+        self._average_length = (sum(self._lengths) / documents) if documents else 0.0
+        self._idf = {
+            term: math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def scores(self, query: str) -> List[float]:
+        """BM25 score of every expert (catalog order) for `query`"""
+        scores = [0.0] * len(self.experts)
+        for term in set(analyze(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, frequency in self._postings[term]:
+                length_norm = 1 - B + B * self._lengths[doc_id] / (self._average_length or 1.0)
+                scores[doc_id] += idf * frequency * (K1 + 1) / (frequency + K1 * length_norm)
+        return scores
+
+    def search(self, query: str, k: int) -> List[SearchHit]:
+        """Top-k experts with a positive score, best first"""
+        query_terms = set(analyze(query))
+        scores = self.scores(query)
+        ranked = sorted(
+            (doc_id for doc_id, score in enumerate(scores) if score > 0),
+            key=lambda doc_id: -scores[doc_id]
+        )
+        hits = []
+        for doc_id in ranked[:k]:
+            expert = self.experts[doc_id]
+            matched = [item for item in expert.expertise if query_terms.intersection(analyze(item))]
+            hits.append(SearchHit(expert=expert, score=scores[doc_id], matched_expertise=matched))
+        return hits
+
+    def relevance(self, query: str) -> Dict[str, float]:
+        """Score per expert id, scaled so the best match is 1.0 (all 0.0 if nothing matches)"""
+        scores = self.scores(query)
+        top = max(scores, default=0.0)
+        return {
+            expert.id: (score / top if top > 0 else 0.0)
+            for expert, score in zip(self.experts, scores)
+        }
+
+
+class ExpertIndexCache:
+    """Holds the index for the current catalog version, rebuilding it lazily"""
+
+    def __init__(self):
+        self._index: Optional[ExpertIndex] = None
+        self._lock = threading.Lock()
+
+    async def get(self, catalog: ExpertCatalog) -> ExpertIndex:
+        snapshot = await catalog.snapshot()
+        index = self._index
+        if index is not None and index.version == snapshot.version:
+            return index
+
+        with self._lock:
+            index = self._index
+            if index is None or index.version != snapshot.version:
+                start = time.perf_counter()
+                index = ExpertIndex(snapshot.entries, snapshot.version)
+                self._index = index
+                logger.info(
+                    "Expert index built",
+                    version=snapshot.version,
+                    experts=len(index.experts),
+                    terms=len(index._idf),
+                    duration_ms=round((time.perf_counter() - start) * 1000, 1),
+                )
+        return index
+
+
+# Global instance
+expert_index = ExpertIndexCache()
+
+
+__all__ = [
+    "ExpertIndex",
+    "ExpertIndexCache",
+    "SearchHit",
+    "expert_index",
+    "analyze",
+]
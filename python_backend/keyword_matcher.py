@@ -0,0 +1,115 @@
+"""
+Multi-keyword substring matching (Aho–Corasick).
+
+Code that checks `keyword in text` for many keywords scans the text once per
+keyword. KeywordMatcher compiles all keywords into one automaton and finds
+every keyword occurring in a text - including overlapping ones, with the same
+substring semantics as `in` - in a single pass over the text.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton over a fixed set of keywords.
+
+    Matching is case-sensitive; callers lowercase keywords and text the same
+    way they would for `in`. Keywords are identified by their index in the
+    order given (duplicates share the first index).
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # Trie as parallel lists: goto transitions, failure links, outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for keyword in keywords:
+            if keyword in self._ids:
+                continue
+            keyword_id = len(self.keywords)
+            self._ids[keyword] = keyword_id
+            self.keywords.append(keyword)
+            if keyword:
+                self._insert(keyword, keyword_id)
+        self._build_failure_links()
+
+    def _insert(self, keyword: str, keyword_id: int) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword_id)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Keywords ending at the failure state also end here
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+        
+        # Fold failure links into the transitions (except back to the root's
+        # own edges), so scanning needs no failure-chain loop per character
+        self._delta: List[Dict[str, int]] = [{} for _ in self._goto]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            inherited = self._delta[self._fail[state]] if self._fail[state] else {}
+            self._delta[state] = {**inherited, **self._goto[state]}
+            queue.extend(self._goto[state].values())
+
+    def id_of(self, keyword: str) -> int:
+        return self._ids[keyword]
+
+    def find_ids(self, text: str) -> Set[int]:
+        """Ids of all keywords occurring in `text` (empty keywords always match, like `"" in text`)"""
+        found: Set[int] = set()
+        empty_id = self._ids.get("")
+        if empty_id is not None:
+            found.add(empty_id)
+        delta, root, output = self._delta, self._goto[0], self._output
+        state = 0
+        for char in text:
+            state = delta[state].get(char)
+            if state is None:
+                state = root.get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def find(self, text: str) -> Set[str]:
+        """All keywords occurring in `text`"""
+        return {self.keywords[keyword_id] for keyword_id in self.find_ids(text)}
+
+    def mask(self, text: str) -> int:
+        """Bitmask of the keywords occurring in `text` (bit i = keyword id i)"""
+        bits = 0
+        for keyword_id in self.find_ids(text):
+            bits |= 1 << keyword_id
+        return bits
+
+    def mask_of(self, keywords: Iterable[str]) -> int:
+        """Bitmask of the given (compiled) keywords"""
+        bits = 0
+        for keyword in keywords:
+            bits |= 1 << self._ids[keyword]
+        return bits
+
+
+__all__ = ["KeywordMatcher"]
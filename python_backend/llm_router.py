@@ -17,6 +17,7 @@ class LLMTask(Enum):
     COUNCIL_DIALOGUE = "council_dialogue"    # Complex: multi-expert roundtable discussion
     AUTO_CLONE = "auto_clone"                # Complex: create cognitive clone with research
     SYNTHESIS = "synthesis"                  # Medium: synthesize multiple expert contributions
+    SUMMARIZE_HISTORY = "summarize_history"  # Simple: fold old chat turns into a rolling summary
 
 
 class LLMTier(Enum):
@@ -34,6 +35,7 @@ TASK_ROUTING: Dict[LLMTask, LLMTier] = {
     LLMTask.COUNCIL_DIALOGUE: LLMTier.STANDARD,   # Complex multi-expert dialogue
     LLMTask.AUTO_CLONE: LLMTier.STANDARD,         # Complex cognitive cloning
     LLMTask.SYNTHESIS: LLMTier.STANDARD,          # Important consensus synthesis
+    LLMTask.SUMMARIZE_HISTORY: LLMTier.FAST,      # Background compression of old turns
 }
 
 
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, File, UploadFile, Query, Body, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, File, UploadFile, Query, Body, BackgroundTasks, Depends, Response, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from typing import List, Optional
@@ -9,6 +9,7 @@ from pathlib import Path
 from PIL import Image
 import io
 import json
+import time
 import asyncio
 import asyncpg
 import httpx
@@ -18,7 +19,7 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
 
 # Validate environment variables before proceeding
-from env_validator import validate_env, EnvValidationError
+from env_validator import validate_env, EnvValidationError, get_config_bool, get_config_int
 try:
     validate_env()
 except EnvValidationError as e:
@@ -50,10 +51,16 @@ from models import (
 )
 import uuid
 from datetime import datetime
-from storage import storage
+from storage import storage, user_persona_from_row, PERSONA_CONTEXT_COLUMNS
 from crew_agent import LegendAgentFactory
+from chat_history import ChatHistoryLoader
 from seed import seed_legends
-from crew_council import council_orchestrator
+from crew_council import council_orchestrator, CouncilRunOptions
+from expert_catalog import ExpertCatalog
+from persona_context import persona_context_cache
+from recommendation_cache import recommendation_cache
+from expert_index import expert_index, SearchHit
+from stream_cancellation import cancel_on_disconnect, cancellation_stats, tracked_llm_call
 from llm_router import llm_router, LLMTask
 from analytics import AnalyticsEngine
 from seed_analytics import seed_analytics_data, clear_analytics_data
@@ -104,11 +111,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Initialize Analytics Engine
 analytics_engine = AnalyticsEngine(storage)
 
+# Windowed chat history (recent messages + rolling summary) for send_message
+chat_history_loader = ChatHistoryLoader(storage)
+
 # Initialize with seeded legends
 @app.on_event("startup")
 async def startup_event():
@@ -132,6 +143,19 @@ async def startup_event():
     # Seeding disabled to prevent duplicates
     # await seed_legends(storage)
     print("[Startup] Seed experts loaded from CloneRegistry. PostgreSQL ready for custom experts.")
+    
+    # Warm the expert catalog (imports clones lazily) in the background so
+    # startup - and /api/health - does not wait for it
+    async def warm_expert_catalog():
+        try:
+            # Import the clone modules off the event loop; the catalog build
+            # then finds them already loaded in the registry
+            await asyncio.to_thread(CloneRegistry().get_all_clones)
+            await expert_catalog.get_all()
+        except Exception as e:
+            logger.warning("Expert catalog warm-up failed (built on first request)", error=str(e))
+    
+    app.state.catalog_warmup = asyncio.create_task(warm_expert_catalog())
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -173,6 +197,9 @@ async def health_check():
                 "status": "healthy",
                 "database": "connected",
                 "pool": pool_stats,
+                "stream_cancellations": cancellation_stats.snapshot(),
+                "cache": cache_manager.stats(),
+                "recommendation_cache": recommendation_cache.stats(),
                 "timestamp": datetime.now().isoformat(),
             }
         else:
@@ -180,6 +207,9 @@ async def health_check():
                 "status": "unhealthy",
                 "database": "disconnected",
                 "pool": pool_stats,
+                "stream_cancellations": cancellation_stats.snapshot(),
+                "cache": cache_manager.stats(),
+                "recommendation_cache": recommendation_cache.stats(),
                 "timestamp": datetime.now().isoformat(),
             }
     except Exception as e:
@@ -515,50 +545,47 @@ async def change_password(data: ChangePasswordRequest):
         raise HTTPException(status_code=400, detail="Nova senha deve ter pelo menos 6 caracteres")
     
     # Get database connection
-    conn = await asyncpg.connect(os.environ.get("DATABASE_URL"), statement_cache_size=0)
-    
     try:
-        # Get user from database
-        user = await conn.fetchrow(
-            'SELECT id, password FROM users WHERE id = $1',
-            data.user_id
-        )
+        async with db_pool.acquire("storage") as conn:
+            # Get user from database
+            user = await conn.fetchrow(
+                'SELECT id, password FROM users WHERE id = $1',
+                data.user_id
+            )
         
-        if not user:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado")
+            if not user:
+                raise HTTPException(status_code=404, detail="Usuário não encontrado")
         
-        # Verify current password
-        if not bcrypt.checkpw(data.currentPassword.encode('utf-8'), user['password'].encode('utf-8')):
-            raise HTTPException(status_code=400, detail="Senha atual incorreta")
+            # Verify current password
+            if not bcrypt.checkpw(data.currentPassword.encode('utf-8'), user['password'].encode('utf-8')):
+                raise HTTPException(status_code=400, detail="Senha atual incorreta")
         
-        # Hash new password
-        new_password_hash = bcrypt.hashpw(data.newPassword.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            # Hash new password
+            new_password_hash = bcrypt.hashpw(data.newPassword.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
         
-        # Update password
-        await conn.execute(
-            'UPDATE users SET password = $1 WHERE id = $2',
-            new_password_hash, data.user_id
-        )
+            # Update password
+            await conn.execute(
+                'UPDATE users SET password = $1 WHERE id = $2',
+                new_password_hash, data.user_id
+            )
         
-        logger.info(f"[AUTH] Password changed for user {data.user_id}")
+            logger.info(f"[AUTH] Password changed for user {data.user_id}")
         
-        # Log password change
-        await log_audit(
-            action="password_change",
-            user_id=data.user_id,
-            success=True,
-            conn=conn
-        )
+            # Log password change
+            await log_audit(
+                action="password_change",
+                user_id=data.user_id,
+                success=True,
+                conn=conn
+            )
         
-        return {"success": True, "message": "Senha atualizada com sucesso"}
+            return {"success": True, "message": "Senha atualizada com sucesso"}
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"[AUTH] Error changing password: {e}")
         raise HTTPException(status_code=500, detail="Erro ao atualizar senha")
-    finally:
-        await conn.close()
 
 
 # ============================================
@@ -567,59 +594,54 @@ async def change_password(data: ChangePasswordRequest):
 
 async def require_superadmin(user_id: str = Query(...)):
     """Dependency to verify superadmin role"""
-    conn = await asyncpg.connect(os.environ.get("DATABASE_URL"), statement_cache_size=0)
-    try:
+    async with db_pool.acquire("admin") as conn:
         user = await conn.fetchrow("SELECT role FROM users WHERE id = $1", user_id)
         if not user or user['role'] != 'superadmin':
             raise HTTPException(status_code=403, detail="Acesso negado: apenas superadmins")
         return user_id
-    finally:
-        await conn.close()
 
 @app.get("/api/superadmin/metrics")
 async def get_global_metrics(user_id: str = Depends(require_superadmin)):
     """Get global system metrics"""
-    conn = await asyncpg.connect(os.environ.get("DATABASE_URL"), statement_cache_size=0)
     try:
-        total_users = await conn.fetchval("SELECT COUNT(*) FROM users") or 0
-        total_admins = await conn.fetchval("SELECT COUNT(*) FROM users WHERE role IN ('admin', 'superadmin')") or 0
-        total_superadmins = await conn.fetchval("SELECT COUNT(*) FROM users WHERE role = 'superadmin'") or 0
-        total_personas = await conn.fetchval("SELECT COUNT(*) FROM user_personas") or 0
-        total_experts = await conn.fetchval("SELECT COUNT(*) FROM experts WHERE expert_type = 'custom'") or 0
-        total_conversations = await conn.fetchval("SELECT COUNT(*) FROM conversations") or 0
-        total_councils = await conn.fetchval("SELECT COUNT(*) FROM council_analyses") or 0
-        total_council_messages = await conn.fetchval("SELECT COUNT(*) FROM council_messages") or 0
-        
-        # Calculate system health (simple metric)
-        system_health = 95
-        
-        # Average enrichment level
-        avg_enrichment_row = await conn.fetchrow("""
-            SELECT enrichment_level, COUNT(*) as count
-            FROM user_personas
-            GROUP BY enrichment_level
-            ORDER BY count DESC
-            LIMIT 1
-        """)
-        avg_enrichment = avg_enrichment_row['enrichment_level'] if avg_enrichment_row else "quick"
+        async with db_pool.acquire("admin") as conn:
+            total_users = await conn.fetchval("SELECT COUNT(*) FROM users") or 0
+            total_admins = await conn.fetchval("SELECT COUNT(*) FROM users WHERE role IN ('admin', 'superadmin')") or 0
+            total_superadmins = await conn.fetchval("SELECT COUNT(*) FROM users WHERE role = 'superadmin'") or 0
+            total_personas = await conn.fetchval("SELECT COUNT(*) FROM user_personas") or 0
+            total_experts = await conn.fetchval("SELECT COUNT(*) FROM experts WHERE expert_type = 'custom'") or 0
+            total_conversations = await conn.fetchval("SELECT COUNT(*) FROM conversations") or 0
+            total_councils = await conn.fetchval("SELECT COUNT(*) FROM council_analyses") or 0
+            total_council_messages = await conn.fetchval("SELECT COUNT(*) FROM council_messages") or 0
+        
+            # Calculate system health (simple metric)
+            system_health = 95
+        
+            # Average enrichment level
+            avg_enrichment_row = await conn.fetchrow("""
+                SELECT enrichment_level, COUNT(*) as count
+                FROM user_personas
+                GROUP BY enrichment_level
+                ORDER BY count DESC
+                LIMIT 1
+            """)
+            avg_enrichment = avg_enrichment_row['enrichment_level'] if avg_enrichment_row else "quick"
         
-        return {
-            "totalUsers": total_users,
-            "totalAdmins": total_admins,
-            "totalSuperAdmins": total_superadmins,
-            "totalPersonas": total_personas,
-            "totalExperts": total_experts,
-            "totalConversations": total_conversations,
-            "totalCouncilAnalyses": total_councils,
-            "totalCouncilMessages": total_council_messages,
-            "systemHealthScore": system_health,
-            "avgEnrichmentLevel": avg_enrichment
-        }
+            return {
+                "totalUsers": total_users,
+                "totalAdmins": total_admins,
+                "totalSuperAdmins": total_superadmins,
+                "totalPersonas": total_personas,
+                "totalExperts": total_experts,
+                "totalConversations": total_conversations,
+                "totalCouncilAnalyses": total_councils,
+                "totalCouncilMessages": total_council_messages,
+                "systemHealthScore": system_health,
+                "avgEnrichmentLevel": avg_enrichment
+            }
     except Exception as e:
         logger.error(f"[SUPERADMIN] Error fetching metrics: {e}")
         raise HTTPException(status_code=500, detail="Erro ao buscar métricas")
-    finally:
-        await conn.close()
 
 @app.get("/api/superadmin/personas")
 async def get_all_personas(
@@ -628,25 +650,23 @@ async def get_all_personas(
     offset: int = Query(0)
 ):
     """Get all personas in the system (paginated)"""
-    conn = await asyncpg.connect(os.environ.get("DATABASE_URL"), statement_cache_size=0)
     try:
-        rows = await conn.fetch("""
-            SELECT 
-                up.id, up.user_id, up.company_name, up.industry,
-                up.enrichment_level, up.created_at,
-                u.username, u.email
-            FROM user_personas up
-            LEFT JOIN users u ON up.user_id = u.id
-            ORDER BY up.created_at DESC
-            LIMIT $1 OFFSET $2
-        """, limit, offset)
-        
-        return [dict(row) for row in rows]
+        async with db_pool.acquire("admin") as conn:
+            rows = await conn.fetch("""
+                SELECT 
+                    up.id, up.user_id, up.company_name, up.industry,
+                    up.enrichment_level, up.created_at,
+                    u.username, u.email
+                FROM user_personas up
+                LEFT JOIN users u ON up.user_id = u.id
+                ORDER BY up.created_at DESC
+                LIMIT $1 OFFSET $2
+            """, limit, offset)
+        
+            return [dict(row) for row in rows]
     except Exception as e:
         logger.error(f"[SUPERADMIN] Error fetching personas: {e}")
         raise HTTPException(status_code=500, detail="Erro ao buscar personas")
-    finally:
-        await conn.close()
 
 @app.delete("/api/superadmin/personas/{persona_id}")
 async def delete_persona_admin(
@@ -654,21 +674,19 @@ async def delete_persona_admin(
     user_id: str = Depends(require_superadmin)
 ):
     """Delete any persona (soft delete)"""
-    conn = await asyncpg.connect(os.environ.get("DATABASE_URL"), statement_cache_size=0)
     try:
-        await conn.execute("""
-            UPDATE user_personas
-            SET deleted_at = NOW()
-            WHERE id = $1
-        """, persona_id)
-        
-        logger.info(f"[SUPERADMIN] Persona {persona_id} soft deleted by {user_id}")
-        return {"success": True}
+        async with db_pool.acquire("admin") as conn:
+            await conn.execute("""
+                UPDATE user_personas
+                SET deleted_at = NOW()
+                WHERE id = $1
+            """, persona_id)
+        
+            logger.info(f"[SUPERADMIN] Persona {persona_id} soft deleted by {user_id}")
+            return {"success": True}
     except Exception as e:
         logger.error(f"[SUPERADMIN] Error deleting persona: {e}")
         raise HTTPException(status_code=500, detail="Erro ao deletar persona")
-    finally:
-        await conn.close()
 
 @app.get("/api/superadmin/analytics/top-experts")
 async def get_global_top_experts(
@@ -676,26 +694,24 @@ async def get_global_top_experts(
     limit: int = Query(20)
 ):
     """Get most consulted experts across ALL users"""
-    conn = await asyncpg.connect(os.environ.get("DATABASE_URL"), statement_cache_size=0)
     try:
-        rows = await conn.fetch("""
-            SELECT 
-                ua.metadata->>'expertName' as expert_name,
-                COUNT(*) as consultations,
-                MAX(ua.created_at) as last_consulted
-            FROM user_activity ua
-            WHERE ua.metadata->>'expertName' IS NOT NULL
-            GROUP BY ua.metadata->>'expertName'
-            ORDER BY consultations DESC
-            LIMIT $1
-        """, limit)
-        
-        return [dict(row) for row in rows]
+        async with db_pool.acquire("admin") as conn:
+            rows = await conn.fetch("""
+                SELECT 
+                    ua.metadata->>'expertName' as expert_name,
+                    COUNT(*) as consultations,
+                    MAX(ua.created_at) as last_consulted
+                FROM user_activity ua
+                WHERE ua.metadata->>'expertName' IS NOT NULL
+                GROUP BY ua.metadata->>'expertName'
+                ORDER BY consultations DESC
+                LIMIT $1
+            """, limit)
+        
+            return [dict(row) for row in rows]
     except Exception as e:
         logger.error(f"[SUPERADMIN] Error fetching top experts: {e}")
         raise HTTPException(status_code=500, detail="Erro ao buscar experts")
-    finally:
-        await conn.close()
 
 @app.get("/api/superadmin/export/user/{userId}")
 async def export_user_data(
@@ -703,37 +719,35 @@ async def export_user_data(
     admin_user_id: str = Depends(require_superadmin)
 ):
     """Export all data for a specific user (GDPR compliance)"""
-    conn = await asyncpg.connect(os.environ.get("DATABASE_URL"), statement_cache_size=0)
     try:
-        # Get user
-        user = await conn.fetchrow("SELECT * FROM users WHERE id = $1", userId)
-        
-        # Get personas
-        personas = await conn.fetch("SELECT * FROM user_personas WHERE user_id = $1", userId)
-        
-        # Get conversations
-        conversations = await conn.fetch("SELECT * FROM conversations WHERE user_id = $1", userId)
-        
-        # Get council analyses
-        councils = await conn.fetch("SELECT * FROM council_analyses WHERE user_id = $1", userId)
-        
-        export_data = {
-            "user": dict(user) if user else None,
-            "personas": [dict(p) for p in personas],
-            "conversations": [dict(c) for c in conversations],
-            "councilAnalyses": [dict(ca) for ca in councils],
-            "exportedAt": datetime.utcnow().isoformat(),
-            "exportedBy": admin_user_id
-        }
+        async with db_pool.acquire("admin") as conn:
+            # Get user
+            user = await conn.fetchrow("SELECT * FROM users WHERE id = $1", userId)
+        
+            # Get personas
+            personas = await conn.fetch("SELECT * FROM user_personas WHERE user_id = $1", userId)
+        
+            # Get conversations
+            conversations = await conn.fetch("SELECT * FROM conversations WHERE user_id = $1", userId)
+        
+            # Get council analyses
+            councils = await conn.fetch("SELECT * FROM council_analyses WHERE user_id = $1", userId)
+        
+            export_data = {
+                "user": dict(user) if user else None,
+                "personas": [dict(p) for p in personas],
+                "conversations": [dict(c) for c in conversations],
+                "councilAnalyses": [dict(ca) for ca in councils],
+                "exportedAt": datetime.utcnow().isoformat(),
+                "exportedBy": admin_user_id
+            }
         
-        logger.info(f"[SUPERADMIN] Data export for user {userId} by {admin_user_id}")
+            logger.info(f"[SUPERADMIN] Data export for user {userId} by {admin_user_id}")
         
-        return export_data
+            return export_data
     except Exception as e:
         logger.error(f"[SUPERADMIN] Error exporting user data: {e}")
         raise HTTPException(status_code=500, detail="Erro ao exportar dados")
-    finally:
-        await conn.close()
 
 @app.post("/api/superadmin/invites/add")
 async def add_invites_to_user(
@@ -747,22 +761,20 @@ async def add_invites_to_user(
     if not target_user_id or amount <= 0:
         raise HTTPException(status_code=400, detail="userId e amount são obrigatórios")
     
-    conn = await asyncpg.connect(os.environ.get("DATABASE_URL"), statement_cache_size=0)
     try:
-        await conn.execute("""
-            UPDATE users
-            SET available_invites = available_invites + $1
-            WHERE id = $2
-        """, amount, target_user_id)
+        async with db_pool.acquire("admin") as conn:
+            await conn.execute("""
+                UPDATE users
+                SET available_invites = available_invites + $1
+                WHERE id = $2
+            """, amount, target_user_id)
         
-        logger.info(f"[SUPERADMIN] Added {amount} invites to user {target_user_id}")
+            logger.info(f"[SUPERADMIN] Added {amount} invites to user {target_user_id}")
         
-        return {"success": True, "added": amount}
+            return {"success": True, "added": amount}
     except Exception as e:
         logger.error(f"[SUPERADMIN] Error adding invites: {e}")
         raise HTTPException(status_code=500, detail="Erro ao adicionar convites")
-    finally:
-        await conn.close()
 
 
 # ============================================
@@ -1017,6 +1029,9 @@ CATEGORY_METADATA = {
     }
 }
 
+# Versioned in-process expert catalog (seed + custom), rebuilt after invalidate()
+expert_catalog = ExpertCatalog(storage, EXPERT_CATEGORY_MAP)
+
 # Helper function to get a single expert by ID (seed or custom)
 async def get_expert_by_id(expert_id: str, include_system_prompt: bool = False) -> Optional[Expert]:
     """
@@ -1029,41 +1044,17 @@ async def get_expert_by_id(expert_id: str, include_system_prompt: bool = False)
     
     Returns None if expert not found.
     """
-    # Check if it's a seed expert (format: seed-expert-name)
-    if expert_id.startswith("seed-"):
-        # Extract expert name from ID (e.g., "seed-claude-hopkins" -> "Claude Hopkins")
-        expert_name_slug = expert_id.replace("seed-", "")
-        expert_name = " ".join(word.capitalize() for word in expert_name_slug.split("-"))
-        
-        # Get clone from CloneRegistry
-        clone_registry = CloneRegistry()
-        clone_instance = clone_registry.get_clone(expert_name)
-        
-        if clone_instance:
-            # Get category from mapping
-            category = EXPERT_CATEGORY_MAP.get(expert_name, CategoryType.MARKETING)
-            
-            # Get avatar path from clone instance (handles .png, .jpg, etc.)
-            avatar_path = getattr(clone_instance, 'avatar', None)
-            
-            # Get system prompt only if requested (for internal backend use)
-            system_prompt = clone_instance.get_system_prompt() if include_system_prompt else ""
-            
-            return Expert(
-                id=expert_id,
-                name=expert_name,
-                title=clone_instance.title,
-                bio=clone_instance.bio,
-                expertise=clone_instance.expertise,
-                systemPrompt=system_prompt,
-                avatar=avatar_path,
-                expertType=ExpertType.HIGH_FIDELITY,
-                category=category,
-            )
-        return None
+    # O(1) lookup in the expert catalog (seed + custom)
+    expert = await expert_catalog.get_by_id(expert_id, include_system_prompt=include_system_prompt)
+    if expert or expert_id.startswith("seed-"):
+        return expert
     
-    # Otherwise, try to get from PostgreSQL (custom expert)
+    # Not in the catalog snapshot (e.g. created by another worker) - try PostgreSQL
     expert = await storage.get_expert(expert_id)
+    if expert:
+        expert_catalog.invalidate(reason="custom expert missing from catalog")
+        if not include_system_prompt:
+            expert = expert.model_copy(update={"systemPrompt": ""})
     
     # If include_system_prompt is True but expert has no system_prompt, log warning
     if expert and include_system_prompt:
@@ -1073,61 +1064,16 @@ async def get_expert_by_id(expert_id: str, include_system_prompt: bool = False)
     return expert
 
 # Helper function to get all experts (seed + custom)
-async def get_all_experts_combined() -> List[Expert]:
-    """
-    Helper function to combine seed experts from CloneRegistry with custom experts from PostgreSQL.
-    Eliminates code duplication between /api/experts and /api/categories endpoints.
+async def get_all_experts_combined(include_system_prompt: bool = False) -> List[Expert]:
     """
-    # Get seed experts from CloneRegistry (HIGH_FIDELITY)
-    clone_registry = CloneRegistry()
-    all_clones = clone_registry.get_all_clones()
-    
-    # Convert CloneRegistry clones to Expert objects
-    seed_experts = []
-    for clone_name, clone_instance in all_clones.items():
-        # Generate unique ID for seed expert (stable across restarts)
-        expert_id = f"seed-{clone_name.lower().replace(' ', '-')}"
-        
-        # Get category from manual mapping or use marketing as default
-        expert_category = EXPERT_CATEGORY_MAP.get(clone_instance.name, CategoryType.MARKETING)
-        
-        # Get avatar path if exists
-        avatar_path = getattr(clone_instance, 'avatar', None)
-        
-        seed_expert = Expert(
-            id=expert_id,
-            name=clone_instance.name,
-            title=clone_instance.title,
-            expertise=clone_instance.expertise,
-            bio=clone_instance.bio,
-            avatar=avatar_path,
-            systemPrompt=clone_instance.get_system_prompt(),
-            expertType=ExpertType.HIGH_FIDELITY,
-            category=expert_category,
-            createdAt=clone_instance.created_at if hasattr(clone_instance, 'created_at') else datetime.now()
-        )
-        seed_experts.append(seed_expert)
+    Seed experts from CloneRegistry + custom experts from PostgreSQL, served
+    from the expert catalog (seed experts win name clashes).
     
-    # Get custom experts from PostgreSQL (CUSTOM)
-    custom_experts = await storage.get_experts()
-    
-    # Combine both sources, but remove duplicates by name
-    # Priority: SEED experts (HIGH_FIDELITY) take precedence over DB experts
-    seed_names = {expert.name.lower() for expert in seed_experts}
-    
-    # Filter out custom experts that duplicate seed experts
-    unique_custom_experts = [
-        expert for expert in custom_experts 
-        if expert.name.lower() not in seed_names
-    ]
-    
-    print(f"[DEDUP] SEED experts: {len(seed_experts)}, DB experts: {len(custom_experts)}, Unique DB: {len(unique_custom_experts)}")
-    if len(custom_experts) > len(unique_custom_experts):
-        removed = len(custom_experts) - len(unique_custom_experts)
-        print(f"[DEDUP] Removed {removed} duplicate(s) from DB (already in SEED)")
-    
-    # Return combined list without duplicates
-    return seed_experts + unique_custom_experts
+    Args:
+        include_system_prompt: If True, returns copies with full system prompts
+                               (council). If False, systemPrompt is empty (listing).
+    """
+    return await expert_catalog.get_all(include_system_prompt=include_system_prompt)
 
 # Expert endpoints
 @app.get("/api/experts", response_model=List[Expert])
@@ -1188,7 +1134,7 @@ async def get_categories():
     return categories
 
 @app.get("/api/experts/auto-clone-stream")
-async def auto_clone_expert_stream(targetName: str, context: str = ""):
+async def auto_clone_expert_stream(request: Request, targetName: str, context: str = ""):
     """
     Stream real-time progress during expert auto-clone process.
     Disney Effect #2: User sees every step happening live.
@@ -1240,7 +1186,7 @@ Inclua dados específicos, citações, livros publicados, e exemplos concretos."
                 "message": f"Consultando base de conhecimento sobre {targetName}..."
             })
 
-            async with httpx.AsyncClient(timeout=90.0) as client:
+            async with tracked_llm_call("auto_clone_research"), httpx.AsyncClient(timeout=90.0) as client:
                 perplexity_response = await client.post(
                     "https://api.perplexity.ai/chat/completions",
                     headers={
@@ -1439,15 +1385,16 @@ Retorne APENAS JSON válido."""
 
             anthropic_client = AsyncAnthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
             
-            synthesis_response = await anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=16000,
-                temperature=0.7,
-                messages=[{
-                    "role": "user",
-                    "content": synthesis_prompt
-                }]
-            )
+            async with tracked_llm_call("auto_clone_synthesis", max_tokens=16000):
+                synthesis_response = await anthropic_client.messages.create(
+                    model="claude-sonnet-4-20250514",
+                    max_tokens=16000,
+                    temperature=0.7,
+                    messages=[{
+                        "role": "user",
+                        "content": synthesis_prompt
+                    }]
+                )
             
             synthesis_text = ""
             for block in synthesis_response.content:
@@ -1683,15 +1630,16 @@ CATEGORIAS DISPONÍVEIS:
 
 Responda APENAS com o ID da categoria (ex: "growth"), nada mais."""
 
-                response = await anthropic_client.messages.create(
-                    model="claude-3-5-haiku-20241022",
-                    max_tokens=20,
-                    system="Você é um classificador expert. Responda apenas com o ID da categoria.",
-                    messages=[{
-                        "role": "user",
-                        "content": category_prompt
-                    }]
-                )
+                async with tracked_llm_call("auto_clone_category", max_tokens=20):
+                    response = await anthropic_client.messages.create(
+                        model="claude-3-5-haiku-20241022",
+                        max_tokens=20,
+                        system="Você é um classificador expert. Responda apenas com o ID da categoria.",
+                        messages=[{
+                            "role": "user",
+                            "content": category_prompt
+                        }]
+                    )
                 
                 inferred_category = "marketing"  # Default fallback
                 for block in response.content:
@@ -1753,7 +1701,7 @@ Responda APENAS com o ID da categoria (ex: "growth"), nada mais."""
             })
     
     return StreamingResponse(
-        event_generator(),
+        cancel_on_disconnect(request, event_generator(), "auto_clone"),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -1770,7 +1718,7 @@ async def get_expert_recommendations():
     Returns experts with relevance scores, star ratings, and justifications.
     """
     try:
-        from recommendation import recommendation_engine
+        from recommendation import recommendation_engine, profile_query
         
         # Get user's business profile
         user_id = "default_user"
@@ -1781,8 +1729,13 @@ async def get_expert_recommendations():
         if not experts:
             raise HTTPException(status_code=404, detail="No experts available")
         
+        # Local index relevance for experts the keyword map doesn't cover
+        relevance = None
+        if profile:
+            relevance = (await expert_index.get(expert_catalog)).relevance(profile_query(profile))
+        
         # Get recommendations
-        recommendations = recommendation_engine.get_recommendations(experts, profile)
+        recommendations = recommendation_engine.get_recommendations(experts, profile, relevance=relevance)
         
         # Format response
         return {
@@ -1813,6 +1766,7 @@ async def create_expert(data: ExpertCreate):
     try:
         print(f"[CREATE-EXPERT] Received expert: {data.name}, category: {data.category.value if hasattr(data.category, 'value') else data.category}")
         expert = await storage.create_expert(data)
+        expert_catalog.invalidate(reason="expert created")
         print(f"[CREATE-EXPERT] Saved expert with ID: {expert.id}, category: {expert.category.value}")
         
         # CRITICAL FIX: If this is a custom expert, save Python class file and reload registry
@@ -1889,11 +1843,11 @@ RETORNE APENAS O CÓDIGO PYTHON:"""
                 
                 print(f"[CREATE-EXPERT] ✅ Python class saved to {filepath}")
                 
-                # CRITICAL: Use singleton instance to reload registry
-                print(f"[CREATE-EXPERT] Reloading global CloneRegistry singleton...")
-                clone_registry = CloneRegistry()  # Gets existing singleton instance
-                clone_registry.reload_clones()    # Reloads all clones in the shared instance
-                print(f"[CREATE-EXPERT] ✅ CloneRegistry reloaded - expert now accessible globally!")
+                # CRITICAL: Use singleton instance - only the new/changed file is imported
+                print(f"[CREATE-EXPERT] Refreshing custom clones in global CloneRegistry...")
+                changes = await CloneRegistry().refresh_custom_clones_async()
+                expert_catalog.invalidate(reason="custom clones refreshed")
+                print(f"[CREATE-EXPERT] ✅ CloneRegistry refreshed {changes} - expert now accessible globally!")
                 
             except Exception as py_error:
                 print(f"[CREATE-EXPERT] Warning: Failed to save Python class: {str(py_error)}")
@@ -2461,7 +2415,7 @@ Framework EXTRACT de 20 Pontos - Fidelidade Cognitiva Ultra-Realista
 \"\"\"
 
 try:
-    from .base import ExpertCloneBase
+    from clones.base import ExpertCloneBase
 except ImportError:
     from base import ExpertCloneBase
 
@@ -2580,11 +2534,12 @@ RETORNE APENAS O CÓDIGO PYTHON:"""
         
         print(f"[AUTO-CLONE] ✅ Python class saved to {filepath}")
         
-        # CRITICAL FIX: Reload CloneRegistry to make expert immediately accessible
-        print(f"[AUTO-CLONE] Reloading CloneRegistry to load new expert...")
-        clone_registry = CloneRegistry()
-        clone_registry.reload_clones()
-        print(f"[AUTO-CLONE] ✅ CloneRegistry reloaded - expert now accessible!")
+        # CRITICAL FIX: Refresh CloneRegistry to make expert immediately accessible
+        # (imports only new/changed custom files, off the event loop)
+        print(f"[AUTO-CLONE] Refreshing custom clones in CloneRegistry...")
+        changes = await CloneRegistry().refresh_custom_clones_async()
+        expert_catalog.invalidate(reason="custom clones refreshed")
+        print(f"[AUTO-CLONE] ✅ CloneRegistry refreshed {changes} - expert now accessible!")
         
         # Create ExpertCreate object (NOT persisted yet)
         expert_data = ExpertCreate(
@@ -2744,6 +2699,26 @@ async def generate_sample_conversations(data: dict):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to generate samples: {str(e)}")
 
+def _index_recommendations(hits: List[SearchHit]) -> List[dict]:
+    """Recommendations straight from the local index (RECOMMEND_LLM_JUSTIFY=false)"""
+    top = hits[0].score
+    recommendations = []
+    for hit in hits:
+        # Stars relative to the best match; keep 3+ like the Claude prompt asks
+        stars = max(1, round(5 * hit.score / top))
+        if stars < 3:
+            continue
+        areas = hit.matched_expertise[:3] or hit.expert.expertise[:3]
+        recommendations.append({
+            "expertId": hit.expert.id,
+            "expertName": hit.expert.name,
+            "avatar": hit.expert.avatar,
+            "relevanceScore": stars,
+            "stars": stars,
+            "justification": f"{hit.expert.name} ({hit.expert.title}) é referência em: {', '.join(areas)}."
+        })
+    return recommendations
+
 @app.post("/api/recommend-experts", response_model=RecommendExpertsResponse)
 async def recommend_experts(request: RecommendExpertsRequest):
     """
@@ -2757,9 +2732,30 @@ async def recommend_experts(request: RecommendExpertsRequest):
         if not experts:
             raise HTTPException(status_code=404, detail="No experts available")
         
+        # Same (or near-identical) problem against the same catalog -> reuse
+        catalog_fingerprint = (await expert_catalog.snapshot()).fingerprint
+        cached, tier = await recommendation_cache.get(request.problem, catalog_fingerprint)
+        if cached is not None:
+            print(f"[RECOMMEND] Cache hit ({tier})")
+            return RecommendExpertsResponse(**cached)
+        
+        # Local BM25 pre-ranking: only the shortlist goes to Claude
+        # (whole catalog when nothing in the problem matches the index)
+        candidates = experts
+        shortlist_size = get_config_int("RECOMMEND_SHORTLIST_SIZE", 8)
+        if shortlist_size > 0:
+            hits = (await expert_index.get(expert_catalog)).search(request.problem, shortlist_size)
+            if hits and not get_config_bool("RECOMMEND_LLM_JUSTIFY", True):
+                response = RecommendExpertsResponse(recommendations=_index_recommendations(hits))
+                await recommendation_cache.put(request.problem, catalog_fingerprint, response.model_dump(mode="json"))
+                return response
+            if hits:
+                candidates = [hit.expert for hit in hits]
+                print(f"[RECOMMEND] Shortlist: {[expert.name for expert in candidates]}")
+        
         # Build expert profiles for Claude analysis
         expert_profiles = []
-        for expert in experts:
+        for expert in candidates:
             expert_profiles.append({
                 "id": expert.id,
                 "name": expert.name,
@@ -2799,12 +2795,17 @@ INSTRUÇÕES:
 
 IMPORTANTE: Retorne APENAS o JSON, sem texto adicional antes ou depois."""
 
-        # Use LLM Router to optimize costs (Haiku for simple recommendations)
-        response_text = await llm_router.generate_text(
-            task=LLMTask.RECOMMEND_EXPERTS,
-            prompt=analysis_prompt,
-            max_tokens=2048,
-            temperature=0.3
+        # Use LLM Router to optimize costs (Haiku for simple recommendations);
+        # identical concurrent requests share one call
+        from cache import single_flight, make_cache_key, hash_data
+        response_text = await single_flight.do(
+            make_cache_key("recommend_experts", hash_data(analysis_prompt)),
+            lambda: llm_router.generate_text(
+                task=LLMTask.RECOMMEND_EXPERTS,
+                prompt=analysis_prompt,
+                max_tokens=2048,
+                temperature=0.3
+            )
         )
         
         if not response_text:
@@ -2922,7 +2923,9 @@ IMPORTANTE: Retorne APENAS o JSON, sem texto adicional antes ou depois."""
             raise ValueError("No valid expert matches found in recommendations")
         
         # Return enriched response
-        return RecommendExpertsResponse(recommendations=enriched_recommendations)
+        response = RecommendExpertsResponse(recommendations=enriched_recommendations)
+        await recommendation_cache.put(request.problem, catalog_fingerprint, response.model_dump(mode="json"))
+        return response
     
     except json.JSONDecodeError as e:
         response_text_preview = locals().get("response_text", "N/A")
@@ -3060,6 +3063,7 @@ async def upload_expert_avatar(expert_id: str, file: UploadFile = File(...)):
         
         if not updated_expert:
             raise HTTPException(status_code=500, detail="Failed to update expert avatar")
+        expert_catalog.invalidate(reason="avatar updated")
         
         return updated_expert
     
@@ -3174,14 +3178,11 @@ async def upload_user_avatar(
         
         # Update user avatar_url in database
         avatar_url = f"/assets/user_avatars/{filename}"
-        conn = await asyncpg.connect(os.environ.get("DATABASE_URL"), statement_cache_size=0)
-        try:
+        async with db_pool.acquire("storage") as conn:
             await conn.execute(
                 "UPDATE users SET avatar_url = $1 WHERE id = $2",
                 avatar_url, user_id
             )
-        finally:
-            await conn.close()
         
         logger.info(f"[UPLOAD] User avatar uploaded for {user_id}")
         
@@ -3209,46 +3210,82 @@ class ConversationWithDetails(BaseModel):
     createdAt: datetime
     updatedAt: datetime
 
+def _encode_history_cursor(updated_at: datetime, conversation_id: str) -> str:
+    """Opaque keyset cursor (timestamp + id) for history/council pagination"""
+    return f"{updated_at.isoformat()}|{conversation_id}"
+
+def _decode_history_cursor(cursor: str):
+    """Inverse of _encode_history_cursor -> (updatedAt, id)"""
+    try:
+        updated_at_raw, conversation_id = cursor.split("|", 1)
+        return datetime.fromisoformat(updated_at_raw), conversation_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
 # IMPORTANT: Specific routes MUST come BEFORE parameterized routes
 @app.get("/api/conversations/history/user", response_model=List[ConversationWithDetails])
-async def get_user_conversation_history(user_id: str, limit: int = Query(50)):
-    """Get conversation history for user with expert details and preview"""
+async def get_user_conversation_history(
+    response: Response,
+    user_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None)
+):
+    """
+    Get conversation history for user with expert details and preview.
+    
+    One SQL round trip per page (message count + last message preview are
+    computed in the query). Seed expert metadata is resolved in memory.
+    Pagination: pass the X-Next-Cursor response header back as `cursor`.
+    """
     try:
         print(f"[HISTORY] Getting conversation history for user: {user_id}, limit: {limit}")
         
-        # Get user's conversations
-        conversations = await storage.get_user_conversations(user_id)
-        print(f"[HISTORY] Found {len(conversations)} conversations")
+        before_updated_at, before_id = _decode_history_cursor(cursor) if cursor else (None, None)
+        rows = await storage.get_user_conversation_summaries(
+            user_id,
+            limit=limit,
+            before_updated_at=before_updated_at,
+            before_id=before_id,
+        )
         
-        # Enrich with expert details and message info
         result = []
-        for conv in conversations[:limit]:
-            # Get expert info
-            expert = await get_expert_by_id(conv.expertId, include_system_prompt=False)
-            if not expert:
-                print(f"[HISTORY] Expert {conv.expertId} not found, skipping")
+        for row in rows:
+            expert_id = row["expertId"]
+            if expert_id.startswith("seed-"):
+                # Seed experts live in CloneRegistry (in-memory, no system prompt build)
+                expert = await get_expert_by_id(expert_id, include_system_prompt=False)
+                if not expert:
+                    print(f"[HISTORY] Expert {expert_id} not found, skipping")
+                    continue
+                expert_name, expert_avatar, expert_category = expert.name, expert.avatar, expert.category.value
+            elif row["expertName"]:
+                # Custom expert metadata comes from the JOIN
+                expert_name, expert_avatar, expert_category = row["expertName"], row["expertAvatar"], row["expertCategory"]
+            else:
+                print(f"[HISTORY] Expert {expert_id} not found, skipping")
                 continue
             
-            # Get message count and last message
-            messages = await storage.get_messages(conv.id)
-            message_count = len(messages)
-            last_message = messages[-1].content[:100] if messages else None
-            
             result.append(ConversationWithDetails(
-                id=conv.id,
-                expertId=conv.expertId,
-                expertName=expert.name,
-                expertAvatar=expert.avatar,
-                expertCategory=expert.category.value,
-                title=conv.title,
-                messageCount=message_count,
-                lastMessage=last_message,
-                createdAt=conv.createdAt,
-                updatedAt=conv.updatedAt
+                id=row["id"],
+                expertId=expert_id,
+                expertName=expert_name,
+                expertAvatar=expert_avatar,
+                expertCategory=expert_category,
+                title=row["title"],
+                messageCount=row["messageCount"],
+                lastMessage=row["lastMessage"],
+                createdAt=row["createdAt"],
+                updatedAt=row["updatedAt"]
             ))
         
+        if len(rows) == limit:
+            last = rows[-1]
+            response.headers["X-Next-Cursor"] = _encode_history_cursor(last["updatedAt"], last["id"])
+        
         print(f"[HISTORY] Returning {len(result)} conversations with details")
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to get history: {str(e)}")
         import traceback
@@ -3391,241 +3428,114 @@ async def delete_conversation(conversation_id: str, user_id: str = Query(...)):
         raise HTTPException(status_code=500, detail=f"Failed to delete conversation: {str(e)}")
 
 # Message endpoints
-def _build_enriched_persona_context(persona: 'UserPersona') -> str:
-    """
-    Build comprehensive persona context including ALL enriched data modules.
-    This creates a rich context string to inject into expert system prompts.
-    """
-    context = f"""
----
-[🎯 PERSONA INTELLIGENCE HUB - Público-Alvo Completo]:
-
-📊 DADOS FUNDAMENTAIS:
-• Empresa: {persona.companyName}
-• Indústria: {persona.industry}
-• Tamanho: {persona.companySize} funcionários
-• Público-alvo: {persona.targetAudience}
-• Objetivo Principal: {persona.primaryGoal}
-• Desafio Principal: {persona.mainChallenge}
-"""
-    
-    # 1. REDDIT INSIGHTS (Linguagem autêntica, sentiment, trending)
-    if persona.redditInsights:
-        reddit = persona.redditInsights if isinstance(persona.redditInsights, dict) else {}
-        
-        if reddit.get('communities'):
-            context += f"\n🌐 COMUNIDADES ATIVAS:\n{', '.join(reddit['communities'][:5])}\n"
-        
-        if reddit.get('sentiment'):
-            sentiment = reddit['sentiment']
-            if isinstance(sentiment, dict):
-                context += f"\n💬 SENTIMENT: {sentiment.get('overall', 'neutral').upper()}\n"
-                if sentiment.get('summary'):
-                    context += f"   → {sentiment['summary']}\n"
-        
-        if reddit.get('trendingTopics'):
-            topics = reddit['trendingTopics'][:3]
-            context += "\n📈 TRENDING TOPICS:\n"
-            for topic in topics:
-                if isinstance(topic, dict):
-                    context += f"   • {topic.get('topic')} ({topic.get('trend', 'stable')})\n"
-        
-        if reddit.get('language'):
-            context += f"\n🗣️ LINGUAGEM AUTÊNTICA: {reddit['language']}\n"
-    
-    # 2. PSYCHOGRAPHIC CORE (Valores, motivações, medos)
-    if persona.psychographicCore:
-        psycho = persona.psychographicCore if isinstance(persona.psychographicCore, dict) else {}
-        
-        if psycho.get('values'):
-            values = psycho['values'][:5] if isinstance(psycho['values'], list) else []
-            if values:
-                context += f"\n❤️ VALORES CORE: {', '.join(values)}\n"
-        
-        if psycho.get('motivations'):
-            context += "\n🎯 MOTIVAÇÕES:\n"
-            motivations = psycho['motivations']
-            if isinstance(motivations, dict):
-                if motivations.get('intrinsic'):
-                    intrinsic = motivations['intrinsic'][:3] if isinstance(motivations['intrinsic'], list) else []
-                    if intrinsic:
-                        context += f"   Intrínsecas: {', '.join(intrinsic)}\n"
-        
-        if psycho.get('fears'):
-            fears = psycho['fears'][:3] if isinstance(psycho['fears'], list) else []
-            if fears:
-                context += f"\n😰 MEDOS: {', '.join(fears)}\n"
-    
-    # 3. JOBS-TO-BE-DONE
-    if persona.jobsToBeDone:
-        jtbd = persona.jobsToBeDone if isinstance(persona.jobsToBeDone, dict) else {}
-        
-        if jtbd.get('functionalJobs'):
-            func_jobs = jtbd['functionalJobs'][:3] if isinstance(jtbd['functionalJobs'], list) else []
-            if func_jobs:
-                context += f"\n🔧 FUNCTIONAL JOBS: {', '.join(func_jobs)}\n"
-        
-        if jtbd.get('emotionalJobs'):
-            emot_jobs = jtbd['emotionalJobs'][:3] if isinstance(jtbd['emotionalJobs'], list) else []
-            if emot_jobs:
-                context += f"\n💝 EMOTIONAL JOBS: {', '.join(emot_jobs)}\n"
-        
-        if jtbd.get('socialJobs'):
-            social_jobs = jtbd['socialJobs'][:2] if isinstance(jtbd['socialJobs'], list) else []
-            if social_jobs:
-                context += f"\n👥 SOCIAL JOBS: {', '.join(social_jobs)}\n"
-    
-    # 4. BUYER JOURNEY
-    if persona.buyerJourney:
-        journey = persona.buyerJourney if isinstance(persona.buyerJourney, dict) else {}
-        stages = []
-        for stage_name in ['awareness', 'consideration', 'decision', 'retention', 'advocacy']:
-            if journey.get(stage_name):
-                stages.append(stage_name.capitalize())
-        if stages:
-            context += f"\n🛒 BUYER JOURNEY: {', '.join(stages)}\n"
-    
-    # 5. STRATEGIC INSIGHTS
-    if persona.strategicInsights:
-        strategic = persona.strategicInsights if isinstance(persona.strategicInsights, dict) else {}
-        
-        if strategic.get('opportunities'):
-            opps = strategic['opportunities'][:3] if isinstance(strategic['opportunities'], list) else []
-            if opps:
-                context += "\n⚡ OPORTUNIDADES:\n"
-                for opp in opps:
-                    context += f"   • {opp}\n"
-        
-        if strategic.get('quickWins'):
-            wins = strategic['quickWins'][:2] if isinstance(strategic['quickWins'], list) else []
-            if wins:
-                context += "\n🎯 QUICK WINS:\n"
-                for win in wins:
-                    context += f"   • {win}\n"
-    
-    # 6. PAIN POINTS & GOALS
-    if persona.painPoints:
-        pain_points = persona.painPoints[:5] if isinstance(persona.painPoints, list) else []
-        if pain_points:
-            context += "\n💔 PAIN POINTS:\n"
-            for pain in pain_points:
-                context += f"   • {pain}\n"
-    
-    if persona.goals:
-        goals = persona.goals[:5] if isinstance(persona.goals, list) else []
-        if goals:
-            context += "\n🏆 GOALS:\n"
-            for goal in goals:
-                context += f"   • {goal}\n"
-    
-    context += """
----
-⚡ INSTRUÇÃO CRÍTICA - PERSONALIZAÇÃO TOTAL:
-
-Você tem acesso à PERSONA COMPLETA do cliente (8 módulos enriquecidos). Use para:
-
-1. 🗣️ Falar a LINGUAGEM AUTÊNTICA (Reddit insights)
-2. 🎯 Endereçar JOBS-TO-BE-DONE específicos
-3. 🛒 Considerar estágio da BUYER JOURNEY
-4. ❤️ Alinhar com VALORES e MOTIVAÇÕES
-5. 💡 Aproveitar OPORTUNIDADES identificadas
-6. 📈 Incorporar TRENDING TOPICS
-7. 😊 Respeitar SENTIMENT das comunidades
-8. 💔 Resolver PAIN POINTS reais
-
-NÃO mencione "recebi dados" ou "vejo que você trabalha com".
-DEMONSTRE conhecimento profundo através de recomendações ultra-específicas e acionáveis.
----
-"""
-    
-    return context
-
 @app.get("/api/conversations/{conversation_id}/messages", response_model=List[Message])
 async def get_messages(conversation_id: str):
     """Get all messages in a conversation"""
     messages = await storage.get_messages(conversation_id)
     return messages
 
+async def _prepare_chat_turn(conversation_id: str):
+    """
+    Shared setup for send_message / send_message_stream.
+    
+    Returns:
+        (agent, history_window, user_id) - raises HTTPException if the
+        conversation or expert cannot be used
+    """
+    # Validate conversation exists
+    conversation = await storage.get_conversation(conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    
+    # Get expert (supports both seed and custom experts)
+    # Clones carry their own prompt; only clone-less experts need the stored system prompt
+    has_clone = CloneRegistry().resolve(conversation.expertId) is not None
+    expert = await get_expert_by_id(conversation.expertId, include_system_prompt=not has_clone)
+    if not expert:
+        raise HTTPException(status_code=404, detail="Expert not found")
+    
+    # Debug: Check if systemPrompt exists
+    if not has_clone and (not expert.systemPrompt or len(expert.systemPrompt.strip()) == 0):
+        print(f"[CHAT ERROR] Expert {expert.name} (ID: {expert.id}) has NO systemPrompt!")
+        print(f"[CHAT ERROR] Expert type: {expert.expertType}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Especialista {expert.name} não possui prompt configurado. Entre em contato com o suporte."
+        )
+    
+    
+    # Get conversation history BEFORE saving the new user message
+    # Only the recent window (token-budgeted) plus a rolling summary of older turns
+    history_window = await chat_history_loader.load(conversation_id)
+    
+    # Get user's persona for context injection (Persona Intelligence Hub)
+    # Use the userId from the conversation (NOT hardcoded "default_user")
+    user_id = conversation.userId
+    
+    # Build persona context (to be injected separately) - cached per persona version
+    persona_context = await persona_context_cache.get_for_user(storage, user_id)
+    if persona_context:
+        logger.info("Persona context ready", user_id=user_id, chars=len(persona_context))
+    else:
+        logger.info("No persona found for user", user_id=user_id)
+    
+    # Create agent for this expert
+    # Pass expert.systemPrompt as base, and persona_context separately
+    # The factory will handle adding persona_context to the clone's prompt
+    agent = LegendAgentFactory.create_agent(
+        expert_name=expert.name,
+        system_prompt=expert.systemPrompt,  # Base prompt (may be ignored if clone exists)
+        persona_context=persona_context,  # NEW: Pass separately to preserve it!
+        expert_id=conversation.expertId
+    )
+    
+    return agent, history_window, user_id
+
+async def _save_chat_turn(
+    conversation_id: str,
+    user_content: str,
+    ai_response: str,
+    history_window,
+    background_tasks: BackgroundTasks
+) -> MessageResponse:
+    """Persist user + assistant messages and schedule the history summary refresh"""
+    # IMPORTANT: Always save the ORIGINAL user message, not the enriched version
+    # This keeps the UI clean while the AI gets the context
+    user_message = await storage.create_message(MessageCreate(
+        conversationId=conversation_id,
+        role="user",
+        content=user_content
+    ))
+    
+    # Save assistant message
+    assistant_message = await storage.create_message(MessageCreate(
+        conversationId=conversation_id,
+        role="assistant",
+        content=ai_response
+    ))
+    
+    # Fold turns that fell out of the window into the summary (after responding)
+    if chat_history_loader.needs_summary(conversation_id, history_window):
+        background_tasks.add_task(chat_history_loader.refresh_summary, conversation_id, history_window)
+    
+    return MessageResponse(
+        userMessage=user_message,
+        assistantMessage=assistant_message
+    )
+
 @app.post("/api/conversations/{conversation_id}/messages", response_model=MessageResponse, status_code=201)
-async def send_message(conversation_id: str, data: MessageSend):
+async def send_message(conversation_id: str, data: MessageSend, background_tasks: BackgroundTasks):
     """Send a message and get AI response from the marketing legend"""
     try:
-        # Validate conversation exists
-        conversation = await storage.get_conversation(conversation_id)
-        if not conversation:
-            raise HTTPException(status_code=404, detail="Conversation not found")
-        
-        # Get expert (supports both seed and custom experts)
-        # Include system prompt for AI response generation
-        expert = await get_expert_by_id(conversation.expertId, include_system_prompt=True)
-        if not expert:
-            raise HTTPException(status_code=404, detail="Expert not found")
-        
-        # Debug: Check if systemPrompt exists
-        if not expert.systemPrompt or len(expert.systemPrompt.strip()) == 0:
-            print(f"[CHAT ERROR] Expert {expert.name} (ID: {expert.id}) has NO systemPrompt!")
-            print(f"[CHAT ERROR] Expert type: {expert.expertType}")
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Especialista {expert.name} não possui prompt configurado. Entre em contato com o suporte."
-            )
-        
-        logger.info("Expert {expert.name} systemPrompt length: {len(expert.systemPrompt)} chars")
-        
-        # Get conversation history BEFORE saving the new user message
-        # This way we pass all previous messages to the agent
-        all_messages = await storage.get_messages(conversation_id)
-        history = [
-            {"role": msg.role, "content": msg.content}
-            for msg in all_messages
-        ]
-        
-        # Get user's persona for context injection (Persona Intelligence Hub)
-        # Use the userId from the conversation (NOT hardcoded "default_user")
-        user_id = conversation.userId
-        persona = await storage.get_user_persona(user_id)
-        
-        # Build persona context (to be injected separately)
-        persona_context = None
-        if persona:
-            logger.info("Building ENRICHED persona context for {persona.companyName}")
-            persona_context = _build_enriched_persona_context(persona)
-            logger.info("Persona context ready: {len(persona_context)} chars")
-        else:
-            logger.info("No persona found for user {user_id}")
-        
-        # Create agent for this expert
-        # Pass expert.systemPrompt as base, and persona_context separately
-        # The factory will handle adding persona_context to the clone's prompt
-        agent = LegendAgentFactory.create_agent(
-            expert_name=expert.name,
-            system_prompt=expert.systemPrompt,  # Base prompt (may be ignored if clone exists)
-            persona_context=persona_context  # NEW: Pass separately to preserve it!
-        )
+        agent, history_window, user_id = await _prepare_chat_turn(conversation_id)
         
         # Get AI response with original user message
         # The profile context is now in the system prompt, so it persists across all messages
-        ai_response = await agent.chat(history, data.content)
+        ai_response = await agent.chat(history_window.history, data.content)
         
         # Now save user message AFTER getting AI response
-        # IMPORTANT: Always save the ORIGINAL user message (data.content), not the enriched version
-        # This keeps the UI clean while the AI gets the context
-        user_message = await storage.create_message(MessageCreate(
-            conversationId=conversation_id,
-            role="user",
-            content=data.content  # Original message, NOT user_message_content
-        ))
-        
-        # Save assistant message
-        assistant_message = await storage.create_message(MessageCreate(
-            conversationId=conversation_id,
-            role="assistant",
-            content=ai_response
-        ))
-        
-        return MessageResponse(
-            userMessage=user_message,
-            assistantMessage=assistant_message
+        return await _save_chat_turn(
+            conversation_id, data.content, ai_response, history_window, background_tasks
         )
     
     except HTTPException:
@@ -3634,6 +3544,73 @@ async def send_message(conversation_id: str, data: MessageSend):
         logger.error("Error processing message: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to process message: {str(e)}")
 
+@app.post("/api/conversations/{conversation_id}/messages/stream")
+async def send_message_stream(conversation_id: str, data: MessageSend, request: Request, background_tasks: BackgroundTasks):
+    """
+    Send a message and stream the AI response token by token (Server-Sent Events).
+    
+    Events:
+    - token: {"text": str} - Next chunk of the assistant response
+    - done: MessageResponse - Both messages, persisted after the stream finishes
+    - error: {"message": str} - Stream failed; nothing is persisted
+    """
+    # Validation errors (404/500) are raised before the stream starts
+    agent, history_window, user_id = await _prepare_chat_turn(conversation_id)
+    
+    async def event_generator():
+        def sse_event(event_type: str, data: dict) -> str:
+            return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        
+        started = time.perf_counter()
+        first_token_ms = None
+        chunks: List[str] = []
+        
+        try:
+            async for text in agent.chat_stream(history_window.history, data.content):
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - started) * 1000
+                    logger.info(
+                        "Chat stream first token",
+                        conversation_id=conversation_id,
+                        expert=agent.name,
+                        ttft_ms=round(first_token_ms, 1),
+                    )
+                chunks.append(text)
+                yield sse_event("token", {"text": text})
+            
+            ai_response = "".join(chunks)
+            result = await _save_chat_turn(
+                conversation_id, data.content, ai_response, history_window, background_tasks
+            )
+            logger.info(
+                "Chat stream completed",
+                conversation_id=conversation_id,
+                expert=agent.name,
+                ttft_ms=round(first_token_ms, 1) if first_token_ms is not None else None,
+                total_ms=round((time.perf_counter() - started) * 1000, 1),
+                response_chars=len(ai_response),
+            )
+            yield sse_event("done", result.model_dump(mode='json'))
+        
+        except Exception as e:
+            logger.error(
+                "Chat stream failed",
+                conversation_id=conversation_id,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+            yield sse_event("error", {"message": f"Failed to process message: {str(e)}"})
+    
+    return StreamingResponse(
+        cancel_on_disconnect(request, event_generator(), "chat"),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"  # Disable nginx buffering
+        }
+    )
+
 # Business Profile endpoints
 @app.post("/api/profile", response_model=BusinessProfile)
 async def save_profile(data: BusinessProfileCreate):
@@ -3695,19 +3672,18 @@ async def get_current_persona(user_id: str = Query(...)):
 async def _async_enrichment_task(persona_id: str, level: str):
     """
     Async worker that performs the actual enrichment.
-    IMPORTANT: This runs in a new event loop, so it needs its own DB connection.
+    IMPORTANT: This runs in a new event loop (worker thread). asyncpg pools are
+    loop-bound, so queries go through a threadsafe proxy that executes them on
+    the shared pool in the main loop.
     """
     print(f"[BACKGROUND] ⚡ Async enrichment task STARTED for persona {persona_id} with level {level}")
     
     # Import here to avoid circular dependencies
-    import asyncpg
     from pathlib import Path
     
     try:
-        # Create NEW database connection for this background task
-        print(f"[BACKGROUND] Creating database connection...")
-        db_url = os.getenv("DATABASE_URL")
-        conn = await asyncpg.connect(db_url, statement_cache_size=0)  # Disable cache to avoid schema change issues
+        # Connection proxy onto the shared pool for this background task
+        conn = db_pool.threadsafe_connection("enrichment")
         
         try:
             # Mark as processing
@@ -3722,7 +3698,8 @@ async def _async_enrichment_task(persona_id: str, level: str):
             # Get persona data from database
             print(f"[BACKGROUND] Fetching persona data...")
             persona_row = await conn.fetchrow("""
-                SELECT * FROM user_personas WHERE id = $1
+                SELECT id, company_name, industry, target_audience, primary_goal, main_challenge
+                FROM user_personas WHERE id = $1
             """, persona_id)
             
             if not persona_row:
@@ -3764,18 +3741,22 @@ async def _async_enrichment_task(persona_id: str, level: str):
             
             # Mark as completed
             print(f"[BACKGROUND] Enrichment completed, marking as 'completed'...")
-            await conn.execute("""
+            # Bumping updated_at gives the persona a new version (persona context cache key)
+            completed_row = await conn.fetchrow(f"""
                 UPDATE user_personas
                 SET enrichment_status = 'completed',
-                    last_enriched_at = NOW()
+                    last_enriched_at = NOW(),
+                    updated_at = NOW()
                 WHERE id = $1
+                RETURNING {", ".join(PERSONA_CONTEXT_COLUMNS)}
             """, persona_id)
+            if completed_row:
+                persona_context_cache.put(user_persona_from_row(completed_row))
             print(f"[BACKGROUND] ✅ Enrichment completed successfully!")
             
         finally:
-            # Close the dedicated connection
+            # Release the proxy (pooled connections are returned per query)
             await conn.close()
-            print(f"[BACKGROUND] Database connection closed")
         
     except Exception as e:
         # Mark as failed
@@ -3784,16 +3765,14 @@ async def _async_enrichment_task(persona_id: str, level: str):
         import traceback
         traceback.print_exc()
         
-        # Try to mark as failed (with new connection if needed)
+        # Try to mark as failed
         try:
-            db_url = os.getenv("DATABASE_URL")
-            conn_fail = await asyncpg.connect(db_url, statement_cache_size=0)  # Disable cache
+            conn_fail = db_pool.threadsafe_connection("enrichment")
             await conn_fail.execute("""
                 UPDATE user_personas
                 SET enrichment_status = 'failed'
                 WHERE id = $1
             """, persona_id)
-            await conn_fail.close()
         except:
             print(f"[BACKGROUND] Could not mark as failed in DB")
 
@@ -3827,7 +3806,7 @@ async def enrich_persona_background(data: PersonaEnrichmentRequest, background_t
     try:
         print(f"[ENRICH_ENDPOINT] Received enrichment request for persona {data.personaId} with mode {data.mode}")
         # Verify persona exists
-        persona = await storage.get_user_persona_by_id(data.personaId)
+        persona = await storage.get_user_persona_by_id(data.personaId, view="summary")
         if not persona:
             raise HTTPException(status_code=404, detail="Persona not found")
         
@@ -3861,7 +3840,7 @@ async def get_enrichment_status(user_id: str = Query(...)):
     """
     print(f"[ENRICHMENT STATUS] Fetching for user_id: {user_id}")
     try:
-        persona = await storage.get_user_persona(user_id)
+        persona = await storage.get_user_persona(user_id, view="summary")
         if not persona:
             return {"status": "no_persona"}
         
@@ -3900,6 +3879,7 @@ async def enrich_persona_youtube(data: PersonaEnrichmentRequest):
             storage=storage,
             existing_modules=None  # Fresh enrichment
         )
+        persona_context_cache.put(persona)
         
         return persona
     except ValueError as e:
@@ -3962,6 +3942,7 @@ async def upgrade_persona(persona_id: str):
             storage=storage,
             existing_modules=existing_modules
         )
+        persona_context_cache.put(upgraded_persona)
         
         return upgraded_persona
         
@@ -3985,7 +3966,7 @@ async def delete_user_persona(persona_id: str, user_id: str = Query(...)):
         print(f"[DELETE PERSONA] persona_id={persona_id}, user_id={user_id}")
         
         # Verify ownership before deleting
-        persona = await storage.get_user_persona_by_id(persona_id)
+        persona = await storage.get_user_persona_by_id(persona_id, view="summary")
         print(f"[DELETE PERSONA] Found persona: {persona is not None}")
         
         if not persona:
@@ -4068,6 +4049,29 @@ async def get_persona_by_id(persona_id: str, user_id: str = Query(...)):
         logger.error("Error getting persona by ID: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get persona: {str(e)}")
 
+async def _perplexity_completion(payload: dict) -> dict:
+    """
+    POST a chat completion to Perplexity. Concurrent identical payloads (same
+    profile/expert, e.g. a dashboard opened in several tabs) share one call.
+    """
+    from cache import single_flight, make_cache_key, hash_data
+    from perplexity_research import perplexity_research
+    
+    async def call():
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.post(
+                "https://api.perplexity.ai/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {perplexity_research.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json=payload
+            )
+            response.raise_for_status()
+            return response.json()
+    
+    return await single_flight.do(make_cache_key("perplexity", hash_data(payload)), call)
+
 # Suggested Questions endpoint (personalized based on profile + expert expertise)
 @app.get("/api/experts/{expert_id}/suggested-questions")
 async def get_suggested_questions(expert_id: str):
@@ -4080,8 +4084,6 @@ async def get_suggested_questions(expert_id: str):
     Returns 3-5 highly relevant questions the user could ask.
     """
     try:
-        from perplexity_research import perplexity_research
-        
         # Get expert (supports both seed and custom experts)
         expert = await get_expert_by_id(expert_id)
         if not expert:
@@ -4142,31 +4144,21 @@ NÃO numere as perguntas nem adicione prefixos. Apenas retorne 5 perguntas, uma
 """
         
         # Use Perplexity to generate questions with lower temperature for consistency
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "https://api.perplexity.ai/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {perplexity_research.api_key}",
-                    "Content-Type": "application/json"
+        data = await _perplexity_completion({
+            "model": "sonar-pro",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "Você é um consultor de estratégia de marketing que gera perguntas altamente específicas e acionáveis. SEMPRE responda em português brasileiro. Sempre retorne exatamente 5 perguntas, uma por linha, sem numeração ou prefixos."
                 },
-                json={
-                    "model": "sonar-pro",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "Você é um consultor de estratégia de marketing que gera perguntas altamente específicas e acionáveis. SEMPRE responda em português brasileiro. Sempre retorne exatamente 5 perguntas, uma por linha, sem numeração ou prefixos."
-                        },
-                        {
-                            "role": "user",
-                            "content": context
-                        }
-                    ],
-                    "temperature": 0.3,  # Lower temperature for more consistent, focused output
-                    "max_tokens": 500
+                {
+                    "role": "user",
+                    "content": context
                 }
-            )
-            response.raise_for_status()
-            data = response.json()
+            ],
+            "temperature": 0.3,  # Lower temperature for more consistent, focused output
+            "max_tokens": 500
+        })
         
         # Parse questions from response
         content = data["choices"][0]["message"]["content"]
@@ -4254,8 +4246,6 @@ async def get_business_insights():
     Returns 3-4 actionable insights specific to the user's business situation.
     """
     try:
-        from perplexity_research import perplexity_research
-        
         # Get user's business profile
         user_id = "default_user"
         profile = await storage.get_business_profile(user_id)
@@ -4304,32 +4294,22 @@ E-mail Marketing: [insight específico aqui]
 """
         
         # Use Perplexity to generate insights
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "https://api.perplexity.ai/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {perplexity_research.api_key}",
-                    "Content-Type": "application/json"
+        data = await _perplexity_completion({
+            "model": "sonar-pro",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "Você é um estrategista de marketing que fornece insights hiper-específicos e acionáveis baseados no contexto do negócio. SEMPRE responda em português brasileiro. Sempre use dados e tendências recentes. Formate os insights como 'Categoria: insight acionável específico'."
                 },
-                json={
-                    "model": "sonar-pro",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "Você é um estrategista de marketing que fornece insights hiper-específicos e acionáveis baseados no contexto do negócio. SEMPRE responda em português brasileiro. Sempre use dados e tendências recentes. Formate os insights como 'Categoria: insight acionável específico'."
-                        },
-                        {
-                            "role": "user",
-                            "content": context
-                        }
-                    ],
-                    "temperature": 0.4,
-                    "max_tokens": 600,
-                    "search_recency_filter": "month"  # Use recent data
+                {
+                    "role": "user",
+                    "content": context
                 }
-            )
-            response.raise_for_status()
-            data = response.json()
+            ],
+            "temperature": 0.4,
+            "max_tokens": 600,
+            "search_recency_filter": "month"  # Use recent data
+        })
         
         # Parse insights from response
         content = data["choices"][0]["message"]["content"]
@@ -4467,7 +4447,7 @@ async def create_council_analysis(data: CouncilAnalysisCreate, user_id: str = Qu
         profile = await storage.get_business_profile(user_id)
         
         # Get user's persona for deep context (PRIORITY - richer than business profile)
-        persona = await storage.get_user_persona(user_id)
+        persona = await storage.get_user_persona(user_id, view="context")
         if persona:
             logger.info("Persona loaded: {persona.companyName} (enrichment: {persona.enrichmentStatus})")
         
@@ -4482,7 +4462,7 @@ async def create_council_analysis(data: CouncilAnalysisCreate, user_id: str = Qu
                 experts.append(expert)
         else:
             # Use all available experts (combined SEED + DB)
-            experts = await get_all_experts_combined()
+            experts = await get_all_experts_combined(include_system_prompt=True)
             if not experts:
                 raise HTTPException(status_code=400, detail="No experts available for analysis")
             # Limit to top 8 experts for performance
@@ -4494,7 +4474,9 @@ async def create_council_analysis(data: CouncilAnalysisCreate, user_id: str = Qu
             experts=experts,
             profile=profile,
             user_id=user_id,
-            persona=persona  # NEW: Pass enriched persona
+            persona=persona,  # NEW: Pass enriched persona
+            mode=data.mode,
+            rebuttal=data.rebuttal
         )
         
         # Save analysis
@@ -4520,17 +4502,20 @@ async def create_council_analysis(data: CouncilAnalysisCreate, user_id: str = Qu
         raise HTTPException(status_code=500, detail=f"Failed to create council analysis: {str(e)}")
 
 @app.post("/api/council/analyze-stream")
-async def create_council_analysis_stream(data: CouncilAnalysisCreate, user_id: str = Query(...)):
+async def create_council_analysis_stream(data: CouncilAnalysisCreate, request: Request, user_id: str = Query(...)):
     """
     Run collaborative analysis with Server-Sent Events streaming.
     
-    Emits real-time progress events:
+    Forwards CouncilOrchestrator.run() progress events:
+    - analysis_started: Expert list
+    - research_started / research_completed / research_failed: Perplexity research
     - expert_started: When expert begins analysis
-    - expert_researching: During Perplexity research
-    - expert_analyzing: During Claude analysis
-    - expert_completed: When expert finishes
+    - expert_delta: Next chunk of an expert's analysis text ({expertId, expertName, text})
+    - expert_completed / expert_failed: When expert finishes (with durationMs)
+    - rebuttal_started / rebuttal_completed: Parallel mode rebuttal round
     - consensus_started: Before synthesis
-    - analysis_complete: Final result with full analysis
+    - consensus_delta: Next chunk of the consensus ({text}; reset=True replaces partial text)
+    - analysis_complete: Final result with full analysis and per-stage timings (ms)
     
     Args:
         user_id: User identifier (REQUIRED) - passed as query parameter
@@ -4546,7 +4531,7 @@ async def create_council_analysis_stream(data: CouncilAnalysisCreate, user_id: s
             profile = await storage.get_business_profile(user_id)
             
             # Get user's persona for deep context (PRIORITY)
-            persona = await storage.get_user_persona(user_id)
+            persona = await storage.get_user_persona(user_id, view="context")
             if persona:
                 print(f"[COUNCIL STREAM] Persona loaded: {persona.companyName}")
             
@@ -4562,143 +4547,55 @@ async def create_council_analysis_stream(data: CouncilAnalysisCreate, user_id: s
                     experts.append(expert)
             else:
                 # Use all available experts (combined SEED + DB)
-                experts = await get_all_experts_combined()
+                experts = await get_all_experts_combined(include_system_prompt=True)
                 if not experts:
                     yield sse_event("error", {"message": "No experts available"})
                     return
                 # Limit to top 8 experts for performance
                 experts = experts[:8]
             
-            # Emit initial event with expert list
-            yield sse_event("analysis_started", {
-                "expertCount": len(experts),
-                "experts": [{"id": e.id, "name": e.name, "avatar": e.avatar} for e in experts]
-            })
-            
-            # Run council analysis with progress events
-            # We'll need to modify council_orchestrator to emit events
-            # For now, we'll simulate the workflow
-            
-            contributions = []
-            research_findings = None
-            
-            # Perplexity research phase
-            if profile:
-                yield sse_event("research_started", {
-                    "message": "Conducting market research..."
-                })
-                
-                from perplexity_research import PerplexityResearch
-                perplexity = PerplexityResearch()
-                try:
-                    research_result = await perplexity.research(
-                        problem=data.problem,
-                        profile=profile
-                    )
-                    research_findings = research_result.get("findings", "")
+            # Run the council engine and forward its progress events
+            options = CouncilRunOptions.from_env(mode=data.mode, rebuttal=data.rebuttal, stream=True)
+            async for event in council_orchestrator.run(
+                problem=data.problem,
+                experts=experts,
+                profile=profile,
+                user_id=user_id,
+                persona=persona,
+                options=options
+            ):
+                if event.type == "analysis_complete":
+                    analysis = event.data["analysis"]
                     
-                    yield sse_event("research_completed", {
-                        "message": "Market research complete",
-                        "citations": len(research_result.get("sources", []))
-                    })
-                except Exception as e:
-                    yield sse_event("research_failed", {
-                        "message": f"Research failed: {str(e)}"
-                    })
-            
-            # Analyze with each expert (emitting events for each)
-            from crew_council import council_orchestrator
-            
-            # Process experts sequentially for event emission
-            for expert in experts:
-                yield sse_event("expert_started", {
-                    "expertId": expert.id,
-                    "expertName": expert.name,
-                    "message": f"{expert.name} is analyzing..."
-                })
-                
-                try:
-                    print(f"[Council Stream] Starting analysis for {expert.name}")
-                    contribution = await council_orchestrator._get_expert_analysis(
-                        expert=expert,
-                        problem=data.problem,
-                        profile=profile,
-                        research_findings=research_findings,
-                        persona=persona  # NEW: Pass persona to each expert
-                    )
-                    contributions.append(contribution)
-                    print(f"[Council Stream] Completed analysis for {expert.name}")
+                    # Save analysis
+                    await storage.save_council_analysis(analysis)
                     
-                    yield sse_event("expert_completed", {
-                        "expertId": expert.id,
-                        "expertName": expert.name,
-                        "insightCount": len(contribution.keyInsights),
-                        "recommendationCount": len(contribution.recommendations)
-                    })
-                except Exception as e:
-                    print(f"[Council Stream] Expert {expert.name} failed: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                    yield sse_event("expert_failed", {
-                        "expertId": expert.id,
-                        "expertName": expert.name,
-                        "error": str(e)
+                    # Send final complete event
+                    print(f"[Council Stream] Sending analysis_complete event")
+                    yield sse_event("analysis_complete", {
+                        "analysisId": analysis.id,
+                        "analysis": {
+                            "id": analysis.id,
+                            "problem": analysis.problem,
+                            "contributions": [
+                                {
+                                    "expertId": c.expertId,
+                                    "expertName": c.expertName,
+                                    "analysis": c.analysis,
+                                    "keyInsights": c.keyInsights,
+                                    "recommendations": c.recommendations
+                                }
+                                for c in analysis.contributions
+                            ],
+                            "consensus": analysis.consensus
+                        },
+                        "timings": event.data["timings"]
                     })
-            
-            if not contributions:
-                yield sse_event("error", {"message": "All expert analyses failed"})
-                return
-            
-            # Synthesize consensus
-            yield sse_event("consensus_started", {
-                "message": "Synthesizing council consensus..."
-            })
-            
-            print(f"[Council Stream] Synthesizing consensus from {len(contributions)} contributions")
-            consensus = await council_orchestrator._synthesize_consensus(
-                problem=data.problem,
-                contributions=contributions,
-                research_findings=research_findings
-            )
-            print(f"[Council Stream] Consensus generated successfully")
-            
-            # Create final analysis object
-            from models import CouncilAnalysis, AgentContribution
-            import uuid
-            
-            analysis = CouncilAnalysis(
-                id=str(uuid.uuid4()),
-                userId=user_id,
-                problem=data.problem,
-                profileId=profile.id if profile else None,
-                marketResearch=research_findings,
-                contributions=contributions,
-                consensus=consensus
-            )
-            
-            # Save analysis
-            await storage.save_council_analysis(analysis)
-            
-            # Send final complete event
-            print(f"[Council Stream] Sending analysis_complete event")
-            yield sse_event("analysis_complete", {
-                "analysisId": analysis.id,
-                "analysis": {
-                    "id": analysis.id,
-                    "problem": analysis.problem,
-                    "contributions": [
-                        {
-                            "expertId": c.expertId,
-                            "expertName": c.expertName,
-                            "analysis": c.analysis,
-                            "keyInsights": c.keyInsights,
-                            "recommendations": c.recommendations
-                        }
-                        for c in analysis.contributions
-                    ],
-                    "consensus": analysis.consensus
-                }
-            })
+                elif event.type == "expert_completed":
+                    # Contribution object is not JSON-serializable; the client gets it in analysis_complete
+                    yield sse_event(event.type, {k: v for k, v in event.data.items() if k != "contribution"})
+                else:
+                    yield sse_event(event.type, event.data)
             print(f"[Council Stream] Stream completed successfully")
             
         except Exception as e:
@@ -4710,7 +4607,7 @@ async def create_council_analysis_stream(data: CouncilAnalysisCreate, user_id: s
             })
     
     return StreamingResponse(
-        event_generator(),
+        cancel_on_disconnect(request, event_generator(), "council"),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -4720,11 +4617,33 @@ async def create_council_analysis_stream(data: CouncilAnalysisCreate, user_id: s
     )
 
 @app.get("/api/council/analyses", response_model=List[CouncilAnalysis])
-async def get_council_analyses():
-    """Get all council analyses for the current user"""
+async def get_council_analyses(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    include_analysis: bool = Query(True)
+):
+    """
+    Get council analyses for the current user (newest first).
+    
+    Single SQL query per page. Pagination (optional): pass `limit`, then the
+    X-Next-Cursor response header back as `cursor`. List views can pass
+    include_analysis=false to skip each contribution's full analysis text.
+    """
     # For now, use a default user_id until we add authentication
     user_id = "default_user"
-    return await storage.get_council_analyses(user_id)
+    before_created_at, before_id = _decode_history_cursor(cursor) if cursor else (None, None)
+    analyses = await storage.get_council_analyses(
+        user_id,
+        limit=limit,
+        before_created_at=before_created_at,
+        before_id=before_id,
+        include_analysis_text=include_analysis,
+    )
+    if limit is not None and len(analyses) == limit:
+        last = analyses[-1]
+        response.headers["X-Next-Cursor"] = _encode_history_cursor(last.createdAt, last.id)
+    return analyses
 
 @app.get("/api/council/analyses/{analysis_id}", response_model=CouncilAnalysis)
 async def get_council_analysis(analysis_id: str):
@@ -4747,7 +4666,7 @@ async def get_council_chat_messages(session_id: str):
     return messages
 
 @app.get("/api/council/chat/{session_id}/stream")
-async def council_chat_stream(session_id: str, message: str):
+async def council_chat_stream(session_id: str, message: str, request: Request):
     """
     Follow-up chat with council using SSE streaming.
     
@@ -4816,107 +4735,62 @@ async def council_chat_stream(session_id: str, message: str):
                 "createdAt": datetime.utcnow().isoformat()
             })
             
-            # Load user persona for context enrichment
+            # Load user persona context for enrichment (cached per persona version)
             print(f"[SSE] Loading user persona...")
-            persona = await storage.get_user_persona(user_id)
-            if persona:
-                print(f"[SSE] Persona loaded: {persona.companyName}")
+            persona_context = await persona_context_cache.get_for_user(storage, user_id)
+            if persona_context:
+                print(f"[SSE] Persona context loaded: {len(persona_context)} chars")
             else:
                 print(f"[SSE] No persona found for user")
             
             # Build context from analysis + history + persona
             print(f"[SSE] Building context...")
-            context = await _build_council_context(analysis, history, message, persona)
+            context = await _build_council_context(analysis, history, message, persona_context)
             print(f"[SSE] Context built - {len(context)} chars")
             
-            # Stream contributions from each expert (ROUNDTABLE: experts see previous contributions)
+            # Run the council engine (ROUNDTABLE: experts see previous contributions)
+            # No new research for follow-up; the analysis context replaces user memory
             contributions_data = []
-            current_round_contributions = []  # Accumulate for roundtable discussion
-            print(f"[SSE] Starting expert iteration (roundtable mode)...")
+            synthesis = None
+            print(f"[SSE] Starting council engine (roundtable mode)...")
             
-            for idx, expert in enumerate(experts):
-                print(f"[SSE] Processing expert {idx+1}/{len(experts)}: {expert.name}")
-                print(f"[SSE] Expert will see {len(current_round_contributions)} colleague contribution(s)")
-                yield sse_event("expert_thinking", {
-                    "expertName": expert.name,
-                    "order": idx
-                })
-                
-                # Get expert analysis with full context + colleague contributions (roundtable)
-                try:
-                    print(f"[SSE] Calling CrewAI for {expert.name}...")
-                    contribution = await council_orchestrator._get_expert_analysis(
-                        expert=expert,
-                        problem=message,
-                        research_findings=None,  # No new research for follow-up
-                        profile=None,
-                        user_id=user_id,
-                        user_context={"analysis_context": context},
-                        colleague_contributions=current_round_contributions  # Pass previous experts' contributions
-                    )
-                    print(f"[SSE] Got contribution from {expert.name} - {len(contribution.analysis)} chars")
+            async for event in council_orchestrator.run(
+                problem=message,
+                experts=experts,
+                user_id=user_id,
+                user_context={"analysis_context": context},
+                options=CouncilRunOptions(mode="roundtable", research=False, load_user_memory=False)
+            ):
+                if event.type == "expert_started":
+                    yield sse_event("expert_thinking", {
+                        "expertName": event.data["expertName"],
+                        "order": event.data["order"]
+                    })
+                elif event.type == "expert_completed":
+                    contribution = event.data["contribution"]
+                    print(f"[SSE] Got contribution from {contribution.expertName} - {len(contribution.analysis)} chars")
                     
                     # Stream this expert's contribution
                     yield sse_event("contribution", {
                         "expertName": contribution.expertName,
                         "content": contribution.analysis,
-                        "order": idx
+                        "order": event.data["order"]
                     })
                     
                     contributions_data.append(StreamContribution(
                         expertName=contribution.expertName,
                         content=contribution.analysis,
-                        order=idx
-                    ))
-                    
-                    # Add to current round for next experts to see (roundtable)
-                    current_round_contributions.append({
-                        "expert_name": contribution.expertName,
-                        "contribution": contribution.analysis
-                    })
-                    print(f"[SSE] Contribution {idx+1} added to list. Next expert will see {len(current_round_contributions)} colleague(s)")
-                    
-                except Exception as e:
-                    print(f"[SSE] ERROR: Expert {expert.name} failed: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
-                    continue
-            
-            # Synthesize consensus
-            print(f"[SSE] Starting synthesis with {len(contributions_data)} contributions...")
-            yield sse_event("synthesizing", {})
-            
-            # Parse insights and recommendations from each contribution
-            parsed_contributions = []
-            for c in contributions_data:
-                try:
-                    insights = council_orchestrator._extract_bullet_points(c.content, "Key Insights")
-                    recommendations = council_orchestrator._extract_bullet_points(c.content, "Actionable Recommendations")
-                    
-                    parsed_contributions.append(AgentContribution(
-                        expertId="",
-                        expertName=c.expertName,
-                        analysis=c.content,
-                        keyInsights=insights,
-                        recommendations=recommendations
-                    ))
-                    print(f"[SSE] Parsed {c.expertName}: {len(insights)} insights, {len(recommendations)} recommendations")
-                except Exception as e:
-                    print(f"[SSE] Warning: Failed to parse bullet points for {c.expertName}: {str(e)}")
-                    # Fallback: use contribution with full analysis text but empty structured sections
-                    parsed_contributions.append(AgentContribution(
-                        expertId="",
-                        expertName=c.expertName,
-                        analysis=c.content,
-                        keyInsights=[],
-                        recommendations=[]
+                        order=event.data["order"]
                     ))
+                elif event.type == "consensus_started":
+                    print(f"[SSE] Starting synthesis with {len(contributions_data)} contributions...")
+                    yield sse_event("synthesizing", {})
+                elif event.type == "analysis_complete":
+                    synthesis = event.data["analysis"].consensus
+                elif event.type == "error":
+                    yield sse_event("error", event.data)
+                    return
             
-            synthesis = await council_orchestrator._synthesize_consensus(
-                problem=message,
-                contributions=parsed_contributions,
-                research_findings=None
-            )
             print(f"[SSE] Synthesis complete - {len(synthesis)} chars")
             
             yield sse_event("synthesis", {
@@ -4947,7 +4821,7 @@ async def council_chat_stream(session_id: str, message: str):
             yield sse_event("error", {"message": str(e)})
     
     return StreamingResponse(
-        event_generator(),
+        cancel_on_disconnect(request, event_generator(), "council_chat"),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -4960,15 +4834,15 @@ async def _build_council_context(
     analysis: CouncilAnalysis,
     history: List[CouncilChatMessage],
     new_question: str,
-    persona: Optional['UserPersona'] = None
+    persona_context: Optional[str] = None
 ) -> str:
     """Build rich context for follow-up including analysis + history + ENRICHED persona"""
     
     # Start with ENRICHED persona context if available
     context = ""
-    if persona:
-        print(f"[COUNCIL CONTEXT] Adding ENRICHED persona context for {persona.companyName}")
-        context += _build_enriched_persona_context(persona)
+    if persona_context:
+        print(f"[COUNCIL CONTEXT] Adding ENRICHED persona context ({len(persona_context)} chars)")
+        context += persona_context
         context += "\n\n"
     
     context += f"""**CONTEXTO DA ANÁLISE INICIAL:**
@@ -5413,27 +5287,27 @@ Retorne APENAS o texto melhorado, sem títulos ou explicações."""
             original_length=len(text)
         )
         
-        response = await client.create_message(
-            messages=[{"role": "user", "content": user_prompt}],
-            system=system_prompt,
-            max_tokens=800,
-            temperature=0.7
-        )
-        
-        # Extract text from response
-        enhanced_text = response.content[0].text.strip()
-        
-        # Build result
-        result = {
-            "enhanced_text": enhanced_text,
-            "original_length": len(text),
-            "enhanced_length": len(enhanced_text),
-            "field_type": field_type,
-            "improvement_ratio": round(len(enhanced_text) / len(text), 2)
-        }
+        async def enhance():
+            response = await client.create_message(
+                messages=[{"role": "user", "content": user_prompt}],
+                system=system_prompt,
+                max_tokens=800,
+                temperature=0.7
+            )
+            
+            # Extract text from response
+            enhanced_text = response.content[0].text.strip()
+            
+            return {
+                "enhanced_text": enhanced_text,
+                "original_length": len(text),
+                "enhanced_length": len(enhanced_text),
+                "field_type": field_type,
+                "improvement_ratio": round(len(enhanced_text) / len(text), 2)
+            }
         
-        # Cache result for 24 hours
-        await cache_manager.set(cache_key, result, 24 * 60 * 60)
+        # Identical concurrent requests share one Claude call; result cached for 24 hours
+        result = await cache_manager.coalesce(cache_key, enhance, 24 * 60 * 60)
         
         # Log analytics
         logger.info(
@@ -5441,7 +5315,7 @@ Retorne APENAS o texto melhorado, sem títulos ou explicações."""
             user_id=user_id,
             field_type=field_type,
             original_length=len(text),
-            enhanced_length=len(enhanced_text),
+            enhanced_length=result["enhanced_length"],
             improvement_ratio=result["improvement_ratio"]
         )
         
@@ -5453,7 +5327,7 @@ Retorne APENAS o texto melhorado, sem títulos ou explicações."""
                 metadata={
                     "field_type": field_type,
                     "original_length": len(text),
-                    "enhanced_length": len(enhanced_text),
+                    "enhanced_length": result["enhanced_length"],
                     "improvement_ratio": result["improvement_ratio"]
                 }
             )
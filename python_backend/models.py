@@ -136,6 +136,8 @@ class CouncilAnalysisCreate(BaseModel):
     """Request payload for council analysis"""
     problem: str
     expertIds: Optional[List[str]] = None  # If None, use all 8 legends
+    mode: Optional[Literal["roundtable", "parallel"]] = None  # Defaults to COUNCIL_MODE env
+    rebuttal: Optional[bool] = None  # Parallel mode only - defaults to COUNCIL_REBUTTAL env
 
 class StreamContribution(BaseModel):
     """Individual expert contribution for SSE streaming"""
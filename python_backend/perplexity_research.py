@@ -6,6 +6,7 @@ import os
 import httpx
 from typing import List, Dict, Optional, Any
 from models import BusinessProfile
+from stream_cancellation import tracked_llm_call
 
 class PerplexityResearch:
     """Wrapper for Perplexity API with business context and lazy initialization"""
@@ -68,7 +69,7 @@ class PerplexityResearch:
         query = self._build_research_query(problem, profile)
         
         # Call Perplexity API
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with tracked_llm_call("perplexity_research"), httpx.AsyncClient(timeout=60.0) as client:
             response = await client.post(
                 self.base_url,
                 headers={
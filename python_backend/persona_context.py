@@ -0,0 +1,258 @@
+"""
+Persona Intelligence Hub context for expert prompts.
+
+The enriched persona context is a multi-KB string rendered from the
+UserPersona JSON modules. It used to be rebuilt - after a `SELECT *` that
+re-parsed every JSONB column - on each chat message and council follow-up.
+PersonaContextCache keeps the rendered string per persona, keyed by persona
+id + updatedAt: the chat hot path only asks PostgreSQL for (id, updated_at)
+and renders/parses nothing while the persona is unchanged.
+"""
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from env_validator import get_config_int
+from logger import logger
+from models import UserPersona
+
+
+def build_enriched_persona_context(persona: UserPersona) -> str:
+    """
+    Build comprehensive persona context including ALL enriched data modules.
+    This creates a rich context string to inject into expert system prompts.
+    """
+    context = f"""
+---
+[🎯 PERSONA INTELLIGENCE HUB - Público-Alvo Completo]:
+
+📊 DADOS FUNDAMENTAIS:
+• Empresa: {persona.companyName}
+• Indústria: {persona.industry}
+• Tamanho: {persona.companySize} funcionários
+• Público-alvo: {persona.targetAudience}
+• Objetivo Principal: {persona.primaryGoal}
+• Desafio Principal: {persona.mainChallenge}
+"""
+    
+    # 1. REDDIT INSIGHTS (Linguagem autêntica, sentiment, trending)
+    if persona.redditInsights:
+        reddit = persona.redditInsights if isinstance(persona.redditInsights, dict) else {}
+        
+        if reddit.get('communities'):
+            context += f"\n🌐 COMUNIDADES ATIVAS:\n{', '.join(reddit['communities'][:5])}\n"
+        
+        if reddit.get('sentiment'):
+            sentiment = reddit['sentiment']
+            if isinstance(sentiment, dict):
+                context += f"\n💬 SENTIMENT: {sentiment.get('overall', 'neutral').upper()}\n"
+                if sentiment.get('summary'):
+                    context += f"   → {sentiment['summary']}\n"
+        
+        if reddit.get('trendingTopics'):
+            topics = reddit['trendingTopics'][:3]
+            context += "\n📈 TRENDING TOPICS:\n"
+            for topic in topics:
+                if isinstance(topic, dict):
+                    context += f"   • {topic.get('topic')} ({topic.get('trend', 'stable')})\n"
+        
+        if reddit.get('language'):
+            context += f"\n🗣️ LINGUAGEM AUTÊNTICA: {reddit['language']}\n"
+    
+    # 2. PSYCHOGRAPHIC CORE (Valores, motivações, medos)
+    if persona.psychographicCore:
+        psycho = persona.psychographicCore if isinstance(persona.psychographicCore, dict) else {}
+        
+        if psycho.get('values'):
+            values = psycho['values'][:5] if isinstance(psycho['values'], list) else []
+            if values:
+                context += f"\n❤️ VALORES CORE: {', '.join(values)}\n"
+        
+        if psycho.get('motivations'):
+            context += "\n🎯 MOTIVAÇÕES:\n"
+            motivations = psycho['motivations']
+            if isinstance(motivations, dict):
+                if motivations.get('intrinsic'):
+                    intrinsic = motivations['intrinsic'][:3] if isinstance(motivations['intrinsic'], list) else []
+                    if intrinsic:
+                        context += f"   Intrínsecas: {', '.join(intrinsic)}\n"
+        
+        if psycho.get('fears'):
+            fears = psycho['fears'][:3] if isinstance(psycho['fears'], list) else []
+            if fears:
+                context += f"\n😰 MEDOS: {', '.join(fears)}\n"
+    
+    # 3. JOBS-TO-BE-DONE
+    if persona.jobsToBeDone:
+        jtbd = persona.jobsToBeDone if isinstance(persona.jobsToBeDone, dict) else {}
+        
+        if jtbd.get('functionalJobs'):
+            func_jobs = jtbd['functionalJobs'][:3] if isinstance(jtbd['functionalJobs'], list) else []
+            if func_jobs:
+                context += f"\n🔧 FUNCTIONAL JOBS: {', '.join(func_jobs)}\n"
+        
+        if jtbd.get('emotionalJobs'):
+            emot_jobs = jtbd['emotionalJobs'][:3] if isinstance(jtbd['emotionalJobs'], list) else []
+            if emot_jobs:
+                context += f"\n💝 EMOTIONAL JOBS: {', '.join(emot_jobs)}\n"
+        
+        if jtbd.get('socialJobs'):
+            social_jobs = jtbd['socialJobs'][:2] if isinstance(jtbd['socialJobs'], list) else []
+            if social_jobs:
+                context += f"\n👥 SOCIAL JOBS: {', '.join(social_jobs)}\n"
+    
+    # 4. BUYER JOURNEY
+    if persona.buyerJourney:
+        journey = persona.buyerJourney if isinstance(persona.buyerJourney, dict) else {}
+        stages = []
+        for stage_name in ['awareness', 'consideration', 'decision', 'retention', 'advocacy']:
+            if journey.get(stage_name):
+                stages.append(stage_name.capitalize())
+        if stages:
+            context += f"\n🛒 BUYER JOURNEY: {', '.join(stages)}\n"
+    
+    # 5. STRATEGIC INSIGHTS
+    if persona.strategicInsights:
+        strategic = persona.strategicInsights if isinstance(persona.strategicInsights, dict) else {}
+        
+        if strategic.get('opportunities'):
+            opps = strategic['opportunities'][:3] if isinstance(strategic['opportunities'], list) else []
+            if opps:
+                context += "\n⚡ OPORTUNIDADES:\n"
+                for opp in opps:
+                    context += f"   • {opp}\n"
+        
+        if strategic.get('quickWins'):
+            wins = strategic['quickWins'][:2] if isinstance(strategic['quickWins'], list) else []
+            if wins:
+                context += "\n🎯 QUICK WINS:\n"
+                for win in wins:
+                    context += f"   • {win}\n"
+    
+    # 6. PAIN POINTS & GOALS
+    if persona.painPoints:
+        pain_points = persona.painPoints[:5] if isinstance(persona.painPoints, list) else []
+        if pain_points:
+            context += "\n💔 PAIN POINTS:\n"
+            for pain in pain_points:
+                context += f"   • {pain}\n"
+    
+    if persona.goals:
+        goals = persona.goals[:5] if isinstance(persona.goals, list) else []
+        if goals:
+            context += "\n🏆 GOALS:\n"
+            for goal in goals:
+                context += f"   • {goal}\n"
+    
+    context += """
+---
+⚡ INSTRUÇÃO CRÍTICA - PERSONALIZAÇÃO TOTAL:
+
+Você tem acesso à PERSONA COMPLETA do cliente (8 módulos enriquecidos). Use para:
+
+1. 🗣️ Falar a LINGUAGEM AUTÊNTICA (Reddit insights)
+2. 🎯 Endereçar JOBS-TO-BE-DONE específicos
+3. 🛒 Considerar estágio da BUYER JOURNEY
+4. ❤️ Alinhar com VALORES e MOTIVAÇÕES
+5. 💡 Aproveitar OPORTUNIDADES identificadas
+6. 📈 Incorporar TRENDING TOPICS
+7. 😊 Respeitar SENTIMENT das comunidades
+8. 💔 Resolver PAIN POINTS reais
+
+NÃO mencione "recebi dados" ou "vejo que você trabalha com".
+DEMONSTRE conhecimento profundo através de recomendações ultra-específicas e acionáveis.
+---
+"""
+    
+    return context
+
+
+class PersonaContextCache:
+    """
+    LRU cache of rendered persona contexts: persona id -> (updatedAt, context).
+
+    Entries are stale as soon as the persona's updatedAt changes, and are also
+    dropped explicitly by storage.update_user_persona/set_active_persona/
+    delete_user_persona. Enrichment populates the cache when it completes, so
+    the first chat message after enrichment is already a hit.
+
+    Thread-safe: background enrichment runs in its own thread/event loop.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or get_config_int("PERSONA_CONTEXT_CACHE_SIZE", 1000)
+        self._entries: "OrderedDict[str, Tuple[Optional[datetime], str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, persona_id: str, updated_at: Optional[datetime]) -> Optional[str]:
+        """Cached context for this persona version, or None"""
+        with self._lock:
+            entry = self._entries.get(persona_id)
+            if entry is None or entry[0] != updated_at:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(persona_id)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, persona: UserPersona) -> str:
+        """Render and cache the context for this persona version"""
+        context = build_enriched_persona_context(persona)
+        with self._lock:
+            self._entries[persona.id] = (persona.updatedAt, persona.userId, context)
+            self._entries.move_to_end(persona.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return context
+
+    def render(self, persona: UserPersona) -> str:
+        """Context for an already loaded persona (cached if unchanged)"""
+        return self.get(persona.id, persona.updatedAt) or self.put(persona)
+
+    async def get_for_user(self, storage, user_id: str) -> Optional[str]:
+        """
+        Context for the user's current persona without loading the persona
+        row unless it changed since it was last rendered.
+
+        Returns:
+            Rendered context or None if the user has no persona
+        """
+        version = await storage.get_user_persona_version(user_id)
+        if version is None:
+            return None
+        persona_id, updated_at = version
+
+        context = self.get(persona_id, updated_at)
+        if context is not None:
+            return context
+
+        persona = await storage.get_user_persona_by_id(persona_id, view="context")
+        if persona is None:
+            return None
+        logger.info("Rendering persona context", persona_id=persona_id, company=persona.companyName)
+        return self.put(persona)
+
+    def invalidate(self, persona_id: Optional[str] = None, user_id: Optional[str] = None):
+        """Drop one persona, or every persona of a user"""
+        with self._lock:
+            if persona_id is not None:
+                self._entries.pop(str(persona_id), None)
+            if user_id is not None:
+                for key in [key for key, entry in self._entries.items() if entry[1] == user_id]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+persona_context_cache = PersonaContextCache()
+
+
+__all__ = [
+    "build_enriched_persona_context",
+    "PersonaContextCache",
+    "persona_context_cache",
+]
@@ -234,7 +234,7 @@ async def enrich_persona_with_youtube(
     if mode not in RESEARCH_DEPTH:
         raise ValueError(f"Invalid mode '{mode}'. Must be one of: {list(RESEARCH_DEPTH.keys())}")
     
-    persona = await storage.get_user_persona_by_id(persona_id)
+    persona = await storage.get_user_persona_by_id(persona_id, view="summary")
     if not persona:
         raise ValueError(f"Persona with id '{persona_id}' not found")
     
@@ -353,7 +353,7 @@ async def enrich_persona_with_deep_modules(
     print(f"[DEEP ENRICHMENT] Starting {level.upper()} persona generation...")
     
     # Step 1: Get persona
-    persona = await storage.get_user_persona_by_id(persona_id)
+    persona = await storage.get_user_persona_by_id(persona_id, view="summary")
     if not persona:
         raise ValueError(f"Persona with id '{persona_id}' not found")
     
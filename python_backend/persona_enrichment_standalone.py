@@ -15,7 +15,7 @@ import httpx
 
 
 async def enrich_persona_complete_standalone(
-    conn,  # asyncpg connection
+    conn,  # asyncpg connection or db_pool.ThreadsafeConnection
     persona_id: str,
     persona_data: Dict[str, Any],
     level: Literal["quick", "strategic", "complete"]
@@ -23,11 +23,11 @@ async def enrich_persona_complete_standalone(
     """
     COMPLETE PERSONA ENRICHMENT - Standalone version for background tasks
     
-    Works with a dedicated asyncpg connection (no storage.pool dependency).
+    Works with any connection-like object exposing execute() (no storage.pool dependency).
     Generates ALL 8 modules + YouTube research.
     
     Args:
-        conn: asyncpg connection (dedicated to this task)
+        conn: asyncpg connection, or a db_pool.ThreadsafeConnection when run from a worker loop
         persona_id: ID of persona to enrich
         persona_data: Dict with company_name, industry, target_audience, etc.
         level: "quick" (3 modules) | "strategic" (6 modules) | "complete" (8 modules)
@@ -3,9 +3,32 @@ Expert Recommendation System
 Matches user business profile with marketing experts based on expertise, goals, and challenges
 """
 
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from typing import List, Dict, FrozenSet, Mapping, Optional, Sequence
+from keyword_matcher import KeywordMatcher
 from models import Expert, BusinessProfile
 
+
+@dataclass(frozen=True)
+class CompiledExpert:
+    """An expert's keyword lists as bitmasks over the engine's KeywordMatcher"""
+    goals: FrozenSet[str]      # Exact-match goals
+    goals_mask: int
+    industries_mask: int
+    challenges_mask: int
+    challenge_words_mask: int  # Single words of multi-word challenges (partial match)
+    keywords_mask: int
+
+
+@dataclass(frozen=True)
+class ProfileMatches:
+    """Compiled keywords found in each field of one business profile"""
+    goal: str                  # Lowercased primaryGoal
+    goal_mask: int
+    industry_mask: int
+    challenge_mask: int
+    context_mask: int          # mainProducts + targetAudience
+
 class ExpertRecommendationEngine:
     """
     Recommendation engine that scores experts based on business profile match
@@ -72,14 +95,74 @@ class ExpertRecommendationEngine:
         }
     }
     
+    # Score range for experts outside EXPERT_EXPERTISE_MAP, from local index relevance
+    INDEX_SCORE_MIN = 30
+    INDEX_SCORE_MAX = 85
+    
+    def __init__(self):
+        self._matcher: Optional[KeywordMatcher] = None
+        self._compiled: Dict[str, CompiledExpert] = {}
+    
+    def _compiled_experts(self) -> Dict[str, CompiledExpert]:
+        """
+        Compile every keyword/goal/industry/challenge list of EXPERT_EXPERTISE_MAP
+        into one automaton, and each expert's lists into bitmasks over it
+        """
+        if self._matcher is None:
+            vocabulary = []
+            for data in self.EXPERT_EXPERTISE_MAP.values():
+                for field in ("keywords", "goals", "industries", "challenges"):
+                    vocabulary.extend(data.get(field, []))
+                for challenge in data.get("challenges", []):
+                    vocabulary.extend(challenge.split())
+            matcher = KeywordMatcher(vocabulary)
+            self._compiled = {
+                name: CompiledExpert(
+                    goals=frozenset(data.get("goals", [])),
+                    goals_mask=matcher.mask_of(data.get("goals", [])),
+                    industries_mask=matcher.mask_of(data.get("industries", [])),
+                    challenges_mask=matcher.mask_of(data.get("challenges", [])),
+                    challenge_words_mask=matcher.mask_of(
+                        word for challenge in data.get("challenges", []) for word in challenge.split()
+                    ),
+                    keywords_mask=matcher.mask_of(data.get("keywords", [])),
+                )
+                for name, data in self.EXPERT_EXPERTISE_MAP.items()
+            }
+            self._matcher = matcher
+        return self._compiled
+    
+    def match_profile(self, profile: BusinessProfile) -> ProfileMatches:
+        """Scan each profile field once for every compiled keyword"""
+        self._compiled_experts()
+        matcher = self._matcher
+        # Safe handling of potentially empty fields
+        main_products = getattr(profile, 'mainProducts', '') or ''
+        target_audience = getattr(profile, 'targetAudience', '') or ''
+        goal = profile.primaryGoal.lower()
+        return ProfileMatches(
+            goal=goal,
+            goal_mask=matcher.mask(goal),
+            industry_mask=matcher.mask(profile.industry.lower()),
+            challenge_mask=matcher.mask(profile.mainChallenge.lower()),
+            context_mask=matcher.mask(f"{main_products} {target_audience}".lower()),
+        )
+    
     def calculate_expert_score(
         self, 
         expert: Expert, 
-        profile: Optional[BusinessProfile] = None
+        profile: Optional[BusinessProfile] = None,
+        relevance: Optional[Mapping[str, float]] = None,
+        matches: Optional["ProfileMatches"] = None
     ) -> Dict:
         """
         Calculate relevance score (0-100) for an expert based on business profile
         
+        Args:
+            relevance: Optional expert id -> 0..1 match from the local expert
+                index (expert_index), used for experts without a keyword map
+            matches: match_profile(profile), when scoring many experts
+        
         Returns:
             Dict with score, justification, and breakdown
         """
@@ -91,6 +174,15 @@ class ExpertRecommendationEngine:
             }
         
         expert_data = self.EXPERT_EXPERTISE_MAP.get(expert.name, {})
+        if not expert_data and relevance is not None and expert.id in relevance:
+            index_score = round(
+                self.INDEX_SCORE_MIN + (self.INDEX_SCORE_MAX - self.INDEX_SCORE_MIN) * relevance[expert.id]
+            )
+            return {
+                "score": index_score,
+                "justification": f"{expert.name} oferece perspectivas de {expert.title} alinhadas ao seu perfil.",
+                "breakdown": {"index_match": index_score}
+            }
         if not expert_data:
             return {
                 "score": 50,
@@ -98,16 +190,17 @@ class ExpertRecommendationEngine:
                 "breakdown": {}
             }
         
+        compiled = self._compiled_experts()[expert.name]
+        matches = matches or self.match_profile(profile)
         score = 0
         breakdown = {}
         justifications = []
         
         # 1. Goal alignment (30 points max)
-        goal_score = 0
-        if profile.primaryGoal.lower() in expert_data.get("goals", []):
+        if matches.goal in compiled.goals:
             goal_score = 30
             justifications.append(f"Especialista alinhado com seu objetivo de {profile.primaryGoal}")
-        elif any(goal in profile.primaryGoal.lower() for goal in expert_data.get("goals", [])):
+        elif matches.goal_mask & compiled.goals_mask:
             goal_score = 20
             justifications.append(f"Parcialmente alinhado com seu objetivo de {profile.primaryGoal}")
         else:
@@ -116,50 +209,30 @@ class ExpertRecommendationEngine:
         breakdown["goal_alignment"] = goal_score
         
         # 2. Industry match (25 points max)
-        industry_score = 0
-        profile_industry_lower = profile.industry.lower()
-        for industry_keyword in expert_data.get("industries", []):
-            if industry_keyword in profile_industry_lower:
-                industry_score = 25
-                justifications.append(f"Experiência comprovada em {profile.industry}")
-                break
-        if industry_score == 0:
+        if matches.industry_mask & compiled.industries_mask:
+            industry_score = 25
+            justifications.append(f"Experiência comprovada em {profile.industry}")
+        else:
             industry_score = 5
         score += industry_score
         breakdown["industry_match"] = industry_score
         
-        # 3. Challenge match (25 points max)
-        challenge_score = 0
-        profile_challenge_lower = profile.mainChallenge.lower()
-        for challenge_keyword in expert_data.get("challenges", []):
-            if challenge_keyword in profile_challenge_lower:
-                challenge_score = 25
-                justifications.append(f"Especialista em resolver: {profile.mainChallenge}")
-                break
-        if challenge_score == 0:
-            # Check partial match
-            for challenge_keyword in expert_data.get("challenges", []):
-                if any(word in profile_challenge_lower for word in challenge_keyword.split()):
-                    challenge_score = 15
-                    justifications.append(f"Pode ajudar com: {profile.mainChallenge}")
-                    break
-        if challenge_score == 0:
+        # 3. Challenge match (25 points max; 15 if any word of a challenge matches)
+        if matches.challenge_mask & compiled.challenges_mask:
+            challenge_score = 25
+            justifications.append(f"Especialista em resolver: {profile.mainChallenge}")
+        elif matches.challenge_mask & compiled.challenge_words_mask:
+            challenge_score = 15
+            justifications.append(f"Pode ajudar com: {profile.mainChallenge}")
+        else:
             challenge_score = 5
         score += challenge_score
         breakdown["challenge_match"] = challenge_score
         
         # 4. Keyword match in products/audience (20 points max)
-        keyword_score = 0
-        # Safe handling of potentially empty fields
-        main_products = getattr(profile, 'mainProducts', '') or ''
-        target_audience = getattr(profile, 'targetAudience', '') or ''
-        context = f"{main_products} {target_audience}".lower()
-        
-        matched_keywords = [kw for kw in expert_data.get("keywords", []) if kw in context]
-        if matched_keywords:
-            keyword_score = min(20, len(matched_keywords) * 5)
-            if keyword_score >= 15:
-                justifications.append(f"Alta relevância para seu mercado e produtos")
+        keyword_score = min(20, (matches.context_mask & compiled.keywords_mask).bit_count() * 5)
+        if keyword_score >= 15:
+            justifications.append(f"Alta relevância para seu mercado e produtos")
         score += keyword_score
         breakdown["keyword_match"] = keyword_score
         
@@ -195,18 +268,23 @@ class ExpertRecommendationEngine:
         self,
         experts: List[Expert],
         profile: Optional[BusinessProfile] = None,
-        top_n: Optional[int] = None
+        top_n: Optional[int] = None,
+        relevance: Optional[Mapping[str, float]] = None
     ) -> List[Dict]:
         """
         Get ranked expert recommendations
         
+        Args:
+            relevance: See calculate_expert_score
+        
         Returns:
             List of dicts with expert info, score, stars, and justification
         """
         recommendations = []
+        matches = self.match_profile(profile) if profile else None
         
         for expert in experts:
-            result = self.calculate_expert_score(expert, profile)
+            result = self.calculate_expert_score(expert, profile, relevance, matches)
             recommendations.append({
                 "expertId": expert.id,
                 "expertName": expert.name,
@@ -226,5 +304,35 @@ class ExpertRecommendationEngine:
         return recommendations
 
 
+    def get_recommendations_batch(
+        self,
+        experts: List[Expert],
+        profiles: Sequence[Optional[BusinessProfile]],
+        top_n: Optional[int] = None
+    ) -> List[List[Dict]]:
+        """
+        Rank experts for many profiles at once (superadmin/analytics).
+        
+        The keyword automaton is compiled once and shared; each profile costs
+        one scan per field plus bitmask checks per expert.
+        
+        Returns:
+            One get_recommendations() result per profile, in order
+        """
+        return [self.get_recommendations(experts, profile, top_n) for profile in profiles]
+
+
+def profile_query(profile: BusinessProfile) -> str:
+    """Free-text query describing a business profile (for the local expert index)"""
+    return " ".join(filter(None, [
+        profile.industry,
+        profile.primaryGoal,
+        profile.mainChallenge,
+        getattr(profile, 'mainProducts', '') or '',
+        getattr(profile, 'targetAudience', '') or '',
+        " ".join(getattr(profile, 'channels', None) or []),
+    ]))
+
+
 # Singleton instance
 recommendation_engine = ExpertRecommendationEngine()
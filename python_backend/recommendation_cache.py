@@ -0,0 +1,200 @@
+"""
+Response cache for /api/recommend-experts.
+
+Each recommendation sends every expert profile to Claude, while users often
+submit the same (or nearly the same) problem again. Two tiers:
+
+- exact: hash of the normalized problem text (case, accents, punctuation and
+  whitespace folded) + expert catalog fingerprint, stored in cache_manager
+  (Redis when enabled, so shared across workers)
+- similar: TF-IDF cosine nearest neighbour over recent problems of the same
+  catalog fingerprint (in-process); reuses the neighbour's recommendations
+  when the similarity is >= RECOMMEND_SIMILARITY_THRESHOLD
+
+The fingerprint is a hash of the catalog contents (expert ids and avatars),
+not the per-process catalog version, so creating an expert or changing an
+avatar never serves recommendations built from the old catalog - neither in
+this worker nor in another worker or after a restart.
+"""
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from cache import cache_manager, make_cache_key, hash_data
+from env_validator import get_config_bool, get_config_float, get_config_int
+from logger import logger
+
+# Short Portuguese/English function words that carry no topic signal
+STOPWORDS = frozenset("""
+a o as os um uma uns umas de do da dos das em no na nos nas por para com sem
+sob sobre e ou mas que se como mais menos muito muita muitos muitas meu minha
+meus minhas nosso nossa nossos nossas seu sua seus suas eu nos ele ela eles
+elas isso isto esse essa este esta ao aos the and or of to in for on with is
+are my our we i it this that
+""".split())
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_problem(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation/whitespace"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    ascii_text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_WORD.sub(" ", ascii_text).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized content words of `text` (stopwords and 1-char tokens dropped)"""
+    return [
+        token for token in normalize_problem(text).split()
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+class RecommendationCache:
+    """
+    Two-tier (exact + TF-IDF similarity) cache of recommendation responses.
+
+    The similarity index only holds problems of the current catalog
+    fingerprint; it is reset when the fingerprint changes. Responses themselves live in
+    cache_manager, so an index entry whose response expired is dropped on use.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        similarity_enabled: Optional[bool] = None,
+        threshold: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.ttl_seconds = ttl_seconds or get_config_int("RECOMMEND_CACHE_TTL", 24 * 60 * 60)
+        self.similarity_enabled = (
+            similarity_enabled if similarity_enabled is not None
+            else get_config_bool("RECOMMEND_SIMILARITY_ENABLED", True)
+        )
+        self.threshold = threshold or get_config_float("RECOMMEND_SIMILARITY_THRESHOLD", 0.9)
+        self.max_entries = max_entries or get_config_int("RECOMMEND_SIMILARITY_MAX_ENTRIES", 500)
+        # cache key -> term counts of the problem, oldest first
+        self._index: "OrderedDict[str, Counter]" = OrderedDict()
+        self._document_frequency: Counter = Counter()
+        self._index_fingerprint: Optional[str] = None
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def key_for(self, problem: str, catalog_fingerprint: str) -> str:
+        return make_cache_key("recommend_experts", catalog_fingerprint, hash_data(normalize_problem(problem)))
+
+    async def get(self, problem: str, catalog_fingerprint: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Cached response and the tier that served it ("exact", "similar" or "miss")"""
+        key = self.key_for(problem, catalog_fingerprint)
+        response = await cache_manager.get(key)
+        if response is not None:
+            self.exact_hits += 1
+            return response, "exact"
+
+        if self.similarity_enabled:
+            neighbour, similarity = self._nearest(tokenize(problem), catalog_fingerprint)
+            if neighbour is not None:
+                response = await cache_manager.get(neighbour)
+                if response is not None:
+                    self.similar_hits += 1
+                    logger.info("Recommendation similarity cache hit", similarity=round(similarity, 3))
+                    return response, "similar"
+                self._forget(neighbour)
+
+        self.misses += 1
+        return None, "miss"
+
+    async def put(self, problem: str, catalog_fingerprint: str, response: Dict[str, Any]) -> None:
+        key = self.key_for(problem, catalog_fingerprint)
+        await cache_manager.set(key, response, self.ttl_seconds)
+        if self.similarity_enabled:
+            self._add(key, Counter(tokenize(problem)), catalog_fingerprint)
+
+    def _reset_if_stale(self, catalog_fingerprint: str) -> None:
+        if self._index_fingerprint != catalog_fingerprint:
+            self._index.clear()
+            self._document_frequency.clear()
+            self._index_fingerprint = catalog_fingerprint
+
+    def _add(self, key: str, terms: Counter, catalog_fingerprint: str) -> None:
+        if not terms:
+            return
+        with self._lock:
+            self._reset_if_stale(catalog_fingerprint)
+            if key in self._index:
+                self._index.move_to_end(key)
+                return
+            self._index[key] = terms
+            self._document_frequency.update(terms.keys())
+            while len(self._index) > self.max_entries:
+                _, evicted = self._index.popitem(last=False)
+                self._document_frequency.subtract(evicted.keys())
+            self._document_frequency += Counter()  # Drop zero counts
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            terms = self._index.pop(key, None)
+            if terms is not None:
+                self._document_frequency.subtract(terms.keys())
+                self._document_frequency += Counter()
+
+    def _weights(self, terms: Counter, documents: int) -> Dict[str, float]:
+        # Smoothed IDF (always > 0, so a single indexed problem still matches itself)
+        return {
+            term: count * (math.log((1 + documents) / (1 + self._document_frequency[term])) + 1)
+            for term, count in terms.items()
+        }
+
+    def _nearest(self, tokens: List[str], catalog_fingerprint: str) -> Tuple[Optional[str], float]:
+        """Most similar indexed problem if its cosine similarity reaches the threshold"""
+        if not tokens:
+            return None, 0.0
+        with self._lock:
+            self._reset_if_stale(catalog_fingerprint)
+            documents = len(self._index)
+            query = self._weights(Counter(tokens), documents)
+            query_norm = math.sqrt(sum(weight * weight for weight in query.values()))
+
+            best_key, best_similarity = None, 0.0
+            for key, terms in self._index.items():
+                if not any(term in query for term in terms):
+                    continue
+                weights = self._weights(terms, documents)
+                dot = sum(weight * weights.get(term, 0.0) for term, weight in query.items())
+                norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+                similarity = dot / (query_norm * norm)
+                if similarity > best_similarity:
+                    best_key, best_similarity = key, similarity
+
+        if best_key is not None and best_similarity >= self.threshold:
+            return best_key, best_similarity
+        return None, best_similarity
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.similar_hits) / lookups, 3) if lookups else 0.0,
+            "indexed_problems": len(self._index),
+            "similarity_threshold": self.threshold if self.similarity_enabled else None,
+        }
+
+
+# Global instance
+recommendation_cache = RecommendationCache()
+
+
+__all__ = [
+    "RecommendationCache",
+    "recommendation_cache",
+    "normalize_problem",
+    "tokenize",
+]
@@ -3,10 +3,12 @@ Seed marketing legends with their cognitive clones
 """
 from models import ExpertCreate, ExpertType, CategoryType
 from storage import MemStorage
-from prompts.legends import LEGENDS_PROMPTS
 
 async def seed_legends(storage: MemStorage):
     """Seed the 18 marketing & growth experts as high-fidelity cognitive clones"""
+    # Imported lazily: prompts/legends.py is a very large module of prompt
+    # constants that the API server does not need unless seeding runs
+    from prompts.legends import LEGENDS_PROMPTS
     
     legends_data = [
         # MARKETING CATEGORY (Traditional marketing strategy)
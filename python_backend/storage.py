@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Literal, Optional, Any, Tuple
 from datetime import datetime
 import uuid
 from models import (
@@ -10,6 +10,8 @@ import os
 import json
 from datetime import datetime as dt
 import asyncpg
+from db_pool import db_pool, ScopedPool
+from persona_context import persona_context_cache
 
 def _parse_timestamp(value):
     """Parse timestamp from database - handles both datetime objects and ISO format strings"""
@@ -35,40 +37,116 @@ def _safe_json_parse(value, default=None):
             return default
     return default
 
+# Column projections for user_personas reads. The JSONB modules (YouTube research,
+# video insights, copy examples...) can add up to megabytes per row, so callers
+# pick the smallest view they need; only "full" selects every column.
+PersonaView = Literal["summary", "context", "full"]
+
+PERSONA_SUMMARY_COLUMNS = (
+    "id", "user_id", "company_name", "industry", "company_size", "target_audience",
+    "main_products", "budget_range", "primary_goal", "main_challenge", "timeline",
+    "research_mode", "enrichment_level", "enrichment_status", "research_completeness",
+    "last_enriched_at", "created_at", "updated_at",
+)
+
+# Everything persona_context.build_enriched_persona_context() reads
+PERSONA_CONTEXT_COLUMNS = PERSONA_SUMMARY_COLUMNS + (
+    "pain_points", "goals", "psychographic_core", "buyer_journey",
+    "strategic_insights", "jobs_to_be_done",
+)
+
+_PERSONA_VIEW_COLUMNS = {
+    "summary": ", ".join(PERSONA_SUMMARY_COLUMNS),
+    "context": ", ".join(PERSONA_CONTEXT_COLUMNS),
+    "full": "*",
+}
+
+def _persona_columns(view: PersonaView) -> str:
+    """SELECT list for a persona view"""
+    try:
+        return _PERSONA_VIEW_COLUMNS[view]
+    except KeyError:
+        raise ValueError(f"Unknown persona view: {view}")
+
+def user_persona_from_row(row) -> UserPersona:
+    """
+    Build a UserPersona from a `user_personas` row (parses the JSONB modules).
+    Columns left out of a projected row get the model defaults.
+    """
+    return UserPersona(
+        id=str(row["id"]),
+        userId=row["user_id"],
+        companyName=row.get("company_name") or "",
+        industry=row.get("industry") or "",
+        companySize=row.get("company_size") or "",
+        targetAudience=row.get("target_audience") or "",
+        mainProducts=row.get("main_products") or "",
+        channels=_safe_json_parse(row.get("channels"), []),
+        budgetRange=row.get("budget_range") or "",
+        primaryGoal=row.get("primary_goal") or "",
+        mainChallenge=row.get("main_challenge") or "",
+        timeline=row.get("timeline") or "",
+        demographics=_safe_json_parse(row.get("demographics"), {}),
+        psychographics=_safe_json_parse(row.get("psychographics"), {}),
+        painPoints=_safe_json_parse(row.get("pain_points"), []),
+        goals=_safe_json_parse(row.get("goals"), []),
+        values=_safe_json_parse(row.get("values"), []),
+        communities=_safe_json_parse(row.get("communities"), []),
+        behavioralPatterns=_safe_json_parse(row.get("behavioral_patterns"), {}),
+        contentPreferences=_safe_json_parse(row.get("content_preferences"), {}),
+        youtubeResearch=_safe_json_parse(row.get("youtube_research"), []),
+        videoInsights=_safe_json_parse(row.get("video_insights"), []),
+        campaignReferences=_safe_json_parse(row.get("campaign_references"), []),
+        inspirationVideos=_safe_json_parse(row.get("inspiration_videos"), []),
+        researchMode=row.get("research_mode") or "quick",
+        enrichmentLevel=row.get("enrichment_level") or "quick",
+        enrichmentStatus=row.get("enrichment_status") or "pending",
+        researchCompleteness=row.get("research_completeness") or 0,
+        lastEnrichedAt=_parse_timestamp(row.get("last_enriched_at")),
+        # 8-Module Deep Persona System
+        psychographicCore=_safe_json_parse(row.get("psychographic_core")),
+        buyerJourney=_safe_json_parse(row.get("buyer_journey")),
+        behavioralProfile=_safe_json_parse(row.get("behavioral_profile")),
+        languageCommunication=_safe_json_parse(row.get("language_communication")),
+        strategicInsights=_safe_json_parse(row.get("strategic_insights")),
+        jobsToBeDone=_safe_json_parse(row.get("jobs_to_be_done")),
+        decisionProfile=_safe_json_parse(row.get("decision_profile")),
+        copyExamples=_safe_json_parse(row.get("copy_examples")),
+        createdAt=_parse_timestamp(row["created_at"]),
+        updatedAt=_parse_timestamp(row["updated_at"])
+    )
+
 class PostgresStorage:
     """
     PostgreSQL-backed storage for persistent data.
-    Uses asyncpg connection pool for high-performance async operations.
+    Shares the application-wide asyncpg pool (db_pool) under the "storage" subsystem.
     """
     
     def __init__(self):
-        self.pool: Optional[asyncpg.Pool] = None
+        self.pool: Optional[ScopedPool] = None
         self._initialized = False
+        # False once conversations turns out to lack the history summary columns
+        # (add_conversation_summary.sql not applied); rechecked on restart
+        self.summary_supported = True
     
     async def initialize(self):
-        """Initialize database connection pool"""
+        """Attach to the shared database connection pool"""
         if self._initialized:
             return
         
-        database_url = os.getenv("DATABASE_URL")
-        if not database_url:
-            raise RuntimeError("DATABASE_URL environment variable not set")
+        if db_pool.pool is None:
+            await db_pool.initialize()
         
-        self.pool = await asyncpg.create_pool(
-            database_url,
-            min_size=2,
-            max_size=10,
-            command_timeout=60,
-            statement_cache_size=0  # Disable prepared statement cache to avoid schema change issues
-        )
+        self.pool = db_pool.scoped("storage")
         self._initialized = True
-        print("[PostgresStorage] Connection pool initialized")
+        print("[PostgresStorage] Attached to shared connection pool")
     
     async def close(self):
-        """Close database connection pool"""
+        """Detach from the shared pool (db_pool owns the pool lifecycle)"""
         if self.pool:
-            await self.pool.close()
-            print("[PostgresStorage] Connection pool closed")
+            self.pool = None
+            self._initialized = False
+            print("[PostgresStorage] Detached from shared connection pool")
     
     # Expert operations
     async def create_expert(self, data: ExpertCreate) -> Expert:
@@ -306,6 +384,52 @@ class PostgresStorage:
                 for row in rows
             ]
     
+    async def get_user_conversation_summaries(
+        self,
+        user_id: str,
+        limit: int = 50,
+        before_updated_at: Optional[datetime] = None,
+        before_id: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Get a page of a user's conversations with message count, last message
+        preview and (for custom experts) expert metadata in a single query.
+        
+        Keyset pagination on ("updatedAt", id): pass the values of the last row
+        of the previous page as before_updated_at/before_id.
+        """
+        if not self.pool:
+            raise RuntimeError("PostgresStorage not initialized")
+        
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT c.id, c."expertId", c.title, c."userId", c."createdAt", c."updatedAt",
+                       stats.message_count AS "messageCount",
+                       last_msg.preview AS "lastMessage",
+                       e.name AS "expertName", e.avatar AS "expertAvatar",
+                       e.category AS "expertCategory"
+                FROM conversations c
+                LEFT JOIN LATERAL (
+                    SELECT COUNT(*) AS message_count
+                    FROM messages m
+                    WHERE m."conversationId" = c.id
+                ) stats ON TRUE
+                LEFT JOIN LATERAL (
+                    SELECT LEFT(m.content, 100) AS preview
+                    FROM messages m
+                    WHERE m."conversationId" = c.id
+                    ORDER BY m."createdAt" DESC
+                    LIMIT 1
+                ) last_msg ON TRUE
+                LEFT JOIN experts e ON e.id = c."expertId"
+                WHERE c."userId" = $1
+                  AND ($3::timestamp IS NULL OR (c."updatedAt", c.id) < ($3::timestamp, $4::varchar))
+                ORDER BY c."updatedAt" DESC, c.id DESC
+                LIMIT $2
+            """, user_id, limit, before_updated_at, before_id or "")
+            
+            return [dict(row) for row in rows]
+    
     async def update_conversation_timestamp(self, conversation_id: str):
         """Update conversation's updated_at timestamp"""
         async with self.pool.acquire() as conn:
@@ -322,6 +446,54 @@ class PostgresStorage:
             """, conversation_id)
             return row['userId'] if row else None
     
+    async def get_conversation_summary(self, conversation_id: str) -> tuple:
+        """
+        Get (historySummary, summarizedUntil) for a conversation.
+        Returns (None, None) and clears summary_supported if the
+        add_conversation_summary.sql migration has not been applied yet, so chat
+        keeps working without a summary.
+        """
+        async with self.pool.acquire() as conn:
+            try:
+                row = await conn.fetchrow("""
+                    SELECT "historySummary", "summarizedUntil"
+                    FROM conversations WHERE id = $1
+                """, conversation_id)
+            except asyncpg.exceptions.UndefinedColumnError:
+                self._disable_conversation_summary()
+                return None, None
+            if not row:
+                return None, None
+            return row['historySummary'], row['summarizedUntil']
+    
+    def _disable_conversation_summary(self):
+        if self.summary_supported:
+            print("[STORAGE] ⚠️ conversations.historySummary missing - apply migration add_conversation_summary.sql")
+        self.summary_supported = False
+    
+    async def update_conversation_summary(
+        self,
+        conversation_id: str,
+        summary: str,
+        summarized_until: datetime
+    ) -> bool:
+        """
+        Store the rolling history summary. Only moves forward: an update that
+        covers fewer messages than the stored summary is ignored.
+        """
+        async with self.pool.acquire() as conn:
+            try:
+                result = await conn.execute("""
+                    UPDATE conversations
+                    SET "historySummary" = $2, "summarizedUntil" = $3
+                    WHERE id = $1
+                      AND ("summarizedUntil" IS NULL OR "summarizedUntil" < $3)
+                """, conversation_id, summary, summarized_until)
+            except asyncpg.exceptions.UndefinedColumnError:
+                self._disable_conversation_summary()
+                return False
+            return result.split()[-1] != "0"
+    
     async def delete_conversation(self, conversation_id: str) -> bool:
         """Delete a conversation and all its messages"""
         async with self.pool.acquire() as conn:
@@ -379,8 +551,11 @@ class PostgresStorage:
                 RETURNING id, "conversationId", role, content, "createdAt"
             """, message_id, data.conversationId, data.role, data.content, now)
             
-            # Update conversation timestamp
-            await self.update_conversation_timestamp(data.conversationId)
+            # Update conversation timestamp (same connection - avoids a nested acquire)
+            await conn.execute("""
+                UPDATE conversations SET "updatedAt" = NOW()
+                WHERE id = $1
+            """, data.conversationId)
             
             return Message(
                 id=row['id'],
@@ -410,6 +585,38 @@ class PostgresStorage:
                 for row in rows
             ]
     
+    async def get_recent_messages(
+        self,
+        conversation_id: str,
+        limit: int,
+        after_created_at: Optional[datetime] = None
+    ) -> List[Message]:
+        """
+        Get the newest `limit` messages of a conversation, oldest first.
+        Messages created at or before `after_created_at` (already covered by the
+        rolling summary) are skipped.
+        """
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT id, "conversationId", role, content, "createdAt"
+                FROM messages
+                WHERE "conversationId" = $1
+                  AND ($3::timestamp IS NULL OR "createdAt" > $3::timestamp)
+                ORDER BY "createdAt" DESC
+                LIMIT $2
+            """, conversation_id, limit, after_created_at)
+            
+            return [
+                Message(
+                    id=row['id'],
+                    conversationId=row['conversationId'],
+                    role=row['role'],
+                    content=row['content'],
+                    createdAt=row['createdAt']
+                )
+                for row in reversed(rows)
+            ]
+    
     # Business Profile operations (keep using in-memory for now - can migrate later)
     async def save_business_profile(self, user_id: str, data: BusinessProfileCreate) -> BusinessProfile:
         """Create or update business profile - TODO: migrate to PostgreSQL"""
@@ -439,52 +646,66 @@ class PostgresStorage:
     
     # Council Analysis operations (PostgreSQL implementation)
     async def save_council_analysis(self, analysis: CouncilAnalysis) -> CouncilAnalysis:
-        """Save council analysis to PostgreSQL"""
+        """
+        Save council analysis to PostgreSQL.
+        
+        Runs in one transaction, so an analysis is never stored with a partial set
+        of contributions: one statement upserts the analysis and clears old
+        contributions, then every contribution is inserted with a single
+        pipelined executemany.
+        """
         if not self.pool:
             raise RuntimeError("PostgresStorage not initialized")
         
         print(f"[SAVE COUNCIL] Saving analysis {analysis.id} for user {analysis.userId}")
         
-        async with self.pool.acquire() as conn:
-            # Save main analysis
-            await conn.execute("""
-                INSERT INTO council_analyses 
-                ("id", "user_id", "problem", "profile_id", "market_research", "consensus", "citations", "created_at")
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                ON CONFLICT ("id") DO UPDATE SET
-                    "problem" = EXCLUDED."problem",
-                    "consensus" = EXCLUDED."consensus",
-                    "market_research" = EXCLUDED."market_research"
-            """, 
+        contributions = [
+            (
                 analysis.id,
-                analysis.userId,
-                analysis.problem,
-                analysis.profileId,
-                analysis.marketResearch,
-                analysis.consensus,
-                analysis.citations,
-                analysis.createdAt
+                contrib.expertId,
+                contrib.expertName,
+                contrib.analysis,
+                contrib.keyInsights,
+                contrib.recommendations
             )
-            
-            # Delete old contributions for this analysis (in case of update)
-            await conn.execute("""
-                DELETE FROM council_contributions WHERE "analysis_id" = $1
-            """, analysis.id)
-            
-            # Save contributions
-            for contrib in analysis.contributions:
+            for contrib in analysis.contributions
+        ]
+        
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                # Save main analysis and delete old contributions (in case of update)
                 await conn.execute("""
-                    INSERT INTO council_contributions
-                    ("analysis_id", "expert_id", "expert_name", "analysis", "key_insights", "recommendations")
-                    VALUES ($1, $2, $3, $4, $5, $6)
-                """,
+                    WITH saved AS (
+                        INSERT INTO council_analyses 
+                        ("id", "user_id", "problem", "profile_id", "market_research", "consensus", "citations", "created_at")
+                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                        ON CONFLICT ("id") DO UPDATE SET
+                            "problem" = EXCLUDED."problem",
+                            "consensus" = EXCLUDED."consensus",
+                            "market_research" = EXCLUDED."market_research"
+                        RETURNING "id"
+                    )
+                    DELETE FROM council_contributions
+                    WHERE "analysis_id" = (SELECT "id" FROM saved)
+                """, 
                     analysis.id,
-                    contrib.expertId,
-                    contrib.expertName,
-                    contrib.analysis,
-                    contrib.keyInsights,
-                    contrib.recommendations
+                    analysis.userId,
+                    analysis.problem,
+                    analysis.profileId,
+                    analysis.marketResearch,
+                    analysis.consensus,
+                    analysis.citations,
+                    analysis.createdAt
                 )
+                
+                # Save contributions (clock_timestamp(): now() is fixed for the whole
+                # transaction, and reads order contributions by contributed_at)
+                if contributions:
+                    await conn.executemany("""
+                        INSERT INTO council_contributions
+                        ("analysis_id", "expert_id", "expert_name", "analysis", "key_insights", "recommendations", "contributed_at")
+                        VALUES ($1, $2, $3, $4, $5, $6, clock_timestamp())
+                    """, contributions)
             
             print(f"[SAVE COUNCIL] ✅ Saved analysis with {len(analysis.contributions)} contributions")
             return analysis
@@ -543,8 +764,23 @@ class PostgresStorage:
             print(f"[GET COUNCIL] ✅ Loaded analysis with {len(contributions)} contributions")
             return result
     
-    async def get_council_analyses(self, user_id: str) -> List[CouncilAnalysis]:
-        """Get all council analyses for a user"""
+    async def get_council_analyses(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        before_created_at: Optional[datetime] = None,
+        before_id: Optional[str] = None,
+        include_analysis_text: bool = True,
+    ) -> List[CouncilAnalysis]:
+        """
+        Get a user's council analyses (newest first) with their contributions
+        in a single query (contributions aggregated with json_agg).
+        
+        Keyset pagination on ("created_at", id): pass the values of the last
+        analysis of the previous page as before_created_at/before_id. With
+        include_analysis_text=False each contribution's full `analysis` text is
+        left out (empty string) - enough for list views.
+        """
         if not self.pool:
             raise RuntimeError("PostgresStorage not initialized")
         
@@ -552,16 +788,51 @@ class PostgresStorage:
         
         async with self.pool.acquire() as conn:
             rows = await conn.fetch("""
-                SELECT "id" FROM council_analyses 
-                WHERE "user_id" = $1
-                ORDER BY "created_at" DESC
-            """, user_id)
+                SELECT a."id", a."user_id", a."problem", a."profile_id", a."market_research",
+                       a."consensus", a."citations", a."created_at",
+                       contribs.items AS contributions
+                FROM council_analyses a
+                LEFT JOIN LATERAL (
+                    SELECT json_agg(json_build_object(
+                        'expertId', c."expert_id",
+                        'expertName', c."expert_name",
+                        'analysis', CASE WHEN $5 THEN c."analysis" ELSE '' END,
+                        'keyInsights', c."key_insights",
+                        'recommendations', c."recommendations"
+                    ) ORDER BY c."contributed_at" ASC) AS items
+                    FROM council_contributions c
+                    WHERE c."analysis_id" = a."id"
+                ) contribs ON TRUE
+                WHERE a."user_id" = $1
+                  AND ($3::timestamp IS NULL OR (a."created_at", a."id") < ($3::timestamp, $4::varchar))
+                ORDER BY a."created_at" DESC, a."id" DESC
+                LIMIT $2::int
+            """, user_id, limit, before_created_at, before_id or "", include_analysis_text)
             
+            from models import AgentContribution
             analyses = []
             for row in rows:
-                analysis = await self.get_council_analysis(row['id'])
-                if analysis:
-                    analyses.append(analysis)
+                contributions = [
+                    AgentContribution(
+                        expertId=c['expertId'],
+                        expertName=c['expertName'],
+                        analysis=c['analysis'] or "",
+                        keyInsights=c['keyInsights'] or [],
+                        recommendations=c['recommendations'] or []
+                    )
+                    for c in _safe_json_parse(row['contributions'], [])
+                ]
+                analyses.append(CouncilAnalysis(
+                    id=row['id'],
+                    userId=row['user_id'],
+                    problem=row['problem'],
+                    profileId=row['profile_id'],
+                    marketResearch=row['market_research'],
+                    contributions=contributions,
+                    consensus=row['consensus'],
+                    citations=list(row['citations']) if row['citations'] else [],
+                    createdAt=row['created_at']
+                ))
             
             print(f"[LIST COUNCIL] ✅ Loaded {len(analyses)} analyses")
             return analyses
@@ -748,6 +1019,7 @@ class PostgresStorage:
             result = await conn.execute("""
                 DELETE FROM user_personas WHERE id = $1
             """, persona_id)
+            persona_context_cache.invalidate(persona_id)
             
             return result == "DELETE 1"
     
@@ -866,117 +1138,58 @@ class PostgresStorage:
                 updatedAt=_parse_timestamp(row["updated_at"])
             )
     
-    async def get_user_persona(self, user_id: str) -> Optional[UserPersona]:
-        """Get the user persona for a specific user"""
+    async def get_user_persona(self, user_id: str, view: PersonaView = "full") -> Optional[UserPersona]:
+        """
+        Get the user persona for a specific user.
+        
+        Args:
+            view: "summary" (identity + enrichment status), "context" (what the
+                persona context renders) or "full" (every JSONB module)
+        """
         if not self.pool:
             raise RuntimeError("PostgresStorage not initialized")
         
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow(
-                "SELECT * FROM user_personas WHERE user_id = $1 ORDER BY created_at DESC LIMIT 1",
+                f"SELECT {_persona_columns(view)} FROM user_personas WHERE user_id = $1 ORDER BY created_at DESC LIMIT 1",
                 user_id
             )
             if not row:
                 return None
             
-            return UserPersona(
-                id=str(row["id"]),
-                userId=row["user_id"],
-                companyName=row.get("company_name") or "",
-                industry=row.get("industry") or "",
-                companySize=row.get("company_size") or "",
-                targetAudience=row.get("target_audience") or "",
-                mainProducts=row.get("main_products") or "",
-                channels=_safe_json_parse(row.get("channels"), []),
-                budgetRange=row.get("budget_range") or "",
-                primaryGoal=row.get("primary_goal") or "",
-                mainChallenge=row.get("main_challenge") or "",
-                timeline=row.get("timeline") or "",
-                demographics=_safe_json_parse(row.get("demographics"), {}),
-                psychographics=_safe_json_parse(row.get("psychographics"), {}),
-                painPoints=_safe_json_parse(row.get("pain_points"), []),
-                goals=_safe_json_parse(row.get("goals"), []),
-                values=_safe_json_parse(row.get("values"), []),
-                communities=_safe_json_parse(row.get("communities"), []),
-                behavioralPatterns=_safe_json_parse(row.get("behavioral_patterns"), {}),
-                contentPreferences=_safe_json_parse(row.get("content_preferences"), {}),
-                youtubeResearch=_safe_json_parse(row.get("youtube_research"), []),
-                videoInsights=_safe_json_parse(row.get("video_insights"), []),
-                campaignReferences=_safe_json_parse(row.get("campaign_references"), []),
-                inspirationVideos=_safe_json_parse(row.get("inspiration_videos"), []),
-                researchMode=row.get("research_mode") or "quick",
-                enrichmentLevel=row.get("enrichment_level") or "quick",
-                enrichmentStatus=row.get("enrichment_status") or "pending",
-                researchCompleteness=row.get("research_completeness") or 0,
-                lastEnrichedAt=_parse_timestamp(row.get("last_enriched_at")),
-                # 8-Module Deep Persona System
-                psychographicCore=_safe_json_parse(row.get("psychographic_core")),
-                buyerJourney=_safe_json_parse(row.get("buyer_journey")),
-                behavioralProfile=_safe_json_parse(row.get("behavioral_profile")),
-                languageCommunication=_safe_json_parse(row.get("language_communication")),
-                strategicInsights=_safe_json_parse(row.get("strategic_insights")),
-                jobsToBeDone=_safe_json_parse(row.get("jobs_to_be_done")),
-                decisionProfile=_safe_json_parse(row.get("decision_profile")),
-                copyExamples=_safe_json_parse(row.get("copy_examples")),
-                createdAt=_parse_timestamp(row["created_at"]),
-                updatedAt=_parse_timestamp(row["updated_at"])
+            return user_persona_from_row(row)
+    
+    async def get_user_persona_version(self, user_id: str) -> Optional[Tuple[str, datetime]]:
+        """
+        (id, updatedAt) of the persona get_user_persona() would return, without
+        loading or parsing its JSONB modules (persona context cache key)
+        """
+        if not self.pool:
+            raise RuntimeError("PostgresStorage not initialized")
+        
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT id, updated_at FROM user_personas WHERE user_id = $1 ORDER BY created_at DESC LIMIT 1",
+                user_id
             )
+            if not row:
+                return None
+            return str(row["id"]), _parse_timestamp(row["updated_at"])
     
-    async def get_user_persona_by_id(self, persona_id: str) -> Optional[UserPersona]:
-        """Get a specific user persona by ID"""
+    async def get_user_persona_by_id(self, persona_id: str, view: PersonaView = "full") -> Optional[UserPersona]:
+        """Get a specific user persona by ID (view: see get_user_persona)"""
         if not self.pool:
             raise RuntimeError("PostgresStorage not initialized")
         
         async with self.pool.acquire() as conn:
             row = await conn.fetchrow(
-                "SELECT * FROM user_personas WHERE id = $1",
+                f"SELECT {_persona_columns(view)} FROM user_personas WHERE id = $1",
                 persona_id
             )
             if not row:
                 return None
             
-            return UserPersona(
-                id=str(row["id"]),
-                userId=row["user_id"],
-                companyName=row.get("company_name") or "",
-                industry=row.get("industry") or "",
-                companySize=row.get("company_size") or "",
-                targetAudience=row.get("target_audience") or "",
-                mainProducts=row.get("main_products") or "",
-                channels=_safe_json_parse(row.get("channels"), []),
-                budgetRange=row.get("budget_range") or "",
-                primaryGoal=row.get("primary_goal") or "",
-                mainChallenge=row.get("main_challenge") or "",
-                timeline=row.get("timeline") or "",
-                demographics=_safe_json_parse(row.get("demographics"), {}),
-                psychographics=_safe_json_parse(row.get("psychographics"), {}),
-                painPoints=_safe_json_parse(row.get("pain_points"), []),
-                goals=_safe_json_parse(row.get("goals"), []),
-                values=_safe_json_parse(row.get("values"), []),
-                communities=_safe_json_parse(row.get("communities"), []),
-                behavioralPatterns=_safe_json_parse(row.get("behavioral_patterns"), {}),
-                contentPreferences=_safe_json_parse(row.get("content_preferences"), {}),
-                youtubeResearch=_safe_json_parse(row.get("youtube_research"), []),
-                videoInsights=_safe_json_parse(row.get("video_insights"), []),
-                campaignReferences=_safe_json_parse(row.get("campaign_references"), []),
-                inspirationVideos=_safe_json_parse(row.get("inspiration_videos"), []),
-                researchMode=row.get("research_mode") or "quick",
-                enrichmentLevel=row.get("enrichment_level") or "quick",
-                enrichmentStatus=row.get("enrichment_status") or "pending",
-                researchCompleteness=row.get("research_completeness") or 0,
-                lastEnrichedAt=_parse_timestamp(row.get("last_enriched_at")),
-                # 8-Module Deep Persona System
-                psychographicCore=_safe_json_parse(row.get("psychographic_core")),
-                buyerJourney=_safe_json_parse(row.get("buyer_journey")),
-                behavioralProfile=_safe_json_parse(row.get("behavioral_profile")),
-                languageCommunication=_safe_json_parse(row.get("language_communication")),
-                strategicInsights=_safe_json_parse(row.get("strategic_insights")),
-                jobsToBeDone=_safe_json_parse(row.get("jobs_to_be_done")),
-                decisionProfile=_safe_json_parse(row.get("decision_profile")),
-                copyExamples=_safe_json_parse(row.get("copy_examples")),
-                createdAt=_parse_timestamp(row["created_at"]),
-                updatedAt=_parse_timestamp(row["updated_at"])
-            )
+            return user_persona_from_row(row)
     
     async def update_user_persona(self, persona_id: str, updates: dict) -> UserPersona:
         """Update a user persona with partial updates"""
@@ -1066,6 +1279,7 @@ class PostgresStorage:
             row = await conn.fetchrow(query, *params)
             if not row:
                 raise ValueError(f"UserPersona with id {persona_id} not found")
+            persona_context_cache.invalidate(persona_id)
             
             return UserPersona(
                 id=str(row["id"]),
@@ -1601,8 +1815,11 @@ class PostgresStorage:
                 for row in rows
             ]
     
-    async def list_user_personas(self, user_id: str) -> List[UserPersona]:
-        """Get all personas for a specific user"""
+    async def list_user_personas(self, user_id: str, view: PersonaView = "summary") -> List[UserPersona]:
+        """
+        Get all personas for a specific user.
+        Defaults to the summary view: the list page shows no JSONB modules.
+        """
         def safe_json_parse(value, default):
             """Safely parse JSON - handles both strings and already-parsed objects from asyncpg"""
             if value is None:
@@ -1614,8 +1831,8 @@ class PostgresStorage:
             return default
         
         async with self.pool.acquire() as conn:
-            rows = await conn.fetch("""
-                SELECT * FROM user_personas 
+            rows = await conn.fetch(f"""
+                SELECT {_persona_columns(view)} FROM user_personas 
                 WHERE user_id = $1 
                 ORDER BY created_at DESC
             """, user_id)
@@ -1685,6 +1902,7 @@ class PostgresStorage:
                 WHERE id = $2
             """, persona_id, user_id)
             
+            persona_context_cache.invalidate(user_id=user_id)
             print(f"[set_active_persona] Update result: '{result}' (type: {type(result)})")
             # asyncpg returns "UPDATE 1" for successful single-row updates
             success = "UPDATE" in str(result) and "1" in str(result)
@@ -1838,11 +2056,29 @@ class MemStorage:
         """Get a specific council analysis"""
         return self.council_analyses.get(analysis_id)
     
-    async def get_council_analyses(self, user_id: str) -> List[CouncilAnalysis]:
-        """Get all council analyses for a user"""
+    async def get_council_analyses(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        before_created_at: Optional[datetime] = None,
+        before_id: Optional[str] = None,
+        include_analysis_text: bool = True,
+    ) -> List[CouncilAnalysis]:
+        """Get council analyses for a user (same paging options as PostgresStorage)"""
         analyses = [a for a in self.council_analyses.values() if a.userId == user_id]
         # Sort by createdAt descending (most recent first)
-        analyses.sort(key=lambda x: x.createdAt, reverse=True)
+        analyses.sort(key=lambda x: (x.createdAt, x.id), reverse=True)
+        if before_created_at is not None:
+            analyses = [a for a in analyses if (a.createdAt, a.id) < (before_created_at, before_id or "")]
+        if limit is not None:
+            analyses = analyses[:limit]
+        if not include_analysis_text:
+            analyses = [
+                a.model_copy(update={"contributions": [
+                    c.model_copy(update={"analysis": ""}) for c in a.contributions
+                ]})
+                for a in analyses
+            ]
         return analyses
     
     # Council Chat Messages operations (PostgreSQL)
@@ -2290,6 +2526,7 @@ class MemStorage:
             row = await conn.fetchrow(query, *params)
             if not row:
                 raise ValueError(f"UserPersona with id {persona_id} not found")
+            persona_context_cache.invalidate(persona_id)
             
             return UserPersona(
                 id=str(row["id"]),
@@ -0,0 +1,142 @@
+"""
+Client-disconnect handling for SSE endpoints.
+
+With ASGI spec 2.4 (uvicorn), Starlette only notices a closed connection when
+the next event is written, so a council or auto-clone stream would keep
+calling Claude/Perplexity for a tab that is already gone. cancel_on_disconnect()
+polls the request while the generator is busy and cancels it, which cancels the
+awaited LLM calls (and any expert tasks they own). LLM call sites wrapped in
+tracked_llm_call() report what was cancelled and an estimate of the output
+tokens that were not generated.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+
+from starlette.requests import Request
+
+from env_validator import get_config_float
+from logger import logger
+
+# Rough token estimate for streamed text already received (~4 chars per token)
+CHARS_PER_TOKEN = 4
+
+
+class CancellationStats:
+    """Process-wide counters of work cancelled because the client went away"""
+
+    def __init__(self):
+        self.cancelled_streams = 0
+        self.cancelled_calls = 0
+        self.saved_output_tokens = 0
+        self.by_stream: Dict[str, int] = {}
+        self.by_call_site: Dict[str, int] = {}
+
+    def record_stream(self, stream: str):
+        self.cancelled_streams += 1
+        self.by_stream[stream] = self.by_stream.get(stream, 0) + 1
+
+    def record_call(self, call_site: str, saved_tokens: int):
+        self.cancelled_calls += 1
+        self.saved_output_tokens += saved_tokens
+        self.by_call_site[call_site] = self.by_call_site.get(call_site, 0) + 1
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "cancelled_streams": self.cancelled_streams,
+            "cancelled_calls": self.cancelled_calls,
+            "saved_output_tokens": self.saved_output_tokens,
+            "by_stream": dict(self.by_stream),
+            "by_call_site": dict(self.by_call_site),
+        }
+
+
+cancellation_stats = CancellationStats()
+
+
+@dataclass
+class TrackedCall:
+    """Handle for an in-flight LLM call; streamed calls report text as it arrives"""
+    call_site: str
+    max_tokens: int = 0
+    output_chars: int = 0
+
+    def add_output(self, text: str):
+        self.output_chars += len(text)
+
+    @property
+    def remaining_tokens(self) -> int:
+        return max(0, self.max_tokens - self.output_chars // CHARS_PER_TOKEN)
+
+
+@asynccontextmanager
+async def tracked_llm_call(call_site: str, max_tokens: int = 0) -> AsyncIterator[TrackedCall]:
+    """
+    Count the wrapped call as cancelled if it is interrupted by cancellation.
+
+    Saved tokens are estimated as the unspent output budget (max_tokens minus
+    text already streamed); calls without a budget (Perplexity) count as 0.
+    """
+    call = TrackedCall(call_site=call_site, max_tokens=max_tokens)
+    try:
+        yield call
+    except asyncio.CancelledError:
+        cancellation_stats.record_call(call_site, call.remaining_tokens)
+        logger.info(
+            "LLM call cancelled",
+            call_site=call_site,
+            saved_output_tokens=call.remaining_tokens,
+        )
+        raise
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    events: AsyncIterator[str],
+    stream: str,
+    poll_interval: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Relay SSE chunks from `events`, cancelling it when the client disconnects.
+
+    Each step of the wrapped generator runs in its own task; while a step is
+    pending the request is polled every `poll_interval` seconds
+    (SSE_DISCONNECT_POLL_INTERVAL, default 1.0). On disconnect the step is
+    cancelled, so the CancelledError lands on whatever LLM call it is awaiting.
+    """
+    interval = poll_interval or get_config_float("SSE_DISCONNECT_POLL_INTERVAL", 1.0)
+    iterator = events.__aiter__()
+    step: Optional[asyncio.Task] = None
+
+    try:
+        while True:
+            if step is None:
+                step = asyncio.ensure_future(iterator.__anext__())
+            done, _ = await asyncio.wait({step}, timeout=interval)
+            if not done:
+                if await request.is_disconnected():
+                    cancellation_stats.record_stream(stream)
+                    logger.info("SSE client disconnected, cancelling stream", stream=stream)
+                    return
+                continue
+
+            try:
+                chunk = step.result()
+            except StopAsyncIteration:
+                return
+            step = None
+            yield chunk
+    finally:
+        if step is not None and not step.done():
+            step.cancel()
+            await asyncio.gather(step, return_exceptions=True)
+        await iterator.aclose()
+
+
+__all__ = [
+    "CancellationStats",
+    "cancellation_stats",
+    "tracked_llm_call",
+    "cancel_on_disconnect",
+]
@@ -0,0 +1,44 @@
+"""
+Tests for Anthropic prompt caching helpers
+"""
+from types import SimpleNamespace
+from anthropic_client import build_cached_system, log_cache_usage
+
+
+def test_static_prompt_is_first_cached_block():
+    blocks = build_cached_system("CLONE PROMPT", ["PERSONA"])
+
+    assert blocks[0] == {
+        "type": "text",
+        "text": "CLONE PROMPT",
+        "cache_control": {"type": "ephemeral"},
+    }
+    assert blocks[1]["text"] == "PERSONA"
+    assert blocks[1]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_empty_dynamic_parts_are_skipped():
+    blocks = build_cached_system("CLONE PROMPT", [None, ""])
+    assert len(blocks) == 1
+
+
+def test_caching_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_PROMPT_CACHE_ENABLED", "false")
+    assert build_cached_system("CLONE", ["PERSONA"]) == "CLONEPERSONA"
+
+
+def test_log_cache_usage_reads_usage_fields():
+    response = SimpleNamespace(usage=SimpleNamespace(
+        input_tokens=12,
+        cache_read_input_tokens=3000,
+        cache_creation_input_tokens=None,
+        output_tokens=400,
+    ))
+    stats = log_cache_usage(response, "test")
+
+    assert stats == {
+        "input_tokens": 12,
+        "cache_read_tokens": 3000,
+        "cache_write_tokens": 0,
+        "output_tokens": 400,
+    }
@@ -0,0 +1,91 @@
+"""
+Tests for the bounded in-memory cache (LRU + TTL)
+"""
+import asyncio
+
+from cache import CacheManager, InMemoryCache, SingleFlight
+
+
+async def test_evicts_least_recently_used_by_entries_and_bytes():
+    cache = InMemoryCache(max_entries=2, max_bytes=10, sweep_interval=60)
+
+    await cache.set("a", "1111", ttl=60)
+    await cache.set("b", "2222", ttl=60)
+    assert await cache.get("a") == "1111"  # "b" is now least recently used
+    await cache.set("c", "3333", ttl=60)
+
+    assert await cache.get("b") is None
+    assert await cache.get("c") == "3333"
+
+    await cache.set("d", "44444444", ttl=60)  # Byte limit: only "d" fits
+    assert await cache.get("a") is None and await cache.get("c") is None
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 3
+
+    await cache.set("huge", "x" * 11, ttl=60)
+    assert await cache.get("huge") is None
+
+
+async def test_background_sweep_drops_expired_entries():
+    cache = InMemoryCache(max_entries=10, max_bytes=1000, sweep_interval=0.01)
+    cache.start_sweeper()
+    await cache.set("short", "v", ttl=0)
+    await cache.set("long", "v", ttl=60)
+
+    await asyncio.sleep(0.05)
+    await cache.close()
+
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["expirations"] == 1
+
+
+async def test_pattern_invalidation_without_redis():
+    manager = CacheManager()
+    await manager.set("council:1", {"a": 1}, 60)
+    await manager.set("council:2", {"a": 2}, 60)
+    await manager.set("persona:1", {"a": 3}, 60)
+
+    await manager.invalidate_pattern("council:*")
+
+    assert await manager.get("council:1") is None
+    assert await manager.get("persona:1") == {"a": 3}
+    assert manager.stats()["hits"] == 1 and manager.stats()["misses"] == 1
+
+
+async def test_concurrent_identical_requests_share_one_computation():
+    manager = CacheManager()
+    calls = 0
+
+    async def expensive():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return {"text": "result"}
+
+    results = await asyncio.gather(*(
+        manager.get_or_compute("enhance:abc", expensive, 60) for _ in range(5)
+    ))
+
+    assert calls == 1
+    assert all(result == {"text": "result"} for result in results)
+    assert await manager.get_or_compute("enhance:abc", expensive, 60) == {"text": "result"}
+    assert calls == 1
+    assert manager.stats()["single_flight"] == {"in_flight": 0, "calls": 1, "coalesced": 4}
+
+
+async def test_single_flight_survives_one_waiter_cancelling():
+    flights = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(0.02)
+        return 42
+
+    first = asyncio.ensure_future(flights.do("k", slow))
+    await started.wait()
+    second = asyncio.ensure_future(flights.do("k", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == 42
@@ -0,0 +1,112 @@
+"""
+Tests for windowed chat history (token budget + rolling summary)
+"""
+from datetime import datetime, timedelta
+
+import chat_history
+from chat_history import ChatHistoryLoader, build_history_window, estimate_tokens, SUMMARY_ACK
+from models import Message
+
+
+def _messages(count: int, size: int = 40):
+    start = datetime(2026, 1, 1)
+    return [
+        Message(
+            id=str(i),
+            conversationId="conv",
+            role="user" if i % 2 == 0 else "assistant",
+            content=f"{i}:" + "x" * size,
+            createdAt=start + timedelta(seconds=i)
+        )
+        for i in range(count)
+    ]
+
+
+def test_window_keeps_newest_messages_within_max():
+    messages = _messages(10)
+    window = build_history_window(messages, None, token_budget=10_000, max_messages=4)
+
+    assert [m["content"] for m in window.history] == [m.content for m in messages[-4:]]
+    assert window.overflow == messages[:6]
+
+
+def test_window_respects_token_budget_and_starts_with_user():
+    messages = _messages(10, size=400)
+    per_message = estimate_tokens(messages[0].content)
+    window = build_history_window(messages, None, token_budget=per_message * 3, max_messages=20)
+
+    # 3 messages fit, but the oldest would be an assistant turn and is dropped
+    assert len(window.history) == 2
+    assert window.history[0]["role"] == "user"
+    assert window.estimated_tokens <= per_message * 3
+    assert len(window.overflow) == 8
+
+
+def test_summary_is_prepended_and_counts_against_budget():
+    messages = _messages(6, size=400)
+    summary = "y" * 800
+    per_message = estimate_tokens(messages[0].content)
+    budget = estimate_tokens(summary) + per_message * 2 + 50
+    window = build_history_window(messages, summary, token_budget=budget, max_messages=20)
+
+    assert window.history[0]["role"] == "user"
+    assert summary in window.history[0]["content"]
+    assert window.history[1] == {"role": "assistant", "content": SUMMARY_ACK}
+    assert [m["content"] for m in window.history[2:]] == [m.content for m in messages[-2:]]
+
+
+def test_empty_conversation():
+    window = build_history_window([], None, token_budget=1000, max_messages=20)
+    assert window.history == []
+    assert window.overflow == []
+
+
+class FakeStorage:
+    """Storage without the conversation summary columns"""
+    def __init__(self, messages):
+        self.messages = messages
+        self.summary_supported = True
+        self.summary_reads = 0
+
+    async def get_conversation_summary(self, conversation_id):
+        # Like PostgresStorage on UndefinedColumnError
+        self.summary_reads += 1
+        self.summary_supported = False
+        return None, None
+
+    async def get_recent_messages(self, conversation_id, limit, after_created_at=None):
+        return self.messages[-limit:]
+
+
+async def test_loader_skips_summary_read_when_disabled(monkeypatch):
+    monkeypatch.setenv("CHAT_HISTORY_SUMMARY_ENABLED", "false")
+    messages = _messages(3)
+    loader = ChatHistoryLoader(FakeStorage(messages))
+
+    window = await loader.load("conv")
+
+    assert loader.storage.summary_reads == 0
+    assert [m["content"] for m in window.history] == [m.content for m in messages]
+
+
+async def test_missing_summary_columns_stop_summary_refreshes(monkeypatch):
+    monkeypatch.setenv("CHAT_HISTORY_SUMMARY_ENABLED", "true")
+    llm_calls = []
+
+    async def generate_text(**kwargs):
+        llm_calls.append(kwargs)
+        return "resumo"
+
+    monkeypatch.setattr(chat_history.llm_router, "generate_text", generate_text)
+    storage = FakeStorage(_messages(10))
+    loader = ChatHistoryLoader(storage)
+    loader.max_messages = 4
+
+    for _ in range(3):
+        window = await loader.load("conv")
+        assert window.overflow
+        assert not loader.needs_summary("conv", window)
+        await loader.refresh_summary("conv", window)
+
+    assert storage.summary_reads == 1
+    assert llm_calls == []
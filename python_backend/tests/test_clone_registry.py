@@ -0,0 +1,136 @@
+"""
+Tests for CloneRegistry id/slug/name resolution, prompt memoization and custom clone refresh
+"""
+import os
+import time
+from pathlib import Path
+
+from clones import CloneRegistry, ExpertCloneBase
+from clones import registry as clones_registry
+
+
+def test_resolves_seed_ids_slugs_and_names():
+    registry = CloneRegistry()
+    clone = registry.get_clone("Al Ries")
+
+    assert registry.expert_id_for("Al Ries") == "seed-al-ries"
+    assert registry.resolve("seed-al-ries") is clone
+    assert registry.resolve("al-ries") is clone
+    assert registry.resolve("AL RIES") is clone
+    assert registry.name_for("seed-claude-hopkins") == "Claude Hopkins"
+    assert registry.resolve("seed-unknown-expert") is None
+
+
+def test_db_expert_alias_resolves_to_clone_by_name():
+    registry = CloneRegistry()
+    registry.register_alias("3f1c-db-id", "seth godin")
+
+    assert registry.resolve("3f1c-db-id") is registry.get_clone("Seth Godin")
+    assert registry.name_for("3f1c-db-id") == "seth godin"
+
+
+def test_system_prompt_is_memoized_per_class_and_version():
+    renders = []
+
+    class TinyClone(ExpertCloneBase):
+        def __init__(self):
+            super().__init__()
+            self.name = "Tiny"
+
+        def get_system_prompt(self):
+            renders.append(self.version)
+            return f"prompt v{self.version}"
+
+    clone = TinyClone()
+    assert clone.get_system_prompt() is TinyClone().get_system_prompt()
+    assert renders == ["1.0"]
+
+    clone.version = "2.0"
+    assert clone.get_system_prompt() == "prompt v2.0"
+
+    CloneRegistry().invalidate_prompts()
+    clone.get_system_prompt()
+    assert renders == ["1.0", "2.0", "2.0"]
+
+
+def test_clones_are_indexed_without_import_and_loaded_on_first_use():
+    registry = CloneRegistry()
+    registry.reload_clones()
+
+    assert "Philip Kotler" in registry.list_clone_names()
+    assert registry._clones == {}
+
+    clone = registry.resolve("seed-philip-kotler")
+    assert clone.name == "Philip Kotler"
+    assert list(registry._clones) == ["Philip Kotler"]
+    assert len(registry.get_all_clones()) == len(registry.list_clone_names())
+
+
+CUSTOM_CLONE_SOURCE = '''
+from clones.base import ExpertCloneBase
+
+
+class HotReloadProbeClone(ExpertCloneBase):
+    def __init__(self):
+        super().__init__()
+        self.name = "Hot Reload Probe"
+        self.title = "{title}"
+        self.positive_triggers = ["{title} trigger"]
+
+    def get_system_prompt(self):
+        return "prompt: " + self.title
+'''
+
+
+def _probe_triggers(registry, message):
+    return registry.match_triggers(message, names=["Hot Reload Probe"])["Hot Reload Probe"]["positive"]
+
+
+def test_refresh_custom_clones_imports_only_changed_files():
+    registry = CloneRegistry()
+    registry.reload_clones()
+    kotler = registry.get_clone("Philip Kotler")
+    path = Path(clones_registry.__file__).parent / "custom" / "hot_reload_probe.py"
+
+    try:
+        path.write_text(CUSTOM_CLONE_SOURCE.format(title="v1"), encoding="utf-8")
+        assert registry.refresh_custom_clones() == {"added": ["Hot Reload Probe"], "updated": [], "removed": []}
+        assert registry.resolve("seed-hot-reload-probe").get_system_prompt() == "prompt: v1"
+        assert _probe_triggers(registry, "com v1 trigger") == ["v1 trigger"]
+        # Seed clones are not re-imported
+        assert registry.get_clone("Philip Kotler") is kotler
+
+        # Same content, new mtime: hash matches, nothing re-executed
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        assert registry.refresh_custom_clones() == {"added": [], "updated": [], "removed": []}
+
+        path.write_text(CUSTOM_CLONE_SOURCE.format(title="v2"), encoding="utf-8")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 2_000_000))
+        assert registry.refresh_custom_clones()["updated"] == ["Hot Reload Probe"]
+        assert registry.get_clone("Hot Reload Probe").get_system_prompt() == "prompt: v2"
+        # The shared trigger matcher is rebuilt for the new instance
+        assert _probe_triggers(registry, "com v1 trigger") == []
+        assert _probe_triggers(registry, "com v2 trigger") == ["v2 trigger"]
+    finally:
+        path.unlink(missing_ok=True)
+
+    assert registry.refresh_custom_clones()["removed"] == ["Hot Reload Probe"]
+    assert registry.resolve("hot-reload-probe") is None
+    assert registry.get_clone("Philip Kotler") is kotler
+
+
+def test_council_trigger_matching_agrees_with_per_clone_checks():
+    registry = CloneRegistry()
+    seth = registry.get_clone("Seth Godin")
+    message = "Quero uma PURPLE COW para minha tribo, nada de spam ou produto genérico"
+
+    shared = registry.match_triggers(message, names=["Seth Godin", "seed-al-ries"])
+
+    assert set(shared) == {"Seth Godin", "Al Ries"}
+    assert shared["Seth Godin"] == seth.get_matched_triggers(message)
+    assert "purple cow" in shared["Seth Godin"]["positive"]
+    assert "genérico" in shared["Seth Godin"]["negative"]
+    # Negative triggers win, in list order ("genérico" is listed before "spam")
+    assert seth.get_trigger_reaction(message) == seth.trigger_reactions["genérico"]
+    assert seth.get_trigger_reaction("chega de spam") == seth.trigger_reactions["spam"]
+    assert seth.get_trigger_reaction("bom dia") is None
@@ -0,0 +1,149 @@
+"""
+Tests for council orchestration modes (parallel fan-out + rebuttal round)
+"""
+import asyncio
+import time
+import pytest
+from crew_council import CouncilOrchestrator, CouncilRunOptions
+from models import AgentContribution, Expert
+
+
+def _experts(count: int):
+    return [
+        Expert(id=f"e{i}", name=f"Expert {i}", title="t", expertise=[], bio="b", systemPrompt="p")
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-test")
+    monkeypatch.setenv("COUNCIL_MAX_CONCURRENCY", "4")
+    council = CouncilOrchestrator()
+    council.semaphore  # Build the client up front so timings only cover the run
+
+    async def fake_analysis(expert, problem, research_findings, profile, user_id="demo_user",
+                            user_context=None, colleague_contributions=None, persona=None):
+        async with council.semaphore:
+            await asyncio.sleep(0.05)
+        if expert.id == "e2":
+            raise RuntimeError("boom")
+        return AgentContribution(
+            expertId=expert.id, expertName=expert.name,
+            analysis=f"analysis {expert.id}", keyInsights=[], recommendations=[]
+        )
+
+    async def fake_consensus(problem, contributions, research_findings):
+        return "consensus"
+
+    monkeypatch.setattr(council, "_get_expert_analysis", fake_analysis)
+    monkeypatch.setattr(council, "_synthesize_consensus", fake_consensus)
+    return council
+
+
+async def _collect(orchestrator, experts, **options):
+    return [
+        event async for event in orchestrator.run(
+            "problem", experts, user_id="u", user_context={},
+            options=CouncilRunOptions(**options)
+        )
+    ]
+
+
+async def test_parallel_run_is_concurrent_and_skips_failures(orchestrator):
+    experts = _experts(4)
+    start = time.perf_counter()
+    events = await _collect(orchestrator, experts, mode="parallel")
+    elapsed = time.perf_counter() - start
+
+    analysis = events[-1].data["analysis"]
+    assert events[0].type == "analysis_started"
+    assert events[-1].type == "analysis_complete"
+    assert [c.expertId for c in analysis.contributions] == ["e0", "e1", "e3"]
+    assert [e.data["expertId"] for e in events if e.type == "expert_failed"] == ["e2"]
+    assert {"experts", "consensus", "total"} <= set(events[-1].data["timings"])
+    assert elapsed < 0.15  # 4 calls of 50ms with concurrency 4
+
+
+async def test_roundtable_run_passes_colleague_contributions(orchestrator, monkeypatch):
+    seen = {}
+    fake_analysis = orchestrator._get_expert_analysis
+
+    async def spy(expert, colleague_contributions=None, **kwargs):
+        seen[expert.id] = [c["expert_name"] for c in colleague_contributions or []]
+        return await fake_analysis(expert, colleague_contributions=colleague_contributions, **kwargs)
+
+    monkeypatch.setattr(orchestrator, "_get_expert_analysis", spy)
+    events = await _collect(orchestrator, _experts(2), mode="roundtable")
+
+    assert seen == {"e0": [], "e1": ["Expert 0"]}
+    assert [e.type for e in events] == [
+        "analysis_started",
+        "expert_started", "expert_completed",
+        "expert_started", "expert_completed",
+        "consensus_started", "analysis_complete",
+    ]
+
+
+async def test_run_emits_error_when_all_experts_fail(orchestrator):
+    events = await _collect(orchestrator, [_experts(3)[2]], mode="roundtable")
+    assert events[-1].type == "error"
+
+
+async def test_rebuttal_round_appends_and_tolerates_failures(orchestrator, monkeypatch):
+    experts = _experts(3)
+    contributions = [
+        AgentContribution(expertId=e.id, expertName=e.name, analysis=f"a{e.id}",
+                          keyInsights=[], recommendations=[])
+        for e in experts
+    ]
+    seen = {}
+
+    async def fake_rebuttal(expert, problem, others, user_id="demo_user"):
+        seen[expert.id] = [o.expertId for o in others]
+        if expert.id == "e1":
+            raise RuntimeError("timeout")
+        return f"reply {expert.id}"
+
+    monkeypatch.setattr(orchestrator, "_get_expert_rebuttal", fake_rebuttal)
+    result = await orchestrator._run_rebuttal_round(experts, "problem", contributions, "u")
+
+    assert seen["e0"] == ["e1", "e2"]
+    assert result[0].analysis.endswith("reply e0")
+    assert result[1].analysis == "ae1"
+
+
+async def test_stalled_expert_stream_fails_after_the_call_timeout(orchestrator, monkeypatch):
+    import crew_council
+
+    class StalledStream:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        @property
+        async def text_stream(self):
+            yield "partial"
+            await asyncio.sleep(10)
+
+    class FakeMessages:
+        def stream(self, **kwargs):
+            return StalledStream()
+
+    monkeypatch.setattr(crew_council, "LLM_CALL_TIMEOUT", 0.05)
+    monkeypatch.setattr(orchestrator, "_anthropic_client", type("Client", (), {"messages": FakeMessages()})())
+    monkeypatch.setattr(orchestrator, "_build_expert_prompt", lambda **kwargs: ("system", "message"))
+
+    events = [
+        event async for event in orchestrator._expert_events(
+            _experts(1)[0], 0, stream=True, expert_context={
+                "problem": "p", "research_findings": None, "profile": None, "user_id": "u"
+            }
+        )
+    ]
+
+    assert [e.type for e in events] == ["expert_started", "expert_delta", "expert_failed"]
+    assert "timed out" in events[-1].data["error"]
+    assert orchestrator.semaphore._value == 4  # Slot released
@@ -0,0 +1,135 @@
+"""
+Tests for the shared database pool (subsystem budgets and metrics)
+"""
+import asyncio
+import asyncpg
+import pytest
+from db_pool import DatabasePool, StatementCacheConnection
+
+
+class FakePool:
+    """Minimal stand-in for asyncpg.Pool"""
+    def __init__(self, size: int = 10):
+        self._size = size
+        self._idle = size
+
+    async def acquire(self, timeout=None):
+        self._idle -= 1
+        return object()
+
+    async def release(self, conn):
+        self._idle += 1
+
+    def get_size(self):
+        return self._size
+
+    def get_min_size(self):
+        return 1
+
+    def get_max_size(self):
+        return self._size
+
+    def get_idle_size(self):
+        return self._idle
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    db = DatabasePool()
+    monkeypatch.setattr(db, "_pool", FakePool())
+    monkeypatch.setattr(db, "_subsystems", {})
+    monkeypatch.setattr(db, "_acquire_timeout", 0.2)
+    return db
+
+
+@pytest.mark.asyncio
+async def test_acquire_records_subsystem_stats(pool):
+    async with pool.acquire("storage"):
+        stats = await pool.get_pool_stats()
+        assert stats["subsystems"]["storage"]["in_use"] == 1
+
+    stats = await pool.get_pool_stats()
+    storage_stats = stats["subsystems"]["storage"]
+    assert storage_stats["acquisitions"] == 1
+    assert storage_stats["in_use"] == 0
+    assert storage_stats["peak_in_use"] == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_limits_concurrent_acquisitions(pool, monkeypatch):
+    monkeypatch.setenv("DB_POOL_BUDGET_REPORTS", "1")
+
+    async with pool.acquire("reports"):
+        with pytest.raises(asyncio.TimeoutError):
+            async with pool.acquire("reports"):
+                pass
+
+    stats = (await pool.get_pool_stats())["subsystems"]["reports"]
+    assert stats["budget"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["errors"] == 0
+    assert stats["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_in_caller_block_are_not_pool_errors(pool):
+    with pytest.raises(asyncpg.exceptions.UniqueViolationError):
+        async with pool.acquire("storage"):
+            raise asyncpg.exceptions.UniqueViolationError("duplicate key value")
+
+    stats = (await pool.get_pool_stats())["subsystems"]["storage"]
+    assert stats["errors"] == 0
+    assert stats["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_scoped_pool_uses_subsystem(pool):
+    scoped = pool.scoped("analytics")
+    async with scoped.acquire():
+        pass
+
+    stats = (await pool.get_pool_stats())["subsystems"]
+    assert stats["analytics"]["acquisitions"] == 1
+
+
+class FlakyConnection:
+    """Connection whose first fetch fails with a stale cached statement"""
+    def __init__(self, in_transaction: bool = False):
+        self.calls = 0
+        self.resets = 0
+        self._in_transaction = in_transaction
+
+    async def fetch(self, query, *args):
+        self.calls += 1
+        if self.calls == 1:
+            raise asyncpg.exceptions.InvalidCachedStatementError("cached statement plan is invalid")
+        return ["row"]
+
+    def is_in_transaction(self):
+        return self._in_transaction
+
+    async def reload_schema_state(self):
+        self.resets += 1
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_connection_retries_once(pool, monkeypatch):
+    monkeypatch.setattr(pool, "_statement_cache_resets", 0)
+    raw = FlakyConnection()
+    conn = StatementCacheConnection(raw, pool)
+
+    assert await conn.fetch("SELECT 1") == ["row"]
+    assert raw.calls == 2
+    assert raw.resets == 1
+    assert pool._statement_cache_resets == 1
+
+
+@pytest.mark.asyncio
+async def test_statement_cache_connection_reraises_in_transaction(pool, monkeypatch):
+    monkeypatch.setattr(pool, "_statement_cache_resets", 0)
+    raw = FlakyConnection(in_transaction=True)
+    conn = StatementCacheConnection(raw, pool)
+
+    with pytest.raises(asyncpg.exceptions.InvalidCachedStatementError):
+        await conn.fetch("SELECT 1")
+    assert raw.resets == 1
@@ -0,0 +1,74 @@
+"""
+Tests for the versioned in-process expert catalog
+"""
+from clones import CloneRegistry
+from expert_catalog import ExpertCatalog
+from models import CategoryType, Expert, ExpertType
+
+
+class FakeStorage:
+    def __init__(self, experts):
+        self.experts = experts
+        self.calls = 0
+
+    async def get_experts(self):
+        self.calls += 1
+        return list(self.experts)
+
+
+def _custom(expert_id: str, name: str) -> Expert:
+    return Expert(
+        id=expert_id, name=name, title="t", expertise=[], bio="b",
+        systemPrompt=f"prompt {name}", expertType=ExpertType.CUSTOM
+    )
+
+
+async def test_catalog_is_built_once_and_serves_lookups_without_prompts():
+    storage = FakeStorage([_custom("c1", "Custom One"), _custom("c2", "Seth Godin")])
+    catalog = ExpertCatalog(storage, {"Seth Godin": CategoryType.CONTENT})
+
+    experts = await catalog.get_all()
+    await catalog.get_all()
+
+    assert storage.calls == 1
+    assert all(e.systemPrompt == "" for e in experts)
+    # Seed clone wins the name clash with the DB duplicate
+    seth = await catalog.get_by_name("seth godin")
+    assert seth.id == CloneRegistry.expert_id_for("Seth Godin") == "seed-seth-godin"
+    assert seth.category == CategoryType.CONTENT
+    # The DB duplicate's id resolves to the seed expert through the registry alias
+    assert (await catalog.get_by_id("c2")).id == "seed-seth-godin"
+
+    custom = await catalog.get_by_id("c1", include_system_prompt=True)
+    assert custom.systemPrompt == "prompt Custom One"
+    seed = await catalog.get_by_id("seed-seth-godin", include_system_prompt=True)
+    assert "Seth Godin" in seed.systemPrompt
+    # Prompt copies never leak into the shared list view
+    assert (await catalog.get_by_id("c1")).systemPrompt == ""
+
+
+async def test_invalidate_bumps_version_and_rebuilds():
+    storage = FakeStorage([])
+    catalog = ExpertCatalog(storage, {})
+    await catalog.get_all()
+    version = catalog.version
+
+    storage.experts.append(_custom("c3", "New Expert"))
+    catalog.invalidate(reason="expert created")
+
+    assert catalog.version == version + 1
+    assert (await catalog.get_by_id("c3")).name == "New Expert"
+    assert storage.calls == 2
+
+
+async def test_fingerprint_depends_on_contents_not_version():
+    first = ExpertCatalog(FakeStorage([_custom("c1", "Custom One")]), {})
+    second = ExpertCatalog(FakeStorage([_custom("c1", "Custom One")]), {})
+    second.invalidate(reason="other worker")
+
+    fingerprint = (await first.snapshot()).fingerprint
+    assert fingerprint == (await second.snapshot()).fingerprint
+
+    first.storage.experts.append(_custom("c2", "Custom Two"))
+    first.invalidate(reason="expert created")
+    assert (await first.snapshot()).fingerprint != fingerprint
@@ -0,0 +1,54 @@
+"""
+Tests for the local BM25 expert index (zero-LLM pre-ranking)
+"""
+from expert_catalog import ExpertCatalog
+from expert_index import ExpertIndexCache
+from models import Expert, ExpertType
+from recommendation import ExpertRecommendationEngine
+
+
+class FakeStorage:
+    def __init__(self, experts):
+        self.experts = experts
+
+    async def get_experts(self):
+        return list(self.experts)
+
+
+def _custom(expert_id: str, name: str, expertise, bio: str = "") -> Expert:
+    return Expert(
+        id=expert_id, name=name, title="Consultor", expertise=expertise, bio=bio,
+        systemPrompt="", expertType=ExpertType.CUSTOM
+    )
+
+
+async def test_shortlist_ranks_seed_and_custom_experts_and_follows_catalog_version():
+    storage = FakeStorage([_custom("c1", "Ana SEO", ["SEO técnico", "Tráfego orgânico"], "Blogs e buscas")])
+    catalog = ExpertCatalog(storage, {})
+    indexes = ExpertIndexCache()
+
+    index = await indexes.get(catalog)
+    assert [hit.expert.id for hit in index.search("tráfego orgânico e SEO para o blog", 1)] == ["c1"]
+    hits = index.search("prova social e persuasão", 3)
+    assert hits[0].expert.name == "Robert Cialdini"
+    assert index.search("xyzzy", 3) == []
+    assert await indexes.get(catalog) is index
+
+    storage.experts.append(_custom("c2", "Bruno Pricing", ["Precificação"], "Estratégia de preços"))
+    catalog.invalidate(reason="test")
+    rebuilt = await indexes.get(catalog)
+    assert rebuilt is not index
+    assert rebuilt.search("precificação", 1)[0].expert.id == "c2"
+
+
+def test_engine_scores_unmapped_experts_from_index_relevance():
+    engine = ExpertRecommendationEngine()
+    expert = _custom("c1", "Ana SEO", ["SEO"])
+    profile = type("Profile", (), {
+        "primaryGoal": "growth", "industry": "tech", "mainChallenge": "SEO",
+        "mainProducts": "", "targetAudience": ""
+    })()
+
+    assert engine.calculate_expert_score(expert, profile)["score"] == 50
+    assert engine.calculate_expert_score(expert, profile, {"c1": 1.0})["score"] == 85
+    assert engine.calculate_expert_score(expert, profile, {"c1": 0.0})["score"] == 30
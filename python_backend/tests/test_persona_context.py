@@ -0,0 +1,67 @@
+"""
+Tests for the persona context cache (keyed by persona id + updatedAt)
+"""
+from datetime import datetime, timedelta
+
+from models import UserPersona
+from persona_context import PersonaContextCache
+
+
+class FakeStorage:
+    def __init__(self, persona: UserPersona):
+        self.persona = persona
+        self.full_loads = 0
+
+    async def get_user_persona_version(self, user_id):
+        if user_id != self.persona.userId:
+            return None
+        return self.persona.id, self.persona.updatedAt
+
+    async def get_user_persona_by_id(self, persona_id, view="full"):
+        assert view == "context"
+        self.full_loads += 1
+        return self.persona
+
+
+def _persona(**updates) -> UserPersona:
+    persona = UserPersona(
+        id="p-1",
+        userId="u-1",
+        companyName="Acme",
+        painPoints=["churn alto"],
+        updatedAt=datetime(2026, 1, 1),
+    )
+    return persona.model_copy(update=updates)
+
+
+async def test_context_is_rendered_once_per_persona_version():
+    cache = PersonaContextCache(max_entries=10)
+    storage = FakeStorage(_persona())
+
+    first = await cache.get_for_user(storage, "u-1")
+    second = await cache.get_for_user(storage, "u-1")
+
+    assert "Empresa: Acme" in first and "churn alto" in first
+    assert second is first
+    assert storage.full_loads == 1
+
+    # A newer updatedAt is a different version
+    storage.persona = _persona(painPoints=["CAC alto"], updatedAt=datetime(2026, 1, 1) + timedelta(seconds=1))
+    third = await cache.get_for_user(storage, "u-1")
+    assert "CAC alto" in third
+    assert storage.full_loads == 2
+    assert await cache.get_for_user(storage, "other-user") is None
+
+
+async def test_invalidate_by_persona_and_by_user():
+    cache = PersonaContextCache(max_entries=10)
+    storage = FakeStorage(_persona())
+    await cache.get_for_user(storage, "u-1")
+
+    cache.invalidate("p-1")
+    await cache.get_for_user(storage, "u-1")
+    cache.invalidate(user_id="u-1")
+    await cache.get_for_user(storage, "u-1")
+
+    assert storage.full_loads == 3
+    assert cache.stats()["entries"] == 1
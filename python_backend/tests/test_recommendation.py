@@ -0,0 +1,55 @@
+"""
+Tests for the compiled keyword scoring in ExpertRecommendationEngine
+"""
+from types import SimpleNamespace
+
+from keyword_matcher import KeywordMatcher
+from models import Expert, ExpertType
+from recommendation import ExpertRecommendationEngine
+
+
+def _expert(expert_id: str, name: str) -> Expert:
+    return Expert(
+        id=expert_id, name=name, title="t", expertise=[], bio="b",
+        systemPrompt="", expertType=ExpertType.CUSTOM
+    )
+
+
+def _profile(**fields):
+    defaults = dict(primaryGoal="", industry="", mainChallenge="", mainProducts="", targetAudience="")
+    return SimpleNamespace(**{**defaults, **fields})
+
+
+def test_matcher_finds_overlapping_keywords_like_substring_checks():
+    matcher = KeywordMatcher(["social media", "media", "dia", "mídias sociais", "roi"])
+
+    assert matcher.find("estratégia de social media e roi") == {"social media", "media", "dia", "roi"}
+    assert matcher.find("mídias sociais") == {"mídias sociais", "dia"}
+    assert matcher.find("") == set()
+
+
+def test_scores_every_field_from_one_scan_per_profile():
+    engine = ExpertRecommendationEngine()
+    experts = [_expert("k", "Philip Kotler"), _expert("g", "Gary Vaynerchuk"), _expert("x", "Fulano")]
+    profile = _profile(
+        primaryGoal="Growth",
+        industry="Startup de tecnologia",
+        mainChallenge="Engajamento em mídias sociais",
+        mainProducts="Conteúdo em vídeo",
+        targetAudience="Redes sociais e social media",
+    )
+
+    ranked = engine.get_recommendations(experts, profile)
+
+    assert [r["expertId"] for r in ranked] == ["g", "k", "x"]
+    assert ranked[0]["breakdown"] == {
+        "goal_alignment": 30, "industry_match": 25, "challenge_match": 25, "keyword_match": 20
+    }
+    assert ranked[1]["breakdown"] == {
+        "goal_alignment": 30, "industry_match": 25, "challenge_match": 5, "keyword_match": 0
+    }
+    assert ranked[2]["score"] == 50
+
+    batch = engine.get_recommendations_batch(experts, [profile, None], top_n=2)
+    assert batch[0] == ranked[:2]
+    assert [r["score"] for r in batch[1]] == [50, 50]
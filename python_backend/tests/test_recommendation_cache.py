@@ -0,0 +1,56 @@
+"""
+Tests for the /api/recommend-experts response cache
+"""
+import pytest
+
+import recommendation_cache as module
+from cache import CacheManager
+from recommendation_cache import RecommendationCache, normalize_problem
+
+
+@pytest.fixture
+def recommendations(monkeypatch):
+    monkeypatch.setattr(module, "cache_manager", CacheManager())
+    return RecommendationCache(ttl_seconds=60, similarity_enabled=True, threshold=0.8, max_entries=10)
+
+
+RESPONSE = {"recommendations": [{"expertId": "seth_godin", "relevanceScore": 5}]}
+CATALOG = "a1b2c3d4e5f60718"
+OTHER_CATALOG = "0f1e2d3c4b5a6978"
+
+
+def test_normalization_folds_case_accents_and_punctuation():
+    assert normalize_problem("  Preciso AUMENTAR as vendas!!  ") == normalize_problem("preciso aumentar as  vendas")
+    assert normalize_problem("Retenção de clientes") == "retencao de clientes"
+
+
+async def test_exact_hit_is_scoped_to_catalog_fingerprint(recommendations):
+    await recommendations.put("Como aumentar vendas no e-commerce?", CATALOG, RESPONSE)
+
+    assert await recommendations.get("como aumentar vendas no E-COMMERCE", CATALOG) == (RESPONSE, "exact")
+    assert await recommendations.get("como aumentar vendas no e-commerce", OTHER_CATALOG) == (None, "miss")
+
+
+async def test_similar_problem_reuses_recommendations(recommendations):
+    await recommendations.put("Quero aumentar as vendas da minha loja online de roupas femininas", CATALOG, RESPONSE)
+    await recommendations.put("Preciso de uma estratégia de posicionamento para software B2B", CATALOG, {"recommendations": []})
+
+    assert await recommendations.get("Como aumentar vendas na minha loja online de roupas femininas", CATALOG) == (RESPONSE, "similar")
+    assert await recommendations.get("Como reduzir o churn de assinantes", CATALOG) == (None, "miss")
+
+    stats = recommendations.stats()
+    assert (stats["similar_hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+async def test_workers_sharing_a_cache_only_reuse_answers_for_the_same_catalog(monkeypatch):
+    # Two workers (each with its own RecommendationCache) behind one shared cache
+    monkeypatch.setattr(module, "cache_manager", CacheManager())
+    worker_a = RecommendationCache(ttl_seconds=60, similarity_enabled=False)
+    worker_b = RecommendationCache(ttl_seconds=60, similarity_enabled=False)
+
+    await worker_a.put("Como aumentar vendas no e-commerce?", CATALOG, RESPONSE)
+
+    # Worker B has a different catalog (e.g. an expert was deleted there)
+    assert await worker_b.get("Como aumentar vendas no e-commerce?", OTHER_CATALOG) == (None, "miss")
+    # Same catalog contents -> shared answer, whatever each worker's catalog version
+    assert await worker_b.get("Como aumentar vendas no e-commerce?", CATALOG) == (RESPONSE, "exact")
@@ -0,0 +1,65 @@
+"""
+Tests for SSE client-disconnect cancellation
+"""
+import asyncio
+import pytest
+from stream_cancellation import CancellationStats, cancel_on_disconnect, tracked_llm_call
+import stream_cancellation
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    fresh = CancellationStats()
+    monkeypatch.setattr(stream_cancellation, "cancellation_stats", fresh)
+    return fresh
+
+
+async def test_relays_events_while_connected(stats):
+    async def events():
+        for i in range(3):
+            await asyncio.sleep(0.01)
+            yield f"chunk {i}"
+
+    received = [c async for c in cancel_on_disconnect(FakeRequest(), events(), "test", poll_interval=0.005)]
+
+    assert received == ["chunk 0", "chunk 1", "chunk 2"]
+    assert stats.cancelled_streams == 0
+
+
+async def test_disconnect_cancels_in_flight_call(stats):
+    request = FakeRequest()
+    call_cancelled = asyncio.Event()
+
+    async def events():
+        yield "started"
+        try:
+            async with tracked_llm_call("slow_llm", max_tokens=800) as call:
+                call.add_output("x" * 400)  # ~100 tokens already streamed
+                await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            call_cancelled.set()
+            raise
+        yield "never sent"
+
+    received = []
+    async for chunk in cancel_on_disconnect(request, events(), "council", poll_interval=0.01):
+        received.append(chunk)
+        request.disconnected = True
+
+    assert received == ["started"]
+    assert call_cancelled.is_set()
+    assert stats.snapshot() == {
+        "cancelled_streams": 1,
+        "cancelled_calls": 1,
+        "saved_output_tokens": 700,
+        "by_stream": {"council": 1},
+        "by_call_site": {"slow_llm": 1},
+    }
@@ -3,9 +3,8 @@ UserMemoryTool - Access user's conversation history and profile for personalizat
 Enables continuity and context-aware recommendations
 """
 from typing import Optional, Dict, Any, List
-import os
-import asyncpg
 import json
+from db_pool import db_pool
 
 
 class UserMemoryTool:
@@ -43,65 +42,59 @@ class UserMemoryTool:
         Returns:
             Dict containing user profile, recent conversations, insights
         """
-        database_url = os.getenv("DATABASE_URL")
-        if not database_url:
+        if db_pool.pool is None:
             return self._empty_context(user_id)
         
-        conn = None
         try:
-            conn = await asyncpg.connect(database_url)
+            async with db_pool.acquire("memory") as conn:
+                # 1. Get user profile extended (psychographics)
+                profile_row = await conn.fetchrow(
+                    "SELECT * FROM user_profiles_extended WHERE user_id = $1",
+                    user_id
+                )
+                profile = dict(profile_row) if profile_row else None
             
-            # 1. Get user profile extended (psychographics)
-            profile_row = await conn.fetchrow(
-                "SELECT * FROM user_profiles_extended WHERE user_id = $1",
-                user_id
-            )
-            profile = dict(profile_row) if profile_row else None
+                # 2. Get recent council insights (valuable outputs)
+                insights_rows = await conn.fetch(
+                    """SELECT insight, expert_name, category, created_at 
+                       FROM council_insights 
+                       WHERE user_id = $1 
+                       ORDER BY created_at DESC 
+                       LIMIT $2""",
+                    user_id, limit
+                )
+                past_insights = [dict(row) for row in insights_rows]
             
-            # 2. Get recent council insights (valuable outputs)
-            insights_rows = await conn.fetch(
-                """SELECT insight, expert_name, category, created_at 
-                   FROM council_insights 
-                   WHERE user_id = $1 
-                   ORDER BY created_at DESC 
-                   LIMIT $2""",
-                user_id, limit
-            )
-            past_insights = [dict(row) for row in insights_rows]
+                # 3. Get recent council sessions (for context continuity)
+                sessions_rows = await conn.fetch(
+                    """SELECT id, problem, consensus, created_at 
+                       FROM council_sessions 
+                       WHERE user_id = $1 
+                       ORDER BY created_at DESC 
+                       LIMIT $2""",
+                    user_id, 5
+                )
+                recent_sessions = [dict(row) for row in sessions_rows]
             
-            # 3. Get recent council sessions (for context continuity)
-            sessions_rows = await conn.fetch(
-                """SELECT id, problem, consensus, created_at 
-                   FROM council_sessions 
-                   WHERE user_id = $1 
-                   ORDER BY created_at DESC 
-                   LIMIT $2""",
-                user_id, 5
-            )
-            recent_sessions = [dict(row) for row in sessions_rows]
+                # 4. Parse expert affinity if available
+                expert_affinity = {}
+                if profile and profile.get("expert_affinity"):
+                    try:
+                        expert_affinity = json.loads(profile["expert_affinity"])
+                    except:
+                        pass
             
-            # 4. Parse expert affinity if available
-            expert_affinity = {}
-            if profile and profile.get("expert_affinity"):
-                try:
-                    expert_affinity = json.loads(profile["expert_affinity"])
-                except:
-                    pass
-            
-            return {
-                "user_id": user_id,
-                "profile": profile,
-                "recent_sessions": recent_sessions,
-                "past_insights": past_insights,
-                "expert_affinity": expert_affinity,
-                "tool": self.name
-            }
+                return {
+                    "user_id": user_id,
+                    "profile": profile,
+                    "recent_sessions": recent_sessions,
+                    "past_insights": past_insights,
+                    "expert_affinity": expert_affinity,
+                    "tool": self.name
+                }
         except Exception as e:
             print(f"⚠️ UserMemoryTool.get_user_context error: {str(e)}")
             return self._empty_context(user_id)
-        finally:
-            if conn:
-                await conn.close()
     
     def _empty_context(self, user_id: str) -> Dict[str, Any]:
         """Fallback empty context when DB unavailable"""
@@ -135,33 +128,27 @@ class UserMemoryTool:
         Returns:
             Success boolean
         """
-        database_url = os.getenv("DATABASE_URL")
-        if not database_url:
+        if db_pool.pool is None:
             return False
         
-        conn = None
         try:
-            conn = await asyncpg.connect(database_url)
-            
-            # Insert insight into council_insights table
-            await conn.execute(
-                """INSERT INTO council_insights 
-                   (session_id, user_id, expert_name, insight, category) 
-                   VALUES ($1, $2, $3, $4, $5)""",
-                session_id or "standalone",
-                user_id,
-                expert_name,
-                insight,
-                category
-            )
+            async with db_pool.acquire("memory") as conn:
+                # Insert insight into council_insights table
+                await conn.execute(
+                    """INSERT INTO council_insights 
+                       (session_id, user_id, expert_name, insight, category) 
+                       VALUES ($1, $2, $3, $4, $5)""",
+                    session_id or "standalone",
+                    user_id,
+                    expert_name,
+                    insight,
+                    category
+                )
             
-            return True
+                return True
         except Exception as e:
             print(f"⚠️ UserMemoryTool.save_insight error: {str(e)}")
             return False
-        finally:
-            if conn:
-                await conn.close()
     
     def get_prompt_instruction(self) -> str:
         """